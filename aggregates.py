@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+스냅샷 집계 (롤업)
+스냅샷 적재 시 브랜드/포지션/상태/가격대 집계를 한 번만 계산해서
+스냅샷 옆 aggregates/ 폴더에 저장 - 웹 대시보드와 update_dashboard.py가 함께 사용
+공개 통계 페이지 차트 데이터(statistics_charts)는 NumPy로 한 번에 계산해서 최신 스냅샷 조합별로 보관
+"""
+
+import os
+import json
+import threading
+
+import numpy as np
+
+import snapshot_loader
+
+ROLLUP_VERSION = 1
+ROLLUP_DIR = 'aggregates'
+
+# 통계 분석 페이지 가격대 (마켓 통화 기준)
+PRICE_RANGES = [(20000, '0-20k'), (40000, '20-40k'), (60000, '40-60k'), (None, '60k+')]
+
+# 통합 대시보드 가격대 (원화 기준, 상한 포함)
+KRW_RANGES = [(100000, '~10만원'), (300000, '10~30만원'), (500000, '30~50만원'), (None, '50만원~')]
+
+def _bucket(value, ranges, inclusive=False):
+    for limit, label in ranges:
+        if limit is None or value < limit or (inclusive and value == limit):
+            return label
+
+def build_rollup(products, market):
+    """정규화된 제품 목록으로 집계 생성 (스냅샷당 한 번)"""
+    rollup = {
+        'version': ROLLUP_VERSION,
+        'market': market,
+        'count': len(products),
+        'brands': {},
+        'positions': {},
+        'conditions': {},
+        'price_ranges': {label: 0 for _, label in PRICE_RANGES},
+        'krw_ranges': {label: 0 for _, label in KRW_RANGES},
+        'krw_sum': 0,
+        'krw_count': 0,
+    }
+
+    for p in products:
+        brand = rollup['brands'].setdefault(p.brand, {'count': 0, 'total_price': 0})
+        brand['count'] += 1
+        brand['total_price'] += p.price
+
+        rollup['positions'][p.position] = rollup['positions'].get(p.position, 0) + 1
+        rollup['conditions'][p.condition] = rollup['conditions'].get(p.condition, 0) + 1
+        rollup['price_ranges'][_bucket(p.price, PRICE_RANGES)] += 1
+
+        # Yahoo는 배송비/수수료 포함 원화, 야용사는 판매가
+        krw = p.total_cost_krw if market == 'yahoo' else p.price
+        if krw > 0:
+            rollup['krw_sum'] += krw
+            rollup['krw_count'] += 1
+            rollup['krw_ranges'][_bucket(krw, KRW_RANGES, inclusive=True)] += 1
+
+    return rollup
+
+def merge_rollups(rollups, market):
+    """여러 스냅샷 집계 합산 - 버킷 수에 비례하는 비용"""
+    merged = build_rollup([], market)
+    for rollup in rollups:
+        merged['count'] += rollup['count']
+        merged['krw_sum'] += rollup['krw_sum']
+        merged['krw_count'] += rollup['krw_count']
+        for brand, data in rollup['brands'].items():
+            target = merged['brands'].setdefault(brand, {'count': 0, 'total_price': 0})
+            target['count'] += data['count']
+            target['total_price'] += data['total_price']
+        for key in ('positions', 'conditions', 'price_ranges', 'krw_ranges'):
+            for label, count in rollup[key].items():
+                merged[key][label] = merged[key].get(label, 0) + count
+    return merged
+
+def rollup_path(snapshot_path):
+    """스냅샷 옆 집계 파일 경로 (data/aggregates/<스냅샷 파일명>)"""
+    directory, filename = os.path.split(os.path.abspath(snapshot_path))
+    return os.path.join(directory, ROLLUP_DIR, filename)
+
+def _source_key(snapshot_path):
+    st = os.stat(snapshot_path)
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+
+def write_rollup(snapshot_path, rollup):
+    path = rollup_path(snapshot_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(rollup, source=_source_key(snapshot_path)), f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def load_rollup(snapshot_path, snapshot=None, market=None, exchange_rate=None):
+    """저장된 집계 로드 - 없거나 스냅샷이 바뀌었으면 새로 계산해서 저장
+
+    exchange_rate: Yahoo 원화 집계(krw_*)를 이 환율로 다시 계산 (저장된 집계의 환율이 다를 때만),
+                   None이면 저장된 집계를 환율과 상관없이 사용
+    """
+    if snapshot is not None:
+        market = snapshot.market
+    if (market or snapshot_loader.snapshot_market(os.path.basename(snapshot_path))) != 'yahoo':
+        exchange_rate = None
+
+    path = rollup_path(snapshot_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            rollup = json.load(f)
+        if rollup.get('version') == ROLLUP_VERSION and rollup.get('source') == _source_key(snapshot_path) \
+                and (exchange_rate is None or rollup.get('exchange_rate') == exchange_rate):
+            return rollup
+    except (OSError, ValueError):
+        pass
+
+    if snapshot is None:
+        snapshot = snapshot_loader.load_snapshot(snapshot_path, market)
+    rollup = build_rollup(snapshot.repriced(exchange_rate), snapshot.market)
+    rollup['exchange_rate'] = exchange_rate
+    try:
+        write_rollup(snapshot_path, rollup)
+    except OSError as e:
+        print(f"집계 저장 실패 {path}: {e}")
+    return rollup
+
+def snapshot_rollup(snapshot):
+    """캐시된 스냅샷의 집계 (프로세스 내에서는 한 번만 로드)"""
+    return snapshot.memo('rollup', lambda s: load_rollup(s.path, s))
+
+def dashboard_stats(rollup):
+    """update_dashboard.py 통계 형식으로 변환"""
+    return {
+        'total': rollup['count'],
+        'positions': dict(rollup['positions']),
+        'brands': {brand: data['count'] for brand, data in rollup['brands'].items()
+                   if brand and brand != 'unknown'},
+        'conditions': dict(rollup['conditions']),
+        'price_ranges': {label: count for label, count in rollup['krw_ranges'].items() if count},
+        'avg_price': rollup['krw_sum'] / rollup['krw_count'] if rollup['krw_count'] else 0,
+    }
+
+# 공개 통계 페이지 차트 - 가격대 (상한 포함, 마켓 통화 기준), 브랜드 상위 개수
+CHART_PRICE_EDGES = [10000, 30000, 50000, 100000, 200000]
+CHART_PRICE_LABELS = ['~1만', '1~3만', '3~5만', '5~10만', '10~20만', '20만+']
+CHART_TOP_BRANDS = 10
+CHART_MARKETS = [('yahoo', 'Yahoo Auction'), ('yayongsa', '야용사 카페')]
+NEW_CONDITIONS = ('신품', '新品')
+
+def chart_columns(snapshot):
+    """판매 중인 제품의 차트용 열 (스냅샷당 한 번 생성)"""
+    def build(s):
+        products = s.active_products
+        return {
+            'brand': np.array([p.brand or '기타' for p in products], dtype=object),
+            'position': np.array([p.position or '올라운드' for p in products], dtype=object),
+            'new': np.array([p.condition in NEW_CONDITIONS for p in products], dtype=bool),
+            'price': np.array([p.price for p in products], dtype=np.int64),
+        }
+    return snapshot.memo('chart_columns', build)
+
+def _factorize(values):
+    """값 배열 → (처음 나온 순서의 고유값, 코드 배열)"""
+    if not len(values):
+        return np.array([], dtype=object), np.array([], dtype=np.int64)
+    uniques, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return uniques[order], rank[inverse.ravel()]
+
+def _round(values):
+    """브라우저 Math.round와 같은 반올림 (0.5는 올림)"""
+    return np.floor(np.asarray(values, dtype=float) + 0.5).astype(np.int64).tolist()
+
+def _grouped_avg(codes, price, size):
+    """그룹별 평균 가격 (가격 0 제외)"""
+    priced = price > 0
+    sums = np.bincount(codes, weights=np.where(priced, price, 0), minlength=size)
+    counts = np.bincount(codes, weights=priced, minlength=size)
+    return _round(np.divide(sums, counts, out=np.zeros(size), where=counts > 0))
+
+def build_statistics_charts(snapshots):
+    """마켓별 최신 스냅샷 → 통계 페이지 차트 시리즈 (브랜드/포지션/가격대/마켓)"""
+    columns = {s.market: chart_columns(s) for s in snapshots}
+    parts = [columns[market] for market, _ in CHART_MARKETS if market in columns]
+    concat = lambda key, dtype: np.concatenate([c[key] for c in parts]) if parts else np.array([], dtype=dtype)
+    brand, position = concat('brand', object), concat('position', object)
+    new, price = concat('new', bool), concat('price', np.int64)
+    total = len(price)
+
+    market_counts = [len(columns[market]['price']) if market in columns else 0 for market, _ in CHART_MARKETS]
+    market_avgs = [_round([columns[market]['price'].mean()])[0] if market_counts[i] else 0
+                   for i, (market, _) in enumerate(CHART_MARKETS)]
+
+    # 브랜드: 개수 내림차순 상위 N개 (같은 개수는 처음 나온 순서)
+    brands, brand_codes = _factorize(brand)
+    brand_counts = np.bincount(brand_codes, minlength=len(brands))
+    brand_avgs = _grouped_avg(brand_codes, price, len(brands))
+    top = np.argsort(-brand_counts, kind='stable')[:CHART_TOP_BRANDS]
+
+    positions, position_codes = _factorize(position)
+    position_counts = np.bincount(position_codes, minlength=len(positions))
+    position_new = np.bincount(position_codes, weights=new, minlength=len(positions)).astype(np.int64)
+
+    histogram = np.bincount(np.searchsorted(CHART_PRICE_EDGES, price, side='left'),
+                            minlength=len(CHART_PRICE_LABELS))
+    new_count = int(new.sum())
+
+    return {
+        'totals': {
+            'total': total,
+            'new': new_count,
+            'new_percent': _round([new_count / total * 100])[0] if total else 0,
+            'markets': dict(zip([market for market, _ in CHART_MARKETS], market_counts)),
+            'avg_prices': dict(zip([market for market, _ in CHART_MARKETS], market_avgs)),
+        },
+        'brands': {
+            'labels': brands[top].tolist(),
+            'counts': brand_counts[top].tolist(),
+            'avg_prices': [brand_avgs[i] for i in top],
+            'percents': _round(brand_counts[top] / total * 100) if total else [],
+        },
+        'positions': {
+            'labels': positions.tolist(),
+            'counts': position_counts.tolist(),
+            'new': position_new.tolist(),
+            'used': (position_counts - position_new).tolist(),
+            'avg_prices': _grouped_avg(position_codes, price, len(positions)),
+        },
+        'price_histogram': {
+            'labels': CHART_PRICE_LABELS,
+            'counts': histogram.tolist(),
+        },
+        'markets': {
+            'labels': [label for _, label in CHART_MARKETS],
+            'counts': market_counts,
+        },
+    }
+
+# 최신 스냅샷 조합별 차트 데이터 (새 스냅샷이 생기면 다시 계산)
+_charts_cache = (None, None)
+_charts_lock = threading.Lock()
+
+def statistics_charts(snapshots):
+    global _charts_cache
+    snapshots = tuple(snapshots)
+    cached_snapshots, charts = _charts_cache
+    if cached_snapshots is not None and len(cached_snapshots) == len(snapshots) \
+            and all(a is b for a, b in zip(cached_snapshots, snapshots)):
+        return charts
+    with _charts_lock:
+        charts = build_statistics_charts(snapshots)
+        _charts_cache = (snapshots, charts)
+        return charts
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+야용사 가격 추출 벤치마크 (price_parser vs 예전 패턴 10개 순차 검사)
+fixtures/price_corpus.jsonl 의 정답 가격과 비교한 정확도, 초당 처리 본문 수 측정
+
+사용법:
+    python bench_price_parser.py                  # 정확도 + 처리 속도
+    python bench_price_parser.py --bodies 20000   # 본문 2만 개로 속도 측정
+    python bench_price_parser.py --show-misses    # 틀린 본문 출력
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+import price_parser
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'price_corpus.jsonl')
+
+# 실제 게시글 본문 길이를 흉내내는 앞뒤 문장
+FILLER = ("안녕하세요 글러브 정리합니다. 실착 몇 번 했고 길들이기 완료된 상태입니다. "
+          "사진 참고해주시고 궁금한 점은 쪽지 주세요. 직거래는 주말에만 가능합니다.\n")
+
+# 예전 yayongsa_crawler.extract_price의 패턴 (순서대로 검사, 첫 번째 유효 가격 사용)
+LEGACY_PATTERNS = [
+    (r'판매가격\s*[:：=]\s*(\d{1,3})\s*만', 10000),
+    (r'판매가\s*[:：=]\s*(\d{1,3})\s*만', 10000),
+    (r'가격\s*[:：=]\s*(\d{1,3})\s*만', 10000),
+    (r'(\d{1,3})\s*만\s*원', 10000),
+    (r'(\d{1,3})\s*만(?:\s|$|\n|\.)', 10000),
+    (r'(\d{2,3})[,.]?(\d{3})[,.]?(\d{3})\s*원', 1),
+    (r'(\d{2,3})[,.](\d{3})\s*원', 1),
+    (r'판매가격\s*[:：=]\s*(\d{2,3})(?:\s|$|\n)', 10000),
+    (r'판매가\s*[:：=]\s*(\d{2,3})(?:\s|$|\n)', 10000),
+    (r'가격\s*[:：=]\s*(\d{2,3})(?:\s|$|\n)', 10000),
+]
+
+def legacy_extract_price(content_text):
+    """예전 방식: 패턴마다 본문 전체를 다시 검색"""
+    for pattern, multiplier in LEGACY_PATTERNS:
+        matches = re.findall(pattern, content_text, re.IGNORECASE)
+        if matches:
+            price_str = ''.join(matches[0]) if isinstance(matches[0], tuple) else matches[0]
+            price = int(price_str.replace(',', '').replace('.', '').strip()) * multiplier
+            if 20000 <= price <= 2000000:
+                return price
+
+    for num_str in re.findall(r'\b(\d{5,6})\b', content_text.replace(',', '')):
+        num = int(num_str)
+        if 20000 <= num <= 999999:
+            return num
+    return 0
+
+def load_corpus():
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def new_extract_price(text):
+    return price_parser.parse_price(text).price
+
+def bench_accuracy(corpus, show_misses):
+    """정답 가격과 일치하는 본문 비율"""
+    for name, extract in (('legacy', legacy_extract_price), ('parser', new_extract_price)):
+        misses = [(row, extract(row['text'])) for row in corpus if extract(row['text']) != row['price']]
+        correct = len(corpus) - len(misses)
+        print(f"  {name:<8} 정확도 {correct:>4}/{len(corpus)}  ({correct / len(corpus):6.1%})")
+        if show_misses:
+            for row, price in misses:
+                sample = row['text'].replace('\n', ' / ')[:60]
+                print(f"     ✗ {price:>9,} (정답 {row['price']:,})  {sample}")
+
+def make_bodies(corpus, count, filler_lines):
+    """말뭉치를 count개로 늘리고 앞뒤에 일반 문장을 덧붙임"""
+    padding = FILLER * filler_lines
+    return [padding + corpus[i % len(corpus)]['text'] + '\n' + padding for i in range(count)]
+
+def bench_speed(bodies, rounds):
+    """초당 처리 본문 수"""
+    for name, run in (('legacy', lambda: [legacy_extract_price(body) for body in bodies]),
+                      ('parser', lambda: price_parser.parse_prices(bodies))):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            run()
+        elapsed = time.perf_counter() - start
+        processed = rounds * len(bodies)
+        print(f"  {name:<8} {processed:>7}개 {elapsed:8.3f}초  →  {processed / elapsed:10.0f} bodies/sec")
+
+def main():
+    parser = argparse.ArgumentParser(description='야용사 가격 추출 벤치마크')
+    parser.add_argument('--bodies', type=int, default=5000, help='속도 측정용 본문 수')
+    parser.add_argument('--filler', type=int, default=3, help='본문 앞뒤에 붙일 일반 문장 줄 수')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--show-misses', action='store_true', help='틀린 본문 출력')
+    args = parser.parse_args()
+
+    if not os.path.exists(CORPUS_PATH):
+        print(f"❌ 말뭉치 없음: {CORPUS_PATH}")
+        sys.exit(1)
+    corpus = load_corpus()
+
+    print("="*60)
+    print(f"📊 가격 추출 벤치마크 (정답 말뭉치 {len(corpus)}개)")
+    print("="*60)
+    bench_accuracy(corpus, args.show_misses)
+    bench_speed(make_bodies(corpus, args.bodies, args.filler), args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Yahoo 목록 페이지 수집 벤치마크 (HTTP 모드 vs Selenium 모드)
+fixtures/yahoo/ 의 저장된 HTML을 로컬 서버로 띄워서 초당 페이지 수 측정
+
+사용법:
+    python bench_yahoo_fetch.py                 # 파싱 + HTTP 모드 (순차 / 동시)
+    python bench_yahoo_fetch.py --site-pages 25 --latency 0.3   # 25페이지, 응답 지연 0.3초
+    python bench_yahoo_fetch.py --selenium      # Chrome이 있으면 Selenium 모드도 측정
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import threading
+import contextlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import yahoo_parser
+import yahoo_crawler
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'yahoo')
+
+def load_fixtures():
+    """list_page1.html, list_page2.html ... 순서대로 로드"""
+    pages = []
+    page_num = 1
+    while True:
+        path = os.path.join(FIXTURE_DIR, f'list_page{page_num}.html')
+        if not os.path.exists(path):
+            return pages
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+        page_num += 1
+
+def start_server(pages, site_pages, latency=0):
+    """b 파라미터(오프셋)에 맞는 fixture를 돌려주는 로컬 서버
+
+    site_pages 페이지짜리 목록을 흉내냄: 마지막 페이지는 마지막 fixture(짧은 페이지),
+    그 전 페이지는 첫 번째 fixture(100개), latency초 응답 지연
+    """
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            offset = int(query.get('b', ['1'])[0])
+            index = (offset - 1) // yahoo_parser.PAGE_SIZE
+            if latency:
+                time.sleep(latency)
+            if index < site_pages - 1:
+                body = pages[0]
+            elif index == site_pages - 1:
+                body = pages[-1]
+            else:
+                body = b'<html><body></body></html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def report(name, pages, elapsed):
+    print(f"  {name:<10} {pages:>4}페이지 {elapsed:8.3f}초  →  {pages / elapsed:8.1f} pages/sec")
+
+def bench_parse(pages, rounds):
+    """네트워크 없이 파싱만"""
+    html = [page.decode('utf-8') for page in pages]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in html:
+            yahoo_parser.parse_list_page(page)
+    report('parse', rounds * len(html), time.perf_counter() - start)
+
+def bench_http(base_url, site_pages, rounds, concurrency, delay):
+    """requests.Session + BeautifulSoup (concurrency페이지 동시, 호스트별 delay초 간격)"""
+    session = yahoo_crawler.create_session(concurrency)
+    fetched = 0
+    count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        products = yahoo_crawler.search_yahoo_auction_http(
+            max_pages=site_pages + 5, session=session, base_url=base_url,
+            delay=delay, jitter=0, verbose=False, concurrency=concurrency)
+        count = len(products)
+        fetched += site_pages
+    report(f'http x{concurrency}', fetched, time.perf_counter() - start)
+    session.close()
+    return count
+
+def bench_selenium(base_url, max_pages, rounds, page_wait):
+    """Chrome + 요소별 find_element (크롤러와 같은 대기 시간)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-gpu')
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"  selenium   건너뜀 (Chrome 실행 불가: {str(e).splitlines()[0]})")
+        return None
+
+    fetched = 0
+    count = 0
+    try:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            with contextlib.redirect_stdout(io.StringIO()):
+                products = yahoo_crawler.search_yahoo_auction(
+                    driver, max_pages=max_pages, base_url=base_url, page_wait=page_wait)
+            count = len(products)
+            fetched += max_pages
+        report('selenium', fetched, time.perf_counter() - start)
+    finally:
+        driver.quit()
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description='Yahoo 목록 페이지 수집 벤치마크')
+    parser.add_argument('--rounds', type=int, default=3, help='HTTP/파싱 반복 횟수')
+    parser.add_argument('--site-pages', type=int, default=0, help='목록 전체 페이지 수 (기본: fixture 수)')
+    parser.add_argument('--latency', type=float, default=0, help='로컬 서버 응답 지연 (초)')
+    parser.add_argument('--concurrency', type=int, default=yahoo_crawler.HTTP_CONCURRENCY)
+    parser.add_argument('--delay', type=float, default=0, help='HTTP 모드 호스트별 요청 간격 (초)')
+    parser.add_argument('--selenium', action='store_true', help='Selenium 모드도 측정')
+    parser.add_argument('--selenium-rounds', type=int, default=1)
+    parser.add_argument('--page-wait', type=float, default=3, help='Selenium 페이지 대기 (크롤러 기본 3초)')
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    if not pages:
+        print(f"❌ fixture 없음: {FIXTURE_DIR}")
+        sys.exit(1)
+
+    site_pages = args.site_pages or len(pages)
+    server = start_server(pages, site_pages, args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/category/list/2084032394/?n=100"
+    max_pages = site_pages
+
+    print("="*60)
+    print(f"📊 Yahoo 목록 페이지 벤치마크 ({site_pages}페이지, 응답 지연 {args.latency}초)")
+    print("="*60)
+
+    bench_parse(pages, args.rounds)
+    bench_http(base_url, site_pages, args.rounds, 1, args.delay)
+    http_count = bench_http(base_url, site_pages, args.rounds, args.concurrency, args.delay)
+    print(f"  → HTTP 모드 수집 상품: {http_count}개")
+
+    if args.selenium:
+        selenium_count = bench_selenium(base_url, max_pages, args.selenium_rounds, args.page_wait)
+        if selenium_count is not None:
+            print(f"  → Selenium 모드 수집 상품: {selenium_count}개")
+            if selenium_count != http_count:
+                print("  ⚠️ 두 모드의 수집 결과가 다릅니다.")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Yahoo 목록 파서 회귀 검사
+fixtures/yahoo/ 의 저장된 페이지를 파싱한 결과가 기대값(*.expected.json)과
+바이트 단위로 같은지 확인. Chrome이 있으면 예전 방식(카드/필드별 find_element)
+결과와 page_source 파싱 결과도 직접 비교
+
+사용법:
+    python check_yahoo_parser.py             # 기대값 비교
+    python check_yahoo_parser.py --selenium  # + Selenium 요소별 추출과 비교
+    python check_yahoo_parser.py --update    # 파서 변경 후 기대값 다시 저장
+"""
+
+import os
+import sys
+import json
+import argparse
+import pathlib
+
+import yahoo_parser
+import yahoo_crawler
+import landed_cost
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'yahoo')
+
+# fixture 파일, 레이아웃, 페이지 URL (상대 링크 변환 기준)
+FIXTURES = [
+    ('list_page1.html', 'list', 'https://auctions.yahoo.co.jp/category/list/2084032394/?n=100'),
+    ('list_page2.html', 'list', 'https://auctions.yahoo.co.jp/category/list/2084032394/?n=100&b=101'),
+    ('grid_page1.html', 'grid', 'https://auctions.yahoo.co.jp/category/list/2084032133/?n=100'),
+]
+
+def parse_fixture(html, layout, base_url):
+    """fixture → (카드 목록, 크롤러가 저장하는 최종 상품 목록)"""
+    if layout == 'grid':
+        cards = yahoo_parser.parse_grid_page(html, base_url)
+        return cards, None
+    cards = yahoo_parser.parse_list_page(html, base_url)
+    products = []
+    yahoo_crawler.collect_page([dict(card) for card in cards], 1, products, verbose=False)
+    landed_cost.apply(products)
+    return cards, products
+
+def dump(value):
+    return json.dumps(value, ensure_ascii=False, indent=2)
+
+def legacy_list_cards(driver):
+    """예전 yahoo_crawler.search_yahoo_auction의 요소별 추출"""
+    from selenium.webdriver.common.by import By
+
+    elements = driver.find_elements(By.CSS_SELECTOR, ".Product")
+    if not elements:
+        elements = driver.find_elements(By.CSS_SELECTOR, "li.Product__item")
+
+    cards = []
+    for element in elements:
+        card = {}
+        try:
+            card['title'] = element.find_element(By.CSS_SELECTOR, ".Product__title").text.strip()
+        except Exception:
+            card['title'] = ''
+        try:
+            price_text = element.find_element(By.CSS_SELECTOR, ".Product__priceValue").text.strip()
+            price_text = price_text.replace(',', '').replace('円', '').replace('¥', '').replace(' ', '')
+            card['current_price'] = int(price_text) if price_text.isdigit() else 0
+        except Exception:
+            card['current_price'] = 0
+        try:
+            card['image_url'] = element.find_element(By.CSS_SELECTOR, "img.Product__imageData").get_attribute('src')
+        except Exception:
+            card['image_url'] = ''
+        try:
+            card['url'] = element.find_element(By.CSS_SELECTOR, "a.Product__titleLink").get_attribute('href')
+        except Exception:
+            card['url'] = ''
+        try:
+            card['bids'] = element.find_element(By.CSS_SELECTOR, ".Product__bid").text.strip()
+        except Exception:
+            card['bids'] = '0'
+        try:
+            card['time_left'] = element.find_element(By.CSS_SELECTOR, ".Product__time").text.strip()
+        except Exception:
+            card['time_left'] = ''
+        cards.append(card)
+    return cards
+
+def legacy_grid_cards(driver):
+    """예전 yahoo_multi_category_crawler.search_yahoo_auction의 요소별 추출"""
+    from selenium.webdriver.common.by import By
+
+    cards = []
+    for element in driver.find_elements(By.CSS_SELECTOR, "div.Products.Products--grid > div > ul > li"):
+        card = {}
+        try:
+            card['title'] = element.find_element(By.CSS_SELECTOR, "div.Product__detail > h3 > a").text.strip()
+        except Exception:
+            card['title'] = ''
+        try:
+            card['image_url'] = element.find_element(By.CSS_SELECTOR, "div.Product__image > a > img").get_attribute('src')
+        except Exception:
+            card['image_url'] = ''
+        try:
+            card['url'] = element.find_element(By.CSS_SELECTOR, "div.Product__detail > h3 > a").get_attribute('href')
+        except Exception:
+            card['url'] = ''
+        try:
+            price_elem = element.find_element(By.CSS_SELECTOR, "div.Product__priceInfo > span:nth-child(1) > span.Product__priceValue")
+            price_text = price_elem.text.strip()
+            price_text = price_text.replace(',', '').replace('円', '').replace('¥', '').replace(' ', '')
+            card['current_price'] = int(price_text) if price_text.isdigit() else 0
+        except Exception:
+            card['current_price'] = 0
+        cards.append(card)
+    return cards
+
+def check_selenium():
+    """Chrome으로 fixture를 열어 요소별 추출과 page_source 파싱 결과 비교"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"⚠️ Selenium 비교 건너뜀 (Chrome 실행 불가: {str(e).splitlines()[0]})")
+        return True
+
+    ok = True
+    try:
+        for filename, layout, _ in FIXTURES:
+            driver.get(pathlib.Path(FIXTURE_DIR, filename).as_uri())
+            if layout == 'grid':
+                expected = legacy_grid_cards(driver)
+                actual = yahoo_parser.parse_grid_page(driver.page_source, driver.current_url)
+            else:
+                expected = legacy_list_cards(driver)
+                actual = yahoo_parser.parse_list_page(driver.page_source, driver.current_url)
+            if dump(expected) == dump(actual):
+                print(f"✅ {filename}: Selenium 요소별 추출과 동일 ({len(actual)}개)")
+            else:
+                ok = False
+                print(f"❌ {filename}: Selenium 요소별 추출과 다름")
+                for index, (old, new) in enumerate(zip(expected, actual)):
+                    if old != new:
+                        print(f"   #{index}: {old} != {new}")
+                        break
+    finally:
+        driver.quit()
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description='Yahoo 목록 파서 회귀 검사')
+    parser.add_argument('--update', action='store_true', help='기대값 파일 다시 저장')
+    parser.add_argument('--selenium', action='store_true', help='Chrome으로 요소별 추출과 비교')
+    args = parser.parse_args()
+
+    ok = True
+    for filename, layout, base_url in FIXTURES:
+        with open(os.path.join(FIXTURE_DIR, filename), 'r', encoding='utf-8') as f:
+            html = f.read()
+        cards, products = parse_fixture(html, layout, base_url)
+        actual = dump({'cards': cards, 'products': products})
+
+        expected_path = os.path.join(FIXTURE_DIR, filename.replace('.html', '.expected.json'))
+        if args.update:
+            with open(expected_path, 'w', encoding='utf-8') as f:
+                f.write(actual + '\n')
+            print(f"💾 {os.path.basename(expected_path)} 저장 ({len(cards)}개 카드)")
+            continue
+
+        with open(expected_path, 'r', encoding='utf-8') as f:
+            expected = f.read().rstrip('\n')
+        if actual == expected:
+            print(f"✅ {filename}: {len(cards)}개 카드 일치")
+        else:
+            ok = False
+            print(f"❌ {filename}: 기대값과 다름 ({expected_path})")
+
+    if args.selenium and not args.update:
+        ok = check_selenium() and ok
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+상품 제목 분류기 (브랜드/포지션/상태/연령대/제외·판매완료 키워드)
+사이트별 키워드 표 전체를 정규식 하나로 컴파일해서 제목을 한 번만 훑고
+모든 표의 라벨을 동시에 결정 (Yahoo, 야용사, Yahoo 다중 카테고리 크롤러 공용)
+글러브 종류(연식/경식)는 glove_type() - 제품 API/검색 필터/facet 색인 공용
+"""
+
+import re
+from collections import defaultdict
+
+def _words(words, value=True):
+    return [(word, value) for word in words]
+
+# 표 형식: 이름 → (기본값, [(키워드, 값), ...], 대소문자 무시 여부)
+# 한 제목에 여러 키워드가 있으면 표에서 먼저 적힌 키워드의 값 (예전 if/elif 순서와 동일)
+YAHOO_TABLES = {
+    # 반드시 글러브 키워드가 있어야 함
+    'glove': (False, _words(['グローブ', 'グラブ', 'ミット', 'glove', 'Glove']), False),
+    # 확실한 액세서리 제외
+    'exclude': (False, _words([
+        # 오일/왁스 단품
+        'スクワランオイル', 'ミンクオイル', 'メンテナンスオイル',
+        '艶出し', 'みつろう', 'ワックス',
+        # 끈 단품
+        'レースのみ', '紐のみ', 'グラブレース単品',
+        # 도구
+        'グラブピン', '紐通し', 'ニードル', '修理用',
+        # 타격 장갑
+        'バッティンググローブ', 'バッティング手袋', '守備用手袋',
+        # 기타
+        'サングラス', 'アームガード', '芯材のみ',
+    ]), False),
+    # 판매완료/종료
+    'sold': (False, _words(['終了', '売り切れ', '完売', 'SOLD', '落札', '売却済']), False),
+    'condition': ('중고', _words(['新品', '未使用', 'NEW'], '신품'), False),
+    'position': ('올라운드',
+                 _words(['投手', 'ピッチャー', 'pitcher', 'Pitcher'], '투수') +
+                 _words(['捕手', 'キャッチャー', 'ミット', 'catcher', 'Catcher'], '포수') +
+                 _words(['内野', '二塁', '三塁', '一塁', 'ショート', 'セカンド', 'サード', 'ファースト', 'infield'], '내야수') +
+                 _words(['外野', 'アウトフィールド', 'outfield', 'Outfield'], '외야수') +
+                 _words(['オールラウンド', 'オールポジション', 'all-round'], '올라운드'), False),
+    'age_group': ('성인용',
+                  _words(['キッズ', '少年', 'ジュニア', '子供'], '어린이용') +
+                  _words(['大人', '一般', '成人', 'プロ'], '성인용'), False),
+    'brand': ('その他', [
+        ('ミズノ', 'Mizuno'), ('mizuno', 'Mizuno'),
+        ('ウィルソン', 'Wilson'), ('wilson', 'Wilson'),
+        ('ローリングス', 'Rawlings'), ('rawlings', 'Rawlings'),
+        ('ゼット', 'ZETT'), ('zett', 'ZETT'),
+        ('SSK', 'SSK'),
+        ('アシックス', 'ASICS'), ('asics', 'ASICS'),
+        ('久保田', 'Kubota Slugger'), ('kubota', 'Kubota Slugger'),
+        ('ハタケヤマ', 'Hatakeyama'),
+        ('アトムズ', 'ATOMS'), ('atoms', 'ATOMS'),
+        ('ザナックス', 'Xanax'), ('xanax', 'Xanax'),
+        ('アイピーセレクト', 'IP Select'), ('ip select', 'IP Select'),
+        ('デサント', 'Descente'), ('descente', 'Descente'),
+        ('アンダーアーマー', 'Under Armour'), ('under armour', 'Under Armour'), ('UA', 'Under Armour'),
+    ], True),
+}
+
+YAYONGSA_TABLES = {
+    # 공지사항 제외
+    'notice': (False, _words(['공지', '필독']), False),
+    'sold_out': (False, _words(['판매완료', '거래완료', '완료', 'sold', 'sold out']), True),
+    'condition': ('중고', _words(['새상품', '신품'], '신품'), True),
+    'brand': ('기타', [
+        ('미즈노', 'Mizuno'), ('mizuno', 'Mizuno'),
+        ('윌슨', 'Wilson'), ('wilson', 'Wilson'),
+        ('롤링스', 'Rawlings'), ('rawlings', 'Rawlings'),
+        ('제트', 'ZETT'), ('zett', 'ZETT'),
+        ('SSK', 'SSK'),
+        ('아톰즈', 'ATOMS'), ('atoms', 'ATOMS'),
+        ('구보타', 'Kubota'), ('kubota', 'Kubota'),
+    ], True),
+    'position': ('올라운드', [
+        ('내야', '내야수'), ('외야', '외야수'), ('투수', '투수'),
+        ('포수', '포수'), ('올라운드', '올라운드'),
+        ('유격수', '내야수'), ('2루수', '내야수'), ('3루수', '내야수'), ('1루수', '내야수'),
+    ], False),
+}
+
+class TitleClassifier:
+    """키워드 표 묶음 → 제목 한 번 스캔으로 표별 라벨 결정"""
+
+    def __init__(self, tables):
+        self.defaults = {name: default for name, (default, _, _) in tables.items()}
+
+        # 소문자 키워드 → [(표 이름, 표 안 순서, 값, 대소문자 구분 시 원래 키워드)]
+        self._entries = defaultdict(list)
+        for name, (_, keywords, ignore_case) in tables.items():
+            for rank, (keyword, value) in enumerate(keywords):
+                self._entries[keyword.lower()].append((name, rank, value, None if ignore_case else keyword))
+
+        # 한 위치에서는 가장 긴 키워드만 잡히므로 그 키워드의 접두어 키워드도 함께 확인
+        keys = sorted(self._entries, key=len, reverse=True)
+        self._prefixes = {key: [other for other in keys if key.startswith(other)] for key in keys}
+
+        # 모든 위치에서 lookahead로 키워드 확인 (겹치는 키워드도 빠짐없이),
+        # 첫 글자가 안 맞는 위치는 문자 클래스에서 바로 건너뜀
+        first_chars = ''.join(sorted({re.escape(key[0]) for key in keys}))
+        alternation = '|'.join(re.escape(key) for key in keys)
+        self._pattern = re.compile(f'(?=[{first_chars}])(?=({alternation}))', re.IGNORECASE)
+
+    def label(self, title):
+        """제목 → {표 이름: 라벨}"""
+        title = title or ''
+        best = {}
+        for match in self._pattern.finditer(title):
+            start = match.start()
+            for key in self._prefixes[match.group(1).lower()]:
+                for name, rank, value, exact in self._entries[key]:
+                    if exact is not None and not title.startswith(exact, start):
+                        continue
+                    if name not in best or rank < best[name][0]:
+                        best[name] = (rank, value)
+
+        labels = dict(self.defaults)
+        for name, (_, value) in best.items():
+            labels[name] = value
+        return labels
+
+    def classify(self, titles):
+        """여러 제목 일괄 분류"""
+        return [self.label(title) for title in titles]
+
+CLASSIFIERS = {
+    'yahoo': TitleClassifier(YAHOO_TABLES),
+    'yayongsa': TitleClassifier(YAYONGSA_TABLES),
+}
+
+def classify(titles, site='yahoo'):
+    """제목 목록 → 라벨 목록 (site: 'yahoo' 또는 'yayongsa')"""
+    return CLASSIFIERS[site].classify(titles)
+
+def classify_title(title, site='yahoo'):
+    return CLASSIFIERS[site].label(title)
+
+# 글러브 종류: 제목에 연식 키워드가 있으면 softball, 없으면 hardball (대소문자 무시, 소문자로 보관)
+SOFTBALL_TERMS = ('軟式', 'softball')
+
+def glove_type(title):
+    """제목 → 'softball' 또는 'hardball'"""
+    title = (title or '').lower()
+    return 'softball' if any(term in title for term in SOFTBALL_TERMS) else 'hardball'
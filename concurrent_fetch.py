@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+목록 페이지 동시 수집
+여러 페이지(b= 오프셋)를 스레드 풀로 동시에 가져오되 호스트별 요청 간격 + 지터를 지키고,
+짧은 페이지(마지막 페이지)가 보이면 그 뒤 페이지는 더 요청하지 않음
+결과는 완료 순서와 상관없이 항상 페이지 번호 순으로 합침
+"""
+
+import time
+import random
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# 기본 동시 요청 수, 같은 호스트 요청 간 최소 간격/지터 (초)
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MIN_INTERVAL = 0.5
+DEFAULT_JITTER = 0.3
+
+class HostRateLimiter:
+    """호스트별 요청 시작 간격 제한 (스레드 간 공유)"""
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, jitter=DEFAULT_JITTER):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """이 호스트에 요청해도 되는 시점까지 대기"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            gap = self.min_interval + (random.uniform(0, self.jitter) if self.jitter else 0)
+            self._next_slot[host] = slot + gap
+        if slot > now:
+            time.sleep(slot - now)
+
+def fetch_pages(load_page, max_pages, concurrency=DEFAULT_CONCURRENCY, page_size=100, is_last=None):
+    """1..max_pages 페이지를 동시에 수집
+
+    Args:
+        load_page: page_num → 카드 목록 (예외 발생 시 그 페이지에서 중단)
+        max_pages: 최대 페이지 수
+        concurrency: 동시에 진행할 페이지 수
+        page_size: 이보다 적은 카드가 나오면 마지막 페이지로 판단
+        is_last: cards → True면 그 페이지까지만 수집 (증분 크롤링: 이미 아는 페이지)
+
+    Returns:
+        [(page_num, cards), ...] 페이지 순서, 첫 실패 페이지 이전까지
+        (1페이지부터 실패하면 빈 목록)
+    """
+    results = {}
+    last_page = max_pages
+    next_page = 1
+    pending = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        while pending or next_page <= last_page:
+            # 마지막 페이지가 확인되기 전까지만 새 페이지 요청 (동시 진행 수 제한)
+            while next_page <= last_page and len(pending) < concurrency:
+                pending[executor.submit(load_page, next_page)] = next_page
+                next_page += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_num = pending.pop(future)
+                try:
+                    cards = future.result()
+                except Exception as e:
+                    print(f"❌ 페이지 {page_num} 오류: {e}")
+                    cards = None
+
+                results[page_num] = cards
+                if cards is None:
+                    last_page = min(last_page, page_num - 1)
+                elif len(cards) < page_size or (is_last is not None and is_last(cards)):
+                    last_page = min(last_page, page_num)
+
+    pages = []
+    for page_num in range(1, last_page + 1):
+        cards = results.get(page_num)
+        if cards is None:
+            break
+        pages.append((page_num, cards))
+    return pages
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤링 진행 이벤트 채널
+작업마다 JSON Lines 파일(data/crawl_events/<작업 id>.jsonl)에 구조화된 이벤트를 추가하고
+웹 서버는 파일을 이어 읽어 SSE(/api/crawl/<id>/events)로 전달 - 워커/웹 서버가 다른 프로세스라도 동작
+
+크롤러 코드는 emit()만 호출 (진행 중인 작업이 없으면 아무것도 하지 않음)
+워커 안에서 실행되는 크롤러는 페이지 사이에 check_cancel(cancel)로 취소 요청 확인
+- 워커 프로세스 안: use_channel()로 현재 스레드의 채널 지정
+- 하위 프로세스: 환경변수 CRAWL_EVENTS_FILE (child_env()로 전달)
+"""
+
+import os
+import json
+import time
+import glob
+import threading
+import contextlib
+import contextvars
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EVENTS_DIR = os.environ.get('CRAWL_EVENTS_DIR', os.path.join(BASE_DIR, 'data', 'crawl_events'))
+ENV_VAR = 'CRAWL_EVENTS_FILE'
+
+# 작업이 끝났음을 나타내는 status 이벤트 상태
+TERMINAL_STATES = ('completed', 'failed', 'cancelled')
+
+# 이 기간(초)이 지난 이벤트 파일은 prune()에서 삭제
+KEEP_FOR = 7 * 24 * 3600
+
+class JobCancelled(Exception):
+    """취소 요청으로 중단된 작업"""
+
+def check_cancel(cancel):
+    """취소 요청(threading.Event)이 있으면 JobCancelled (cancel이 None이면 무시)"""
+    if cancel is not None and cancel.is_set():
+        raise JobCancelled()
+
+def events_path(job_id):
+    return os.path.join(EVENTS_DIR, f"{job_id}.jsonl")
+
+class EventChannel:
+    """이벤트 파일 1개에 추가 기록 (스레드/프로세스 간 공유 가능)
+
+    이벤트 id는 읽는 쪽에서 파일 안 위치(줄 끝 offset)로 정함 - 여러 프로세스가 써도 겹치지 않음
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def emit(self, event, **data):
+        """이벤트 1개 기록 (event: 'page', 'images', 'status' 등)"""
+        record = {'event': event, 'time': time.time(), 'data': data}
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # 한 줄을 write 한 번으로 추가 (다른 프로세스가 같은 파일에 추가해도 줄이 섞이지 않음)
+            with open(self.path, 'ab') as f:
+                f.write(line)
+        return record
+
+class NullChannel:
+    """진행 중인 작업이 없을 때 (명령줄 실행 등)"""
+
+    path = None
+
+    def emit(self, event, **data):
+        return None
+
+NULL_CHANNEL = NullChannel()
+
+_current = contextvars.ContextVar('crawl_events_channel', default=None)
+_env_channel = None
+_env_lock = threading.Lock()
+
+def current():
+    """현재 작업의 채널 - 스레드 풀 안에서 쓸 때는 호출 측 스레드에서 미리 가져와 넘김"""
+    channel = _current.get()
+    if channel is not None:
+        return channel
+
+    global _env_channel
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return NULL_CHANNEL
+    with _env_lock:
+        if _env_channel is None or _env_channel.path != path:
+            _env_channel = EventChannel(path)
+        return _env_channel
+
+def emit(event, **data):
+    return current().emit(event, **data)
+
+@contextlib.contextmanager
+def use_channel(channel):
+    """with 블록 동안 현재 스레드의 emit()이 channel에 기록"""
+    token = _current.set(channel)
+    try:
+        yield channel
+    finally:
+        _current.reset(token)
+
+def child_env(channel):
+    """하위 프로세스 환경변수 (하위 프로세스의 emit()도 같은 파일에 기록)"""
+    env = dict(os.environ)
+    if channel.path:
+        env[ENV_VAR] = channel.path
+    return env
+
+def read_events(path, offset=0):
+    """파일의 offset 이후 완성된 줄 → ([(이벤트 id = 줄 끝 offset, 이벤트)], 새 offset)"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read()
+    except OSError:
+        return [], offset
+
+    # 아직 쓰는 중인 마지막 줄은 다음에 읽음
+    end = chunk.rfind(b'\n') + 1
+    events = []
+    position = offset
+    for line in chunk[:end].splitlines(keepends=True):
+        position += len(line)
+        try:
+            events.append((position, json.loads(line)))
+        except ValueError:
+            continue
+    return events, offset + end
+
+def prune(max_age=KEEP_FOR):
+    """오래된 이벤트 파일 삭제 → 삭제한 파일 수"""
+    removed = 0
+    cutoff = time.time() - max_age
+    for path in glob.glob(os.path.join(EVENTS_DIR, '*.jsonl')):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
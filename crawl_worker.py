@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤링 작업 워커
+웹 서버가 CrawlHistory 테이블에 등록한 작업(pending)을 가져와 스레드 풀에서 실행
+- 마켓별 동시 실행 수 제한, 같은 내용의 작업은 한 번에 하나만 실행 (Chrome 중복 실행 방지)
+- 실패 시 지수 백오프로 재시도, 취소 요청 시 다음 확인 시점에 중단 (하위 프로세스는 종료)
+- 워커가 중간에 죽으면 heartbeat가 끊긴 작업을 다른 워커가 다시 대기열로 돌림
+
+사용법:
+    python crawl_worker.py             # 웹 서버와 별도 프로세스로 실행
+    python crawl_worker.py --once      # 대기 작업만 처리하고 종료
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import threading
+import subprocess
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from main_app import app, db, User, CrawlHistory, KST, on_snapshot_written, emit_job_status
+import crawl_events
+from crawl_events import JobCancelled, check_cancel
+import snapshot_loader
+import yahoo_crawler
+import driver_pool
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 워커 스레드 수, 마켓별 동시 실행 수 (같은 내용의 작업은 항상 하나씩)
+# Yahoo는 사용자별 저장 폴더가 달라 드라이버 풀 크기만큼 동시 실행, 야용사는 수동 로그인이라 하나씩
+WORKERS = int(os.environ.get('CRAWL_WORKERS', 3))
+MARKET_LIMITS = {'yahoo': driver_pool.POOL_SIZE, 'yayongsa': 1, 'dashboard': 1}
+
+# 대기열 확인 주기 (초), 이 시간(초) 동안 heartbeat가 없으면 워커가 죽은 것으로 봄
+POLL_INTERVAL = 2
+STALE_AFTER = 120
+
+# 재시도 대기 (초): RETRY_BACKOFF * 2^(시도 횟수-1), 최대 RETRY_BACKOFF_MAX
+RETRY_BACKOFF = 60
+RETRY_BACKOFF_MAX = 30 * 60
+
+def run_subprocess(args, cwd, cancel):
+    """하위 프로세스 실행 (취소 요청 시 종료) → stdout, 실패 시 RuntimeError"""
+    # 하위 프로세스의 진행 이벤트도 같은 작업 채널로
+    process = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, encoding='utf-8', errors='replace',
+                               env=crawl_events.child_env(crawl_events.current()))
+    while True:
+        try:
+            stdout, stderr = process.communicate(timeout=1)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel.is_set():
+                process.terminate()
+                try:
+                    process.communicate(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.communicate()
+                raise JobCancelled()
+
+    if process.returncode != 0:
+        raise RuntimeError((stderr or stdout or '')[-500:] or f'exit code {process.returncode}')
+    return stdout
+
+def snapshot_item_count(path, market):
+    """크롤링이 저장한 스냅샷의 항목 수 (get_user_stats와 같은 기준, 저장한 파일이 없으면 0)"""
+    if not path:
+        return 0
+    summary = snapshot_loader.load_snapshot(path, market).summary
+    return summary['count'] if market == 'yahoo' else summary['priced_count']
+
+def run_snapshot_subprocess(args, cwd, cancel, data_dir, market):
+    """스냅샷을 data_dir에 저장하는 크롤러 실행 → (stdout, 새로 저장된 스냅샷 경로 또는 None)"""
+    before = snapshot_loader.latest_paths(data_dir).get(market)
+    output = run_subprocess(args, cwd, cancel)
+    after = snapshot_loader.latest_paths(data_dir).get(market)
+    return output, (after if after != before else None)
+
+def write_user_config(user_dir, user, days):
+    """야용사 크롤러용 사용자 설정 파일"""
+    config_file = os.path.join(user_dir, 'config.py')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write(f'''
+KAKAO_ID = "{user.kakao_id}"
+KAKAO_PASSWORD = "{user.kakao_password}"
+WAIT_TIME = 30
+CRAWL_DAYS = {days}
+
+BOARDS = {{
+    "중고글러브벼룩시장": {{
+        "url": "https://cafe.daum.net/baseballsale/79XF",
+        "enabled": True
+    }},
+    "새제품 글러브 벼룩시장": {{
+        "url": "https://cafe.daum.net/baseballsale/2Fsn",
+        "enabled": True
+    }}
+}}
+''')
+
+def run_user_crawl(job, params, cancel):
+    """사용자 폴더(users/<이름>/)에서 크롤링 + 사용자 대시보드 생성 → 수집 항목 수"""
+    username = params['username']
+    days = params.get('days', 3)
+    user_dir = os.path.join(BASE_DIR, 'users', username)
+    for folder in ('data', 'images', 'dashboards'):
+        os.makedirs(os.path.join(user_dir, folder), exist_ok=True)
+
+    if job.market == 'yahoo':
+        # Yahoo 크롤러는 워커 프로세스 안에서 증분 실행 (Chrome이 필요하면 드라이버 풀에서 대여)
+        # 저장 폴더를 직접 넘기므로 작업 디렉터리를 바꾸지 않음 (다른 사용자 작업과 동시 실행 가능)
+        filename = yahoo_crawler.run_incremental(pool=driver_pool.get_pool(), out_dir=os.path.join(user_dir, 'data'),
+                                                 cancel=cancel)
+    else:  # yayongsa
+        user = db.session.get(User, job.user_id)
+        if user and user.kakao_id and user.kakao_password:
+            write_user_config(user_dir, user, days)
+        # 수동 로그인을 위한 Jupyter 크롤러 사용 (작업 디렉터리 기준 data/에 저장)
+        _, filename = run_snapshot_subprocess(
+            [sys.executable, os.path.join(BASE_DIR, 'yayongsa_jupyter_crawler.py')], user_dir, cancel,
+            os.path.join(user_dir, 'data'), job.market)
+
+    # 수집된 아이템 수는 이 작업이 사용자 폴더에 저장한 스냅샷 기준
+    on_snapshot_written()
+    item_count = snapshot_item_count(filename, job.market)
+
+    # 대시보드 생성
+    for script in ('enhanced_dashboard.py', 'product_dashboard.py'):
+        check_cancel(cancel)
+        script_path = os.path.join(BASE_DIR, script)
+        if os.path.exists(script_path):
+            run_subprocess([sys.executable, script_path], user_dir, cancel)
+    return item_count
+
+def run_market_crawl(job, params, cancel):
+    """공용 data/ 폴더 크롤링 → 수집 항목 수"""
+    if job.market == 'yahoo':
+        # 증분 크롤링 (새/변경된 경매만 받아 이전 스냅샷에 합침)
+        filename = yahoo_crawler.run_incremental(pool=driver_pool.get_pool(), out_dir=snapshot_loader.DATA_DIR,
+                                                 cancel=cancel)
+        print(f"크롤러 성공: {filename}")
+    else:
+        # Chrome 창이 열리면서 수동 로그인 대기
+        output, filename = run_snapshot_subprocess([sys.executable, 'yayongsa_crawler.py'], BASE_DIR, cancel,
+                                                   snapshot_loader.DATA_DIR, job.market)
+        print(f"야용사 크롤러 성공: {output[-500:]}")
+
+    on_snapshot_written()
+    return snapshot_item_count(filename, job.market)
+
+def run_dashboard_update(job, params, cancel):
+    run_subprocess([sys.executable, 'update_dashboard.py'], BASE_DIR, cancel)
+    return None
+
+def run_job(job, params, cancel):
+    """작업 종류별 실행 → 수집 항목 수 (없으면 None)"""
+    check_cancel(cancel)
+    if job.market == 'dashboard':
+        return run_dashboard_update(job, params, cancel)
+    if params.get('username'):
+        return run_user_crawl(job, params, cancel)
+    return run_market_crawl(job, params, cancel)
+
+def retry_delay(attempts):
+    return min(RETRY_BACKOFF * 2 ** max(attempts - 1, 0), RETRY_BACKOFF_MAX)
+
+class CrawlWorker:
+    """대기열에서 작업을 가져와 실행하는 워커 (프로세스당 1개)"""
+
+    def __init__(self, workers=WORKERS, poll_interval=POLL_INTERVAL):
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.running = {}  # 작업 id → (future, 취소 이벤트)
+        self.stop = threading.Event()
+
+    def requeue_stale(self):
+        """heartbeat가 끊긴 실행 중 작업 (워커 재시작 등) → 재시도 대기 또는 실패"""
+        cutoff = datetime.now(KST) - timedelta(seconds=STALE_AFTER)
+        stale = CrawlHistory.query.filter(
+            CrawlHistory.status == 'running',
+            db.or_(CrawlHistory.heartbeat_at < cutoff, CrawlHistory.heartbeat_at.is_(None)),
+            db.or_(CrawlHistory.worker != self.name, CrawlHistory.worker.is_(None))).all()
+        for job in stale:
+            print(f"♻️ 중단된 작업 #{job.id} ({job.market}, 워커 {job.worker})")
+            self.finish_failed(job, '워커가 작업 도중 중단되었습니다.')
+        if stale:
+            db.session.commit()
+        for job in stale:
+            emit_job_status(job)
+
+    def claim(self, limit):
+        """실행할 수 있는 대기 작업을 마켓별 제한 안에서 가져옴 → 작업 id 목록 (같은 내용의 작업이 실행 중이면 대기)
+
+        대기 → 실행 전환은 UPDATE 한 문장 (여러 워커가 동시에 가져가도 중복/제한 초과 없음)
+        """
+        now = datetime.now(KST)
+        candidates = CrawlHistory.query.filter(
+            CrawlHistory.status == 'pending',
+            db.or_(CrawlHistory.run_after <= now, CrawlHistory.run_after.is_(None)))\
+            .order_by(CrawlHistory.run_after, CrawlHistory.id).limit(limit * 4).all()
+
+        claimed = []
+        for job in candidates:
+            if len(claimed) >= limit:
+                break
+            other = db.aliased(CrawlHistory)
+            running = db.select(db.func.count(other.id))\
+                .where(other.market == job.market, other.status == 'running').scalar_subquery()
+            duplicate = db.select(other.id)\
+                .where(other.dedup_key == job.dedup_key, other.status == 'running').exists()
+            result = db.session.execute(
+                db.update(CrawlHistory)
+                .where(CrawlHistory.id == job.id, CrawlHistory.status == 'pending',
+                       running < MARKET_LIMITS.get(job.market, 1), ~duplicate)
+                .values(status='running', worker=self.name, started_at=now, heartbeat_at=now,
+                        attempts=CrawlHistory.attempts + 1, cancel_requested=False)
+                .execution_options(synchronize_session=False))
+            db.session.commit()
+            if result.rowcount:
+                claimed.append(job.id)
+        return claimed
+
+    def heartbeat(self):
+        """실행 중인 작업 heartbeat 갱신 + 취소 요청 전달"""
+        if not self.running:
+            return
+        ids = list(self.running)
+        db.session.execute(
+            db.update(CrawlHistory).where(CrawlHistory.id.in_(ids))
+            .values(heartbeat_at=datetime.now(KST)).execution_options(synchronize_session=False))
+        db.session.commit()
+
+        cancelled = db.session.execute(
+            db.select(CrawlHistory.id).where(CrawlHistory.id.in_(ids), CrawlHistory.cancel_requested.is_(True)))
+        for (job_id,) in cancelled:
+            self.running[job_id][1].set()
+
+    def finish_failed(self, job, error):
+        """실패 처리 - 시도 횟수가 남았으면 백오프 후 다시 대기"""
+        job.error_message = str(error)[:500] or 'Unknown error'
+        job.worker = None
+        if job.cancel_requested:
+            job.status = 'cancelled'
+            job.completed_at = datetime.now(KST)
+        elif job.attempts < job.max_attempts:
+            delay = retry_delay(job.attempts)
+            job.status = 'pending'
+            job.run_after = datetime.now(KST) + timedelta(seconds=delay)
+            print(f"🔁 작업 #{job.id} {delay}초 후 재시도 ({job.attempts}/{job.max_attempts})")
+        else:
+            job.status = 'failed'
+            job.completed_at = datetime.now(KST)
+
+    def execute(self, job_id, cancel):
+        """작업 1개 실행 (워커 스레드)"""
+        with app.app_context():
+            job = db.session.get(CrawlHistory, job_id)
+            print(f"▶️ 작업 #{job.id} 시작: {job.market} (시도 {job.attempts}/{job.max_attempts})")
+            channel = crawl_events.EventChannel(crawl_events.events_path(job_id))
+            emit_job_status(job, channel)
+            try:
+                with crawl_events.use_channel(channel):
+                    item_count = run_job(job, json.loads(job.params or '{}'), cancel)
+            except JobCancelled:
+                db.session.rollback()
+                job = db.session.get(CrawlHistory, job_id)
+                job.status = 'cancelled'
+                job.completed_at = datetime.now(KST)
+                print(f"⏹️ 작업 #{job.id} 취소됨")
+            except Exception as e:
+                db.session.rollback()
+                job = db.session.get(CrawlHistory, job_id)
+                print(f"❌ 작업 #{job.id} 실패: {e}")
+                self.finish_failed(job, e)
+            else:
+                job = db.session.get(CrawlHistory, job_id)
+                job.status = 'completed'
+                job.completed_at = datetime.now(KST)
+                job.error_message = None
+                if item_count is not None:
+                    job.item_count = item_count
+                print(f"✅ 작업 #{job.id} 완료")
+            db.session.commit()
+            emit_job_status(job, channel)
+
+    def reap(self):
+        for job_id in [job_id for job_id, (future, _) in self.running.items() if future.done()]:
+            future, _ = self.running.pop(job_id)
+            if future.exception():
+                print(f"❌ 작업 #{job_id} 처리 오류: {future.exception()}")
+
+    def tick(self):
+        with app.app_context():
+            self.reap()
+            self.heartbeat()
+            self.requeue_stale()
+            if self.stop.is_set():
+                return
+            for job_id in self.claim(self.workers - len(self.running)):
+                cancel = threading.Event()
+                self.running[job_id] = (self.executor.submit(self.execute, job_id, cancel), cancel)
+
+    def run(self, once=False):
+        print(f"🛠️ 크롤링 워커 시작: {self.name} (스레드 {self.workers}개)")
+        while True:
+            self.tick()
+            if self.stop.is_set() or (once and not self.running):
+                break
+            time.sleep(self.poll_interval)
+
+        # 실행 중인 작업은 끝까지 처리 (heartbeat 유지)
+        while self.running:
+            time.sleep(self.poll_interval)
+            self.tick()
+        self.executor.shutdown(wait=True)
+        print("👋 크롤링 워커 종료")
+
+def main():
+    parser = argparse.ArgumentParser(description='크롤링 작업 워커')
+    parser.add_argument('--workers', type=int, default=WORKERS, help='동시 실행 작업 수')
+    parser.add_argument('--once', action='store_true', help='대기 작업만 처리하고 종료')
+    args = parser.parse_args()
+
+    crawl_events.prune()
+    worker = CrawlWorker(args.workers)
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: worker.stop.set())
+
+    # chromedriver가 설치된 서버(Docker)에서는 크롤링용 headless Chrome을 미리 실행
+    if driver_pool.available():
+        driver_pool.warm_up_async()
+
+    worker.run(once=args.once)
+
+if __name__ == "__main__":
+    main()
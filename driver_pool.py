@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+headless Chrome 드라이버 풀
+크롤링 워커 프로세스(crawl_worker.py)에서 Chrome을 미리 띄워두고 크롤링 작업에 빌려줌
+- 시작 시 한 번만 실행 (ChromeDriverManager 네트워크 조회 없이 시스템 chromedriver 사용)
+- 빌려줄 때 상태 확인, 일정 페이지 수를 넘기면 새 Chrome으로 교체
+"""
+
+import os
+import time
+import atexit
+import shutil
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 풀 크기, 드라이버 1개당 최대 페이지 수 (넘으면 재시작), 대여 대기 시간 (초)
+POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+MAX_PAGES_PER_DRIVER = int(os.environ.get('DRIVER_POOL_MAX_PAGES', 50))
+LEASE_TIMEOUT = 120
+
+def chromedriver_path():
+    """CHROMEDRIVER_PATH 또는 PATH의 chromedriver (Docker: chromium-driver 패키지)"""
+    return os.environ.get('CHROMEDRIVER_PATH') or shutil.which('chromedriver')
+
+def chrome_binary():
+    """Chrome 대신 chromium만 설치된 환경이면 chromium 경로"""
+    binary = os.environ.get('CHROME_BIN')
+    if binary:
+        return binary
+    if shutil.which('google-chrome') or shutil.which('chrome'):
+        return None
+    return shutil.which('chromium') or shutil.which('chromium-browser')
+
+def available():
+    """이 서버에서 드라이버 풀을 쓸 수 있는지 (chromedriver 설치 여부)"""
+    return chromedriver_path() is not None
+
+def chrome_options():
+    options = Options()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-notifications')
+    options.add_argument('--window-size=1280,800')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument(f'user-agent={USER_AGENT}')
+    binary = chrome_binary()
+    if binary:
+        options.binary_location = binary
+    return options
+
+def create_driver():
+    """headless Chrome 실행 (chromedriver가 PATH에 없으면 Selenium Manager 로컬 캐시 사용)"""
+    path = chromedriver_path()
+    service = Service(path) if path else Service()
+    return webdriver.Chrome(service=service, options=chrome_options())
+
+class PooledDriver:
+    """풀에서 빌려준 드라이버 - 페이지 이동 수를 세서 재시작 시점 판단
+
+    WebDriver와 같은 방식으로 사용 (get 외의 속성은 원래 드라이버로 전달)
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    def get(self, url):
+        self.pages += 1
+        return self.driver.get(url)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+class DriverPool:
+    """headless Chrome 풀 (스레드 간 공유)"""
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_DRIVER, factory=create_driver):
+        self.size = size
+        self.max_pages = max_pages
+        self.factory = factory
+        self._idle = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def warm_up(self):
+        """풀 크기만큼 Chrome을 미리 실행"""
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or self._created >= self.size:
+                    break
+                self._created += 1
+            pooled = self._spawn()
+            if pooled is None:
+                break
+            self._release_idle(pooled)
+            started += 1
+        if started:
+            print(f"🌐 드라이버 풀 준비 완료: headless Chrome {started}개")
+        return started
+
+    def _spawn(self):
+        try:
+            return PooledDriver(self.factory())
+        except Exception as e:
+            print(f"❌ Chrome 실행 실패: {e}")
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return None
+
+    def _healthy(self, pooled):
+        try:
+            pooled.driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def _release_idle(self, pooled):
+        with self._cond:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                self._idle.append(pooled)
+                self._cond.notify()
+        if closed:
+            self._discard(pooled)
+
+    def _acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._created >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if self._closed or remaining <= 0:
+                        raise TimeoutError('사용 가능한 Chrome 드라이버가 없습니다.')
+                    self._cond.wait(remaining)
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    pooled = None
+                    self._created += 1
+
+            if pooled is None:
+                pooled = self._spawn()
+                if pooled is None:
+                    raise RuntimeError('Chrome 드라이버를 시작할 수 없습니다.')
+                return pooled
+
+            # 오래 쉬는 동안 죽은 Chrome은 버리고 다시 시도
+            if self._healthy(pooled):
+                return pooled
+            print("⚠️ 응답 없는 Chrome 교체")
+            self._discard(pooled)
+
+    @contextmanager
+    def lease(self, timeout=LEASE_TIMEOUT):
+        """드라이버 대여 - with 블록이 끝나면 풀로 반환 (페이지 수 초과/비정상이면 교체)"""
+        pooled = self._acquire(timeout)
+        try:
+            yield pooled
+        finally:
+            if pooled.pages >= self.max_pages or not self._healthy(pooled):
+                print(f"♻️ Chrome 재시작 ({pooled.pages}페이지 사용)")
+                self._discard(pooled)
+            else:
+                try:
+                    pooled.driver.delete_all_cookies()
+                    pooled.driver.get('about:blank')
+                except Exception:
+                    pass
+                self._release_idle(pooled)
+
+    def close(self):
+        """모든 Chrome 종료"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+# 프로세스 전역 풀
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """프로세스 전역 드라이버 풀 (처음 호출 시 생성, Chrome은 필요할 때 실행)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
+
+def warm_up_async():
+    """백그라운드에서 풀 Chrome 미리 실행 (서버 시작 지연 없음)"""
+    thread = threading.Thread(target=get_pool().warm_up, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+엔화 → 원화 환율 제공
+환율 소스(HTTP API, 로컬 파일)를 순서대로 시도하고 결과를 TTL 동안 메모리 + 디스크에 캐시
+크롤링 1회당 한 번 조회해서 landed_cost에 넘기고, 웹 서버/대시보드는 캐시된 환율로
+저장된 카탈로그의 원화 금액을 다시 계산 (JSON 스냅샷은 그대로)
+웹 요청은 cached_rate()만 사용 - 네트워크 조회 없이 캐시 값을 바로 쓰고, 만료됐으면 백그라운드 스레드가 갱신
+"""
+
+import os
+import json
+import time
+import threading
+
+import requests
+
+import landed_cost
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 캐시 유지 시간 (초), 캐시 파일, 오프라인용 환율 파일
+RATE_TTL = int(os.environ.get('EXCHANGE_RATE_TTL', 6 * 3600))
+CACHE_PATH = os.environ.get('EXCHANGE_RATE_CACHE', os.path.join(BASE_DIR, 'data', 'exchange_rate_cache.json'))
+FIXTURE_PATH = os.environ.get('EXCHANGE_RATE_FILE', os.path.join(BASE_DIR, 'fixtures', 'exchange_rate.json'))
+
+# 1엔 기준 환율 API (키 불필요), 'off'면 파일만 사용
+RATE_API_URL = os.environ.get('EXCHANGE_RATE_URL', 'https://open.er-api.com/v6/latest/JPY')
+HTTP_TIMEOUT = 5
+
+# 모든 소스가 실패하면 이 시간(초) 동안은 다시 조회하지 않고 이전 값 사용
+RETRY_INTERVAL = 300
+
+class RateSource:
+    """환율 소스 - fetch()는 1엔당 원화 (실패 시 예외)"""
+
+    name = 'source'
+
+    def fetch(self):
+        raise NotImplementedError
+
+class HttpRateSource(RateSource):
+    """환율 API ({"rates": {"KRW": ...}} 형식)"""
+
+    name = 'http'
+
+    def __init__(self, url=RATE_API_URL, timeout=HTTP_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return float(response.json()['rates']['KRW'])
+
+class FileRateSource(RateSource):
+    """로컬 JSON 파일 ({"rate": 9.2}) - 오프라인/테스트용"""
+
+    name = 'file'
+
+    def __init__(self, path=FIXTURE_PATH):
+        self.path = path
+
+    def fetch(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return float(json.load(f)['rate'])
+
+def default_sources():
+    sources = []
+    if RATE_API_URL and RATE_API_URL != 'off':
+        sources.append(HttpRateSource())
+    sources.append(FileRateSource())
+    return sources
+
+class RateProvider:
+    """TTL 캐시 환율 (스레드 간 공유, 캐시는 디스크에도 저장해서 재시작 후에도 사용)"""
+
+    def __init__(self, sources=None, cache_path=CACHE_PATH, ttl=RATE_TTL):
+        self.sources = sources if sources is not None else default_sources()
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._cached = None
+        self._retry_at = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_lock = threading.Lock()
+
+    def _fresh(self, cached):
+        return cached is not None and time.time() - cached['fetched_at'] < self.ttl
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            return {'rate': float(cached['rate']), 'source': cached.get('source', ''),
+                    'fetched_at': float(cached['fetched_at'])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_cache(self, cached):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cached, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ 환율 캐시 저장 실패: {e}")
+
+    def _fetch(self):
+        for source in self.sources:
+            try:
+                rate = source.fetch()
+            except Exception as e:
+                print(f"⚠️ 환율 조회 실패 ({source.name}): {e}")
+                continue
+            if rate > 0:
+                return {'rate': rate, 'source': source.name, 'fetched_at': time.time()}
+        return None
+
+    def get(self):
+        """{'rate', 'source', 'fetched_at'} - 캐시가 만료됐으면 소스에서 다시 조회
+
+        모든 소스가 실패하면 만료된 캐시, 그것도 없으면 비용 표의 기본 환율
+        """
+        with self._lock:
+            if self._fresh(self._cached) or (self._cached and time.time() < self._retry_at):
+                return self._cached
+            cached = self._load_cache()
+            if self._fresh(cached):
+                self._cached = cached
+                return cached
+
+            fetched = self._fetch()
+            if fetched is not None:
+                print(f"💱 환율 갱신: 1엔 = {fetched['rate']:.4f}원 ({fetched['source']})")
+                self._save_cache(fetched)
+                self._cached = fetched
+                return fetched
+
+            self._retry_at = time.time() + RETRY_INTERVAL
+            self._cached = cached or self._cached or {
+                'rate': landed_cost.get_table()['exchange_rate'], 'source': 'default', 'fetched_at': 0}
+            return self._cached
+
+    def rate(self):
+        return self.get()['rate']
+
+    def peek(self):
+        """네트워크 조회 없이 현재 캐시 값 (메모리 → 디스크 캐시 → 비용 표 기본 환율)
+
+        만료됐으면 백그라운드에서 갱신하고 이번에는 이전 값을 그대로 반환
+        """
+        cached = self._cached
+        if cached is None:
+            cached = self._load_cache() or {
+                'rate': landed_cost.get_table()['exchange_rate'], 'source': 'default', 'fetched_at': 0}
+            self._cached = cached
+        if not self._fresh(cached) and time.time() >= self._retry_at:
+            self.refresh_async()
+        return cached
+
+    def refresh_async(self):
+        """백그라운드 갱신 (이미 진행 중이면 생략)"""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.get()
+            except Exception as e:
+                print(f"⚠️ 환율 갱신 실패: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate(self):
+        with self._lock:
+            self._cached = None
+            self._retry_at = 0
+            try:
+                os.remove(self.cache_path)
+            except OSError:
+                pass
+
+# 프로세스 전역 제공자
+_provider = None
+_provider_lock = threading.Lock()
+
+def get_provider():
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = RateProvider()
+        return _provider
+
+def current_rate():
+    """현재 엔화 → 원화 환율 (캐시, 만료됐으면 조회할 때까지 대기 - 크롤러/명령줄용)"""
+    return get_provider().rate()
+
+def cached_rate():
+    """웹 요청용 환율 - 대기 없이 캐시 값 (만료됐으면 백그라운드 갱신)"""
+    return get_provider().peek()['rate']
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+제품 필터 facet 색인
+현재 카탈로그(최신 스냅샷의 판매 중 제품)에서 facet 값마다 bool 배열(비트셋) 1개를 만들어 두고
+필터 조합은 비트셋 AND로 계산 - 일치하는 제품 id와 facet 값별 남은 개수를 한 번에 반환
+
+facet별 개수는 그 facet 자신의 선택은 빼고 계산 (드롭다운에서 다른 값을 고르면 몇 개가 되는지)
+"""
+
+import numpy as np
+
+class FacetIndex:
+    """제품 id 배열 + {facet: {값: bool 배열}}"""
+
+    def __init__(self, ids, columns):
+        """ids: 제품 id 목록, columns: {facet: 제품별 값 목록 (ids와 같은 순서)}"""
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.bitsets = {}
+        for facet, values in columns.items():
+            self.bitsets[facet] = {}
+            if not len(self.ids):
+                continue
+            uniques, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+            for code, value in enumerate(uniques.tolist()):
+                self.bitsets[facet][value] = codes == code
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add_value(self, facet, value, bitset):
+        """여러 값을 묶은 값 추가 (예: 브랜드 'other' = 기타 + その他)"""
+        self.bitsets[facet][value] = np.asarray(bitset, dtype=bool)
+
+    def union(self, facet, values):
+        """facet 값 여러 개의 비트셋 OR"""
+        result = np.zeros(len(self.ids), dtype=bool)
+        for value in values:
+            bitset = self.bitsets[facet].get(value)
+            if bitset is not None:
+                result |= bitset
+        return result
+
+    def resolve(self, filters, mask=None):
+        """필터 {facet: 값} (+ 추가 조건 mask) → (일치하는 id 배열, {facet: {값: 개수, 'all': 개수}})
+
+        색인에 없는 값을 고르면 일치하는 제품 없음
+        """
+        everything = np.ones(len(self.ids), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        empty = np.zeros(len(self.ids), dtype=bool)
+        selected = {facet: self.bitsets[facet].get(value, empty)
+                    for facet, value in filters.items() if facet in self.bitsets}
+
+        matched = everything.copy()
+        for bitset in selected.values():
+            matched &= bitset
+
+        counts = {}
+        for facet, values in self.bitsets.items():
+            base = everything.copy()
+            for other, bitset in selected.items():
+                if other != facet:
+                    base &= bitset
+            counts[facet] = {value: int(np.count_nonzero(base & bitset)) for value, bitset in values.items()}
+            counts[facet]['all'] = int(np.count_nonzero(base))
+
+        return self.ids[matched], counts
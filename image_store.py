@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+상품 이미지 저장소 (내용 주소 방식)
+이미지를 SHA-256 해시 경로(data/images/ab/abcdef....jpg)에 한 번만 저장하고
+URL → 해시 색인으로 같은 이미지는 크롤링마다 다시 받지 않음
+- 연결을 재사용하는 세션 + 스레드 풀로 동시 다운로드 (재시도, 호스트별 요청 간격)
+- 오래된 항목은 ETag/Last-Modified 조건부 요청으로 변경 여부만 확인
+- 색인 파일은 웹 서버/크롤링 워커가 함께 씀: 저장할 때 파일 잠금 후 디스크의 색인과 합치고,
+  색인에 없는 URL을 찾을 때 파일이 바뀌었으면 다시 읽음
+
+사용법:
+    python image_store.py --import yahoo_images_*    # 예전 크롤링 이미지 폴더를 저장소로 이동(복사)
+    python image_store.py --stats                    # 저장소 파일 수/용량
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows - 잠금 없이 합치기만
+    fcntl = None
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import concurrent_fetch
+import crawl_events
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.environ.get('IMAGE_STORE_DIR', os.path.join(BASE_DIR, 'data', 'images'))
+INDEX_FILE = 'index.json'
+
+# 동시 다운로드 수, 요청 타임아웃 (초), 재시도 횟수, 같은 호스트 요청 간격 (초)
+WORKERS = int(os.environ.get('IMAGE_WORKERS', 8))
+TIMEOUT = 10
+RETRIES = 2
+MIN_INTERVAL = 0.05
+
+# 이 기간(초)이 지난 이미지만 조건부 요청으로 다시 확인
+REVALIDATE_AFTER = 7 * 24 * 3600
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+def guess_extension(content, content_type=''):
+    """Content-Type 또는 파일 앞부분으로 확장자 결정"""
+    ext = CONTENT_TYPES.get((content_type or '').split(';')[0].strip().lower())
+    if ext:
+        return ext
+    if content[:3] == b'\xff\xd8\xff':
+        return '.jpg'
+    if content[:8] == b'\x89PNG\r\n\x1a\n':
+        return '.png'
+    if content[:6] in (b'GIF87a', b'GIF89a'):
+        return '.gif'
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return '.webp'
+    return '.jpg'
+
+def create_session(workers=WORKERS, retries=RETRIES):
+    """이미지용 세션 (동시 다운로드 수만큼 연결 재사용, 5xx/429 재시도)"""
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=('GET',))
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class ImageStore:
+    """SHA-256 내용 주소 이미지 저장소 + URL 색인"""
+
+    def __init__(self, root=IMAGE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index_mtime = None
+        self._index = self._load_index()
+
+    def _index_stat(self):
+        try:
+            return os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_index(self):
+        self._index_mtime = self._index_stat()
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _merge(base, entries):
+        """색인 합치기 - 같은 URL은 더 최근에 확인한 항목 사용"""
+        for url, entry in entries.items():
+            current = base.get(url)
+            if current is None or entry.get('checked_at', 0) >= current.get('checked_at', 0):
+                base[url] = entry
+        return base
+
+    def reload_index(self):
+        """다른 프로세스가 색인 파일을 바꿨으면 다시 읽어서 합침 → 다시 읽었는지"""
+        if self._index_stat() == self._index_mtime:
+            return False
+        disk = self._load_index()
+        with self._lock:
+            self._index = self._merge(disk, self._index)
+        return True
+
+    def save_index(self):
+        """색인 저장 - 파일 잠금 안에서 디스크의 색인(다른 프로세스가 쓴 항목)과 합친 뒤 기록"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path + '.lock', 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            disk = self._load_index()
+            with self._lock:
+                self._index = self._merge(disk, self._index)
+                data = json.dumps(self._index, ensure_ascii=False)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+            self._index_mtime = self._index_stat()
+
+    def path_for(self, digest, ext):
+        return os.path.join(self.root, digest[:2], digest + ext)
+
+    def put(self, content, content_type=''):
+        """이미지 바이트 저장 → 저장 경로 (같은 내용이 이미 있으면 쓰지 않음)"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.path_for(digest, guess_extension(content, content_type))
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return path
+
+    def lookup(self, url):
+        """이미 받은 URL의 저장 경로 (파일이 없으면 None) - 색인에 없으면 다른 프로세스가 저장했는지 확인"""
+        with self._lock:
+            entry = self._index.get(url)
+        if entry is None and self.reload_index():
+            with self._lock:
+                entry = self._index.get(url)
+        if entry and os.path.exists(os.path.join(self.root, entry['path'])):
+            return os.path.join(self.root, entry['path'])
+        return None
+
+    def _record(self, url, path, response=None):
+        entry = {'path': os.path.relpath(path, self.root), 'checked_at': time.time()}
+        if response is not None:
+            for header, key in (('ETag', 'etag'), ('Last-Modified', 'last_modified')):
+                if response.headers.get(header):
+                    entry[key] = response.headers[header]
+        with self._lock:
+            self._index[url] = entry
+
+    def fetch(self, session, url, limiter=None, revalidate_after=REVALIDATE_AFTER):
+        """URL 1개 → (저장 경로 또는 None, 상태: 'cached' / 'not_modified' / 'downloaded' / 'failed')"""
+        with self._lock:
+            entry = dict(self._index.get(url) or {})
+        path = self.lookup(url)
+
+        headers = {}
+        if path:
+            if time.time() - entry.get('checked_at', 0) < revalidate_after:
+                return path, 'cached'
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            if not headers:
+                return path, 'cached'
+
+        if limiter is not None:
+            limiter.wait(url)
+        try:
+            response = session.get(url, headers=headers, timeout=TIMEOUT)
+        except requests.RequestException:
+            return path, 'failed'
+
+        if response.status_code == 304 and path:
+            entry['checked_at'] = time.time()
+            with self._lock:
+                self._index[url] = entry
+            return path, 'not_modified'
+        if response.status_code != 200 or not response.content:
+            return path, 'failed'
+
+        path = self.put(response.content, response.headers.get('Content-Type', ''))
+        self._record(url, path, response)
+        return path, 'downloaded'
+
+    def fetch_all(self, urls, workers=WORKERS, session=None):
+        """여러 URL 동시 다운로드 → {url: 저장 경로 또는 None} (중복 URL은 한 번만)"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        results = {}
+        counts = {'cached': 0, 'not_modified': 0, 'downloaded': 0, 'failed': 0}
+        if not urls:
+            return results
+
+        own_session = session is None
+        if own_session:
+            session = create_session(workers)
+        limiter = concurrent_fetch.HostRateLimiter(MIN_INTERVAL, jitter=0)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                for url, (path, status) in zip(urls, executor.map(lambda u: self.fetch(session, u, limiter), urls)):
+                    results[url] = path
+                    counts[status] += 1
+        finally:
+            if own_session:
+                session.close()
+
+        self.save_index()
+        crawl_events.emit('images', total=len(urls), **counts)
+        print(f"📷 이미지 {len(urls)}개: 새로 받음 {counts['downloaded']}, 저장소 재사용 {counts['cached'] + counts['not_modified']}, "
+              f"실패 {counts['failed']}")
+        return results
+
+    def import_file(self, file_path):
+        """로컬 이미지 파일을 저장소로 복사 → 저장 경로"""
+        with open(file_path, 'rb') as f:
+            return self.put(f.read())
+
+    def stats(self):
+        # 원본은 해시 앞 2글자 폴더에만 있음 (thumbs/ 아래 썸네일 제외)
+        files = [path for path in glob.glob(os.path.join(self.root, '??', '*')) if not path.endswith('.tmp')]
+        return {'files': len(files), 'bytes': sum(os.path.getsize(path) for path in files), 'urls': len(self._index)}
+
+# 프로세스 전역 저장소
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ImageStore()
+        return _store
+
+def download_images(urls, workers=WORKERS):
+    """URL 목록 동시 다운로드 → {url: 저장 경로 또는 None}"""
+    return get_store().fetch_all(urls, workers)
+
+def main():
+    parser = argparse.ArgumentParser(description='상품 이미지 저장소')
+    parser.add_argument('--import', dest='folders', nargs='+', metavar='FOLDER', help='예전 이미지 폴더를 저장소로 복사')
+    parser.add_argument('--stats', action='store_true', help='저장소 파일 수/용량')
+    args = parser.parse_args()
+
+    store = get_store()
+    if args.folders:
+        imported = 0
+        digests = set()
+        for folder in args.folders:
+            for file_path in sorted(glob.glob(os.path.join(folder, '*'))):
+                if os.path.isfile(file_path):
+                    digests.add(os.path.basename(store.import_file(file_path)))
+                    imported += 1
+        print(f"📥 {imported}개 파일 → 저장소 {len(digests)}개 (중복 {imported - len(digests)}개 제외)")
+    elif args.stats:
+        stats = store.stats()
+        print(f"📦 {store.root}: 파일 {stats['files']}개, {stats['bytes'] / 1024 / 1024:.1f}MB, URL {stats['urls']}개")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Yahoo 상품 수입 비용(원화 환산/배송비/대행 수수료/관세/총비용) 계산
+수집이 끝난 상품 목록 전체를 NumPy 배열로 한 번에 계산
+환율/수수료 표는 버전별로 보관 - 값이 바뀌면 새 버전을 추가하고 저장된 카탈로그는
+다시 크롤링하지 않고 재계산 (relabel_snapshots.py)
+"""
+
+import numpy as np
+
+# 비용 표 (버전 순서대로 추가, 마지막이 현재 표)
+#   exchange_rate: 원/엔, weight_kg: 글러브 평균 무게, shipping_krw_per_kg: kg당 배송비 (원)
+#   agent_fee_rate: 대행 수수료율, customs_threshold_jpy: 이 금액 초과 시 관세, customs_rate: 관세율
+COST_TABLES = [
+    {
+        'version': 1,
+        'effective_from': '2025-09-01',
+        'exchange_rate': 9.2,
+        'weight_kg': 0.6,
+        'shipping_krw_per_kg': 5000,
+        'agent_fee_rate': 0.1,
+        'customs_threshold_jpy': 21739,
+        'customs_rate': 0.23,
+    },
+]
+
+COST_FIELDS = ('price_krw', 'exchange_rate', 'shipping_fee_jpy', 'agent_fee_jpy',
+               'customs_fee_jpy', 'total_cost_jpy', 'total_cost_krw')
+
+def get_table(version=None):
+    """버전 번호 → 비용 표 (None이면 현재 표)"""
+    if version is None:
+        return COST_TABLES[-1]
+    for table in COST_TABLES:
+        if table['version'] == version:
+            return table
+    raise ValueError(f"알 수 없는 비용 표 버전: {version}")
+
+def compute(prices_jpy, table=None, exchange_rate=None):
+    """엔화 가격 배열 → 비용 열 dict (NumPy 배열, 상품별 계산과 같은 값)
+
+    exchange_rate: 표의 환율 대신 쓸 환율 (실시간 환율 등)
+    """
+    table = table or get_table()
+    rate = exchange_rate if exchange_rate is not None else table['exchange_rate']
+    price = np.asarray(prices_jpy, dtype=np.int64)
+
+    shipping_fee_jpy = int(table['weight_kg'] * table['shipping_krw_per_kg']) / rate
+    agent_fee_jpy = price * table['agent_fee_rate']
+    taxed = price > table['customs_threshold_jpy']
+    customs_fee_jpy = np.where(taxed, price * table['customs_rate'], 0.0)
+    total_cost_jpy = price + shipping_fee_jpy + agent_fee_jpy + customs_fee_jpy
+
+    return {
+        'price_krw': (price * rate).astype(np.int64),
+        'exchange_rate': rate,
+        'shipping_fee_jpy': shipping_fee_jpy,
+        'agent_fee_jpy': agent_fee_jpy,
+        'customs_fee_jpy': customs_fee_jpy,
+        'taxed': taxed,
+        'total_cost_jpy': total_cost_jpy,
+        'total_cost_krw': (total_cost_jpy * rate).astype(np.int64),
+    }
+
+def to_krw(price_jpy, exchange_rate=None):
+    """엔화 가격 1개 → 원화 (compute의 price_krw와 같은 계산)"""
+    rate = exchange_rate if exchange_rate is not None else get_table()['exchange_rate']
+    return int(price_jpy * rate)
+
+def apply(products, table=None, exchange_rate=None):
+    """상품 dict 목록에 비용 필드를 채움 (current_price 기준, 목록 전체 한 번에 계산)"""
+    if not products:
+        return products
+    costs = compute([product['current_price'] for product in products], table, exchange_rate)
+
+    price_krw = costs['price_krw'].tolist()
+    agent_fee_jpy = costs['agent_fee_jpy'].tolist()
+    # 관세 없는 상품은 정수 0 (예전 저장 형식과 동일)
+    customs_fee_jpy = [fee if taxed else 0 for fee, taxed in zip(costs['customs_fee_jpy'].tolist(), costs['taxed'].tolist())]
+    total_cost_jpy = costs['total_cost_jpy'].tolist()
+    total_cost_krw = costs['total_cost_krw'].tolist()
+
+    for i, product in enumerate(products):
+        product['price_krw'] = price_krw[i]
+        product['exchange_rate'] = costs['exchange_rate']
+        product['shipping_fee_jpy'] = costs['shipping_fee_jpy']
+        product['agent_fee_jpy'] = agent_fee_jpy[i]
+        product['customs_fee_jpy'] = customs_fee_jpy[i]
+        product['total_cost_jpy'] = total_cost_jpy[i]
+        product['total_cost_krw'] = total_cost_krw[i]
+    return products
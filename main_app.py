@@ -5,11 +5,12 @@
 사용자 관리, 권한 시스템, 크롤링 인터페이스 제공
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash, send_file, send_from_directory
+from flask import Flask, Response, render_template, request, redirect, url_for, session, jsonify, flash, send_file, send_from_directory
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta, timezone
 import pandas as pd
+import numpy as np
 from io import BytesIO
 import xlsxwriter
 
@@ -20,11 +21,24 @@ def get_kst_now():
     return datetime.now(KST)
 import os
 import json
+import time
+import gzip
+import base64
+import hashlib
 import secrets
 import threading
-import subprocess
 from functools import wraps
 
+import snapshot_loader
+import aggregates
+import exchange_rates
+import landed_cost
+import classifier
+import thumbnails
+import crawl_events
+import product_search
+import facet_index
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = secrets.token_hex(16)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
@@ -47,6 +61,15 @@ class User(db.Model):
     crawl_count = db.Column(db.Integer, default=0)
 
 class CrawlHistory(db.Model):
+    """크롤링 기록 겸 작업 큐 항목 (crawl_worker.py가 처리)
+
+    market: 'yahoo' / 'yayongsa' / 'dashboard'(대시보드 업데이트)
+    status: pending → running → completed / failed / cancelled (실패 시 재시도 대기는 다시 pending)
+    """
+    __table_args__ = (
+        db.Index('ix_crawl_history_queue', 'status', 'run_after'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     market = db.Column(db.String(50), nullable=False)
@@ -55,10 +78,77 @@ class CrawlHistory(db.Model):
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
     completed_at = db.Column(db.DateTime)
     error_message = db.Column(db.Text)
+    params = db.Column(db.Text, default='{}')
+    dedup_key = db.Column(db.String(200), index=True)
+    attempts = db.Column(db.Integer, default=0)
+    max_attempts = db.Column(db.Integer, default=1)
+    run_after = db.Column(db.DateTime)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    worker = db.Column(db.String(100))
+    cancel_requested = db.Column(db.Boolean, default=False)
+
+class CrawlSnapshot(db.Model):
+    """크롤러가 저장한 JSON 스냅샷 1개 (한 번만 적재됨)"""
+    id = db.Column(db.Integer, primary_key=True)
+    market = db.Column(db.String(20), nullable=False, index=True)
+    filename = db.Column(db.String(200), unique=True, nullable=False)
+    crawled_at = db.Column(db.String(40))
+    item_count = db.Column(db.Integer, default=0)
+    ingested_at = db.Column(db.DateTime, default=lambda: datetime.now(KST))
+    # 제품 행의 원화 금액을 마지막으로 다시 저장한 환율 (None: 크롤링 당시 값 그대로)
+    exchange_rate = db.Column(db.Float)
+
+class Product(db.Model):
+    """스냅샷에서 적재된 제품 (가격은 마켓 통화 기준 정수)"""
+    __table_args__ = (
+        db.Index('ix_product_snapshot_market', 'snapshot_id', 'market'),
+        db.Index('ix_product_image', 'image'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    snapshot_id = db.Column(db.Integer, db.ForeignKey('crawl_snapshot.id'), nullable=False, index=True)
+    market = db.Column(db.String(20), nullable=False, index=True)
+    title = db.Column(db.Text, default='')
+    price = db.Column(db.Integer, default=0, index=True)
+    price_krw = db.Column(db.Integer, default=0)
+    total_cost_jpy = db.Column(db.Float, default=0)
+    total_cost_krw = db.Column(db.Integer, default=0)
+    brand = db.Column(db.String(50), index=True)
+    position = db.Column(db.String(20), index=True)
+    condition = db.Column(db.String(10), index=True)
+    is_active = db.Column(db.Boolean, default=True)
+    url = db.Column(db.Text)
+    image = db.Column(db.Text)
+    bids = db.Column(db.String(20))
+    time_left = db.Column(db.String(50))
+    location = db.Column(db.String(50))
+    board = db.Column(db.String(50))
+    author = db.Column(db.String(100))
+    date = db.Column(db.String(30))
+    views = db.Column(db.String(20))
+
+def add_missing_columns(model):
+    """기존 SQLite 테이블에 모델에 새로 추가된 열 추가 (create_all은 기존 테이블을 바꾸지 않음)"""
+    table = model.__table__
+    existing = {row[1] for row in db.session.execute(db.text(f'PRAGMA table_info({table.name})'))}
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        column_type = column.type.compile(dialect=db.engine.dialect)
+        db.session.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+        print(f"🔧 {table.name}.{column.name} 열 추가")
+    db.session.commit()
+    for index in table.indexes:
+        index.create(db.engine, checkfirst=True)
 
 # 데이터베이스 초기화
 with app.app_context():
     db.create_all()
+    add_missing_columns(CrawlHistory)
+    add_missing_columns(CrawlSnapshot)
+    add_missing_columns(Product)
+    product_search.ensure_index(db.session)
     # 기본 관리자 계정 생성 (더 강력한 비밀번호)
     admin = User.query.filter_by(username='admin').first()
     if not admin:
@@ -184,273 +274,152 @@ def logout():
 @app.route('/dashboard/products')
 @login_required
 def dashboard_products():
-    """크롤링 제품 대시보드"""
+    """크롤링 제품 대시보드 (제품 목록은 /api/products에서 페이지 단위로 로드)"""
     user = User.query.get(session['user_id'])
-    products = []
 
     # 소스 필터링 파라미터 가져오기
     source_filter = request.args.get('source', 'all').lower()
+    if source_filter not in ['all', 'yahoo', 'yayongsa']:
+        source_filter = 'all'
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(base_dir, 'data')
-
-    yahoo_count = 0
-    yayongsa_count = 0
-    yahoo_avg = 0
-    yayongsa_avg = 0
-
-    # 모든 JSON 파일 처리
-    if os.path.exists(data_dir):
-        # 가장 최신 Yahoo 파일 찾기 (yahoo_auction 파일만 선택, yahoo_test 제외)
-        yahoo_files = sorted([f for f in os.listdir(data_dir) if 'yahoo_auction' in f.lower() and f.endswith('.json')], reverse=True)
-        yayongsa_files = sorted([f for f in os.listdir(data_dir) if 'yayongsa' in f.lower() and f.endswith('.json')], reverse=True)
-
-        # Yahoo 파일들 처리 (source 필터에 따라)
-        if source_filter in ['all', 'yahoo']:
-            # 정확히 최신 파일 사용 (20250928_191547 파일)
-            if yahoo_files:
-                filename = yahoo_files[0]  # 가장 최신 파일
-                filepath = os.path.join(data_dir, filename)
-                print(f"Loading Yahoo file: {filename}")  # 디버깅용
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
-                    if isinstance(data, dict) and 'products' in data:
-                        items = data['products']
-                    else:
-                        items = data if isinstance(data, list) else []
-
-                    yahoo_total = 0
-                    for item in items:
-                        # 판매 완료 상품 및 취소된 경매 제외
-                        time_left = item.get('time_left', '')
-                        if any(term in time_left for term in ['終了', '落札', '取消', 'キャンセル', '売却済']):
-                            continue
-                        # 가격이 0인 경우도 제외
-                        if item.get('current_price', 0) == 0:
-                            continue
-
-                        product = {
-                            'title': item.get('title', ''),
-                            'price': f"¥{item.get('current_price', 0):,}",
-                            'price_krw': f"₩{item.get('price_krw', 0):,}" if item.get('price_krw') else '',
-                            'url': item.get('url', '#'),
-                            'image': item.get('image', item.get('image_url', '')),  # image 먼저, 없으면 image_url
-                            'market': 'Yahoo',
-                            'brand': item.get('brand', '기타'),
-                            'position': item.get('position', '올라운드'),
-                            'condition': item.get('condition', '중고'),
-                            'bids': item.get('bids', '0'),
-                            'time_left': item.get('time_left', '')
-                        }
-                        products.append(product)
-                        yahoo_total += item.get('current_price', 0)
-
-                    yahoo_count = len([p for p in products if p['market'] == 'Yahoo'])
-                    if yahoo_count > 0:
-                        yahoo_avg = yahoo_total // yahoo_count
-
-                    print(f"Loaded {yahoo_count} Yahoo products from {filename}")
-
-                except Exception as e:
-                    print(f"Error loading Yahoo file {filename}: {e}")
-
-        # Yayongsa 파일 처리 (source 필터에 따라)
-        if source_filter in ['all', 'yayongsa']:
-            for filename in yayongsa_files[:1]:  # 최신 1개만
-                filepath = os.path.join(data_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
-                    if isinstance(data, dict) and 'products' in data:
-                        items = data['products']
-                    else:
-                        items = data if isinstance(data, list) else []
-
-                    yayongsa_total = 0
-                    for item in items:
-                        if item.get('price', 0) == 0:
-                            continue
-
-                        # 이미지 URL 처리 - 두 번째 이미지 사용 (첫 번째는 썸네일)
-                        images = item.get('images', [])
-                        image_url = images[1] if len(images) > 1 else (images[0] if images else '')
-
-                        product = {
-                            'title': item.get('title', ''),
-                            'price': f"₩{item.get('price', 0):,}",
-                            'url': item.get('url', '#'),
-                            'image': image_url,  # 야용사 이미지 추가
-                            'market': 'Yayongsa',
-                            'location': item.get('location', ''),
-                            'brand': item.get('brand', '기타'),
-                            'position': item.get('position', '올라운드'),
-                            'condition': item.get('condition', '중고'),
-                            'author': item.get('author', ''),
-                            'date': item.get('date', ''),
-                            'views': item.get('views', '0')
-                        }
-                        products.append(product)
-                        yayongsa_total += item.get('price', 0)
-
-                    # 야용사 카운트를 바로 계산
-                    yayongsa_products_in_list = [p for p in products if p['market'] == 'Yayongsa']
-                    yayongsa_count = len(yayongsa_products_in_list)
-                    if yayongsa_count > 0:
-                        yayongsa_avg = yayongsa_total // yayongsa_count
-
-                    print(f"Loaded {yayongsa_count} Yayongsa products from {filename}")
-
-                except Exception as e:
-                    print(f"Error loading Yayongsa file {filename}: {e}")
-
-    # 최종 카운트 다시 계산 (모든 파일 로드 후)
-    yahoo_count = len([p for p in products if p['market'] == 'Yahoo'])
-    yayongsa_count = len([p for p in products if p['market'] == 'Yayongsa'])
-    total_count = len(products)
-
-    # 평균가격 재계산
-    if yahoo_count > 0:
-        yahoo_products = [p for p in products if p['market'] == 'Yahoo']
-        yahoo_prices = []
-        for p in yahoo_products:
-            try:
-                # 가격 문자열에서 숫자만 추출
-                price_str = p['price'].replace('¥', '').replace(',', '')
-                yahoo_prices.append(int(price_str))
-            except:
-                pass
-        if yahoo_prices:
-            yahoo_avg = sum(yahoo_prices) // len(yahoo_prices)
-
-    if yayongsa_count > 0:
-        yayongsa_products = [p for p in products if p['market'] == 'Yayongsa']
-        yayongsa_prices = []
-        for p in yayongsa_products:
-            try:
-                # 가격 문자열에서 숫자만 추출
-                price_str = p['price'].replace('₩', '').replace(',', '')
-                yayongsa_prices.append(int(price_str))
-            except:
-                pass
-        if yayongsa_prices:
-            yayongsa_avg = sum(yayongsa_prices) // len(yayongsa_prices)
+    counts = {'yahoo': 0, 'yayongsa': 0}
+    averages = {'yahoo': 0, 'yayongsa': 0}
 
-    print(f"Total products to display: {total_count}")
-    print(f"Yahoo: {yahoo_count}, Yayongsa: {yayongsa_count}")
+    # 판매 완료/취소/가격 0 제외한 최신 스냅샷 기준
+    for market in counts:
+        if source_filter not in ['all', market]:
+            continue
+        snapshot = snapshot_loader.latest_snapshot(market)
+        if not snapshot:
+            continue
+        counts[market] = snapshot.summary['active_count']
+        if counts[market] > 0:
+            averages[market] = snapshot.summary['active_price_sum'] // counts[market]
 
     return render_template('product_dashboard.html',
-                         yahoo_count=yahoo_count,
-                         yayongsa_count=yayongsa_count,
-                         yahoo_avg=yahoo_avg,
-                         yayongsa_avg=yayongsa_avg,
-                         products=products,
-                         total_count=total_count)
+                         yahoo_count=counts['yahoo'],
+                         yayongsa_count=counts['yayongsa'],
+                         yahoo_avg=averages['yahoo'],
+                         yayongsa_avg=averages['yayongsa'],
+                         source=source_filter,
+                         total_count=counts['yahoo'] + counts['yayongsa'])
 
 @app.route('/dashboard/statistics')
 def dashboard_statistics():
-    """통계 대시보드 페이지 - 로그인 없이 접근 가능"""
-    products = []
-    yahoo_count = 0
-    yayongsa_count = 0
-    yahoo_avg = 0
-    yayongsa_avg = 0
-
-    # 데이터 디렉토리에서 JSON 파일 읽기
-    data_dir = 'data'
-    if os.path.exists(data_dir):
-        # Yahoo 데이터 로드 - 최신 파일만
-        yahoo_files = sorted([f for f in os.listdir(data_dir) if 'yahoo_auction' in f.lower() and f.endswith('.json')], reverse=True)
-        if yahoo_files:
-            file = yahoo_files[0]  # 최신 파일만 사용
-            try:
-                with open(os.path.join(data_dir, file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    items = data.get('products', [])  # products 필드 사용
-                    for item in items:
-                        # 판매 완료 상품 제외
-                        time_left = item.get('time_left', '')
-                        if any(term in time_left for term in ['終了', '落札', '取消', 'キャンセル', '売却済']):
-                            continue
-                        if item.get('current_price', 0) == 0:
-                            continue
-
-                        # 통일된 형식으로 변환
-                        product = {
-                            'title': item.get('title', ''),
-                            'url': item.get('url', ''),
-                            'image': item.get('image', item.get('image_url', '/static/images/no-image.png')),
-                            'current_price': item.get('current_price', 0),
-                            'price': item.get('current_price', 0),
-                            'brand': item.get('brand', '기타'),
-                            'position': item.get('position', '올라운드'),
-                            'condition': item.get('condition', '중고'),
-                            'type': 'hardball',
-                            'market': 'Yahoo'
-                        }
-                        products.append(product)
-                        yahoo_count += 1
-            except Exception as e:
-                print(f"Error loading Yahoo file {file}: {e}")
+    """통계 대시보드 페이지 - 로그인 없이 접근 가능 (최신 스냅샷별로 렌더링해 둔 응답 사용)"""
+    page = _statistics_page
+    if page is None:
+        page = refresh_statistics_page()
+    elif time.monotonic() - page['checked_at'] > STATISTICS_PAGE_CHECK_INTERVAL:
+        # 오래된 페이지는 그대로 보내고 새 스냅샷 확인/재생성은 백그라운드에서
+        refresh_statistics_page_async()
+
+    use_gzip = 'gzip' in request.accept_encodings
+    response = Response(page['gzip'] if use_gzip else page['body'], mimetype='text/html')
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, no-cache'
+    response.set_etag(page['etag'])
+    response.last_modified = page['last_modified']
+    return response.make_conditional(request)
+
+@app.route('/api/statistics/charts')
+def statistics_charts_api():
+    """공개 통계 페이지 차트 시리즈 - 최신 스냅샷당 한 번 계산 (브랜드/포지션/가격대/마켓)"""
+    snapshots = [s for s in (snapshot_loader.latest_snapshot(m) for m in ('yahoo', 'yayongsa')) if s]
+    key = json.dumps([list(s.identity) for s in snapshots])
+    etag = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    if request.if_none_match.contains(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+
+    response = jsonify(aggregates.statistics_charts(snapshots))
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response
+
+# 공개 통계 페이지 응답 캐시 - 최신 스냅샷 id별로 한 번만 렌더링 (gzip 포함)
+# 크롤링 워커는 다른 프로세스이므로 주기적으로 새 스냅샷을 확인하고,
+# 워커가 작업을 끝내며 남긴 표시 파일(snapshot_loader.mark_written)은 감시 스레드 하나가 보고 한 번만 재생성
+STATISTICS_PAGE_CHECK_INTERVAL = 30  # 새 스냅샷 확인 주기 (초)
+STATISTICS_PAGE_WATCH_INTERVAL = 2  # 워커 완료 표시 확인 주기 (초)
+
+_statistics_page = None
+_statistics_page_lock = threading.Lock()
+_statistics_watcher = None
+
+def render_statistics_page(snapshot_ids):
+    """통계 페이지 렌더링 → 캐시 항목 (본문, gzip 본문, ETag, Last-Modified)"""
+    snapshots = [s for s in (snapshot_loader.latest_snapshot(m) for m in ('yahoo', 'yayongsa')) if s]
+    with app.test_request_context('/dashboard/statistics'):
+        body = render_template('statistics_dashboard.html',
+                               charts=aggregates.statistics_charts(snapshots)).encode('utf-8')
+
+    mtimes = [s.mtime_ns / 1e9 for s in snapshots]
+    return {
+        'snapshot_ids': snapshot_ids,
+        'body': body,
+        'gzip': gzip.compress(body, compresslevel=9),
+        # 렌더링 결과 기준 - 스냅샷뿐 아니라 템플릿/앱 코드가 바뀌어 배포되어도 이전 캐시를 재사용하지 않음
+        'etag': hashlib.sha1(body).hexdigest(),
+        'last_modified': datetime.fromtimestamp(max(mtimes) if mtimes else time.time(), timezone.utc),
+        'checked_at': time.monotonic(),
+    }
 
-        # 야용사 데이터 로드 - 최신 파일만
-        yayongsa_files = sorted([f for f in os.listdir(data_dir) if 'yayongsa' in f.lower() and f.endswith('.json')], reverse=True)
-        if yayongsa_files:
-            file = yayongsa_files[0]  # 최신 파일만 사용
+def refresh_statistics_page(force=False):
+    """최신 스냅샷이 바뀌었으면 통계 페이지 다시 렌더링 → 현재 캐시 항목"""
+    global _statistics_page
+    with _statistics_page_lock:
+        with app.app_context():
+            if force:
+                snapshot_loader.invalidate()
+            sync_product_store(force=force)
+            snapshot_ids = latest_snapshot_ids()
+            page = _statistics_page
+            if page is not None and page['snapshot_ids'] == snapshot_ids:
+                page['checked_at'] = time.monotonic()
+                return page
+            _statistics_page = render_statistics_page(snapshot_ids)
+            print(f"📄 통계 페이지 캐시 갱신: {snapshot_ids} ({len(_statistics_page['gzip']):,} bytes gzip)")
+            start_statistics_watcher()
+            return _statistics_page
+
+def start_statistics_watcher():
+    """워커의 새 스냅샷 표시를 확인하는 스레드 (통계 페이지를 만든 프로세스에서 한 번만 시작)"""
+    global _statistics_watcher
+    if _statistics_watcher is not None:
+        return
+
+    def watch():
+        seen = snapshot_loader.written_at()
+        while True:
+            time.sleep(STATISTICS_PAGE_WATCH_INTERVAL)
+            written = snapshot_loader.written_at()
+            if written == seen:
+                continue
+            seen = written
             try:
-                with open(os.path.join(data_dir, file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    items = data.get('products', [])
-                    for item in items:
-                        # 가격 처리
-                        price_value = item.get('price', 0)
-                        if isinstance(price_value, str):
-                            price_value = int(''.join(filter(str.isdigit, price_value)) or 0)
-
-                        if price_value == 0:
-                            continue
-
-                        # 이미지 처리
-                        images = item.get('images', [])
-                        # 야용사는 두 번째 이미지를 썸네일로 사용
-                        image_url = images[1] if len(images) > 1 else (images[0] if images else '/static/images/no-image.png')
-
-                        product = {
-                            'title': item.get('title', ''),
-                            'url': item.get('url', ''),
-                            'image': image_url,
-                            'current_price': price_value,
-                            'price': price_value,
-                            'brand': item.get('brand', '기타'),
-                            'position': item.get('position', '올라운드'),
-                            'condition': item.get('condition', '중고'),
-                            'type': 'hardball',
-                            'market': 'Yayongsa'
-                        }
-                        products.append(product)
-                        yayongsa_count += 1
+                refresh_statistics_page(force=True)
             except Exception as e:
-                print(f"Error loading Yayongsa file {file}: {e}")
+                print(f"Error refreshing statistics page: {e}")
 
-    # 평균 가격 계산
-    yahoo_prices = [p['current_price'] for p in products if p['market'] == 'Yahoo' and p['current_price'] > 0]
-    if yahoo_prices:
-        yahoo_avg = sum(yahoo_prices) / len(yahoo_prices)
+    _statistics_watcher = threading.Thread(target=watch, name='statistics-watcher', daemon=True)
+    _statistics_watcher.start()
 
-    yayongsa_prices = [p['current_price'] for p in products if p['market'] == 'Yayongsa' and p['current_price'] > 0]
-    if yayongsa_prices:
-        yayongsa_avg = sum(yayongsa_prices) / len(yayongsa_prices)
+def refresh_statistics_page_async(force=False):
+    """백그라운드 재생성 (페이지를 한 번도 만들지 않은 프로세스에서는 무시, 주기 확인은 진행 중이면 생략)"""
+    if _statistics_page is None or (_statistics_page_lock.locked() and not force):
+        return
 
-    print(f"Statistics Dashboard - Total products: {len(products)}, Yahoo: {yahoo_count}, Yayongsa: {yayongsa_count}")
+    def run():
+        try:
+            refresh_statistics_page(force)
+        except Exception as e:
+            print(f"Error refreshing statistics page: {e}")
 
-    return render_template('statistics_dashboard.html',
-                           products=products,
-                           yahoo_count=yahoo_count,
-                           yayongsa_count=yayongsa_count,
-                           yahoo_avg=int(yahoo_avg),
-                           yayongsa_avg=int(yayongsa_avg))
+    # 확인 중에 다른 요청이 또 스레드를 띄우지 않도록 먼저 확인 시각 갱신
+    _statistics_page['checked_at'] = time.monotonic()
+    threading.Thread(target=run, daemon=True).start()
 
 @app.route('/dashboard/stats')
 @app.route('/dashboard/analysis')
@@ -460,55 +429,20 @@ def dashboard_analysis():
     user = User.query.get(session['user_id'])
     stats = get_user_stats(user.username)
 
-    # 데이터 파일들 로드하여 상세 통계 계산
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(base_dir, 'data')
-
     brand_stats = {}
     position_stats = {}
     condition_stats = {'new': 0, 'used': 0}
     price_ranges = {'0-20k': 0, '20-40k': 0, '40-60k': 0, '60k+': 0}
 
-    if os.path.exists(data_dir):
-        # 최신 Yahoo 파일 처리
-        for file in os.listdir(data_dir):
-            if file.endswith('.json') and 'yahoo' in file.lower():
-                filepath = os.path.join(data_dir, file)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if isinstance(data, dict) and 'products' in data:
-                            for product in data['products']:
-                                # 브랜드 통계
-                                brand = product.get('brand', '기타')
-                                if brand not in brand_stats:
-                                    brand_stats[brand] = {'count': 0, 'total_price': 0}
-                                brand_stats[brand]['count'] += 1
-                                brand_stats[brand]['total_price'] += product.get('current_price', 0)
-
-                                # 포지션 통계
-                                position = product.get('position', '올라운드')
-                                position_stats[position] = position_stats.get(position, 0) + 1
-
-                                # 상태 통계
-                                if product.get('condition') == '신품':
-                                    condition_stats['new'] += 1
-                                else:
-                                    condition_stats['used'] += 1
-
-                                # 가격대 통계
-                                price = product.get('current_price', 0)
-                                if price < 20000:
-                                    price_ranges['0-20k'] += 1
-                                elif price < 40000:
-                                    price_ranges['20-40k'] += 1
-                                elif price < 60000:
-                                    price_ranges['40-60k'] += 1
-                                else:
-                                    price_ranges['60k+'] += 1
-                        break  # 최신 파일만 처리
-                except Exception as e:
-                    print(f"Error processing stats: {e}")
+    # 최신 Yahoo 스냅샷의 적재 시 계산된 집계 사용 (버킷 수만큼만 처리)
+    snapshot = snapshot_loader.latest_snapshot('yahoo')
+    if snapshot:
+        rollup = aggregates.snapshot_rollup(snapshot)
+        brand_stats = rollup['brands']
+        position_stats = rollup['positions']
+        condition_stats['new'] = rollup['conditions'].get('신품', 0)
+        condition_stats['used'] = rollup['count'] - condition_stats['new']
+        price_ranges = rollup['price_ranges']
 
     return render_template('stats_dashboard.html',
                          stats=stats,
@@ -587,23 +521,19 @@ def crawl(market, days=3):
         flash('야용사 크롤링을 위해 카카오 계정 정보를 먼저 입력해주세요.', 'warning')
         return redirect(url_for('settings'))
 
-    # 크롤링 기록 생성
-    history = CrawlHistory(
-        user_id=user.id,
-        market=market,
-        status='running',
-        created_at=datetime.now(KST)
-    )
-    db.session.add(history)
+    if market not in ('yahoo', 'yayongsa'):
+        flash('알 수 없는 마켓입니다.', 'danger')
+        return redirect(url_for('dashboard'))
+
+    # 작업 큐에 등록 (같은 작업이 이미 대기 중이면 새로 만들지 않음)
+    job, created = enqueue_job(user.id, market, {'username': user.username, 'days': days})
     user.last_crawl = datetime.now(KST)
     db.session.commit()
 
-    # 백그라운드로 크롤링 실행
-    threading.Thread(target=run_crawling,
-                    args=(app, user.username, market, history.id, days,
-                          user.kakao_id, user.kakao_password)).start()
-
-    flash(f'{market} {days}일치 크롤링이 시작되었습니다. 약 2-3분 후 결과를 확인해주세요.', 'info')
+    if created:
+        flash(f'{market} {days}일치 크롤링이 예약되었습니다. 약 2-3분 후 결과를 확인해주세요.', 'info')
+    else:
+        flash(f'{market} {days}일치 크롤링이 이미 대기 중입니다.', 'info')
     return redirect(url_for('dashboard'))
 
 @app.route('/users/<username>/dashboards/<filename>')
@@ -737,6 +667,12 @@ def admin_stats():
     yahoo_crawls = CrawlHistory.query.filter_by(market='yahoo').count()
     yayongsa_crawls = CrawlHistory.query.filter_by(market='yayongsa').count()
 
+    # 제품 통계 (최신 스냅샷 집계)
+    product_counts = {}
+    for market in snapshot_loader.MARKETS:
+        snapshot = snapshot_loader.latest_snapshot(market)
+        product_counts[market] = aggregates.snapshot_rollup(snapshot)['count'] if snapshot else 0
+
     stats = {
         'total_users': total_users,
         'approved_users': approved_users,
@@ -745,40 +681,30 @@ def admin_stats():
         'today_crawls': today_crawls,
         'total_crawls': total_crawls,
         'yahoo_crawls': yahoo_crawls,
-        'yayongsa_crawls': yayongsa_crawls
+        'yayongsa_crawls': yayongsa_crawls,
+        'total_products': product_counts['yahoo'] + product_counts['yayongsa'],
+        'yahoo_products': product_counts['yahoo'],
+        'yayongsa_products': product_counts['yayongsa']
     }
 
     return render_template('admin_stats.html', stats=stats)
 
+def enqueue_response(job, created, message):
+    """작업 등록 API 응답 (기존 화면은 status/message만 사용)"""
+    if not created:
+        message = '같은 작업이 이미 대기 중입니다.'
+    return jsonify({'status': 'success', 'message': message, 'job_id': job.id, 'created': created})
+
 @app.route('/api/crawl/yahoo', methods=['POST'])
 @login_required
 def api_crawl_yahoo():
-    """Yahoo 크롤링 API"""
+    """Yahoo 크롤링 API - 작업 큐에 증분 크롤링 등록"""
     try:
-        # 크롤링을 백그라운드에서 실행
-        import subprocess
-        import threading
-
-        def run_crawler():
-            try:
-                # Chrome 창이 열리는 크롤러 실행
-                result = subprocess.run(['python', 'run_yahoo_crawler.py'],
-                                       capture_output=True, text=True, encoding='utf-8')
-                if result.returncode != 0:
-                    print(f"크롤러 오류: {result.stderr}")
-                else:
-                    print(f"크롤러 성공: {result.stdout[-500:]}")  # 마지막 500자만 출력
-            except Exception as e:
-                print(f"크롤러 실행 오류: {str(e)}")
-
-        # 별도 스레드에서 크롤러 실행
-        crawler_thread = threading.Thread(target=run_crawler)
-        crawler_thread.start()
-
-        return jsonify({
-            'status': 'success',
-            'message': 'Yahoo Auction 크롤링이 시작되었습니다.\nChrome 창이 자동으로 열립니다.\n완료까지 약 1-2분 소요됩니다.'
-        })
+        # 워커가 증분 크롤링 (새/변경된 경매만 받아 이전 스냅샷에 합침)
+        # Chrome이 필요하면 워커의 드라이버 풀에서 headless Chrome 사용
+        job, created = enqueue_job(session['user_id'], 'yahoo')
+        return enqueue_response(job, created,
+            'Yahoo Auction 크롤링이 예약되었습니다.\n목록 페이지를 직접 가져오며, 실패 시에만 백그라운드 Chrome을 사용합니다.\n완료까지 약 1-2분 소요됩니다.')
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -787,40 +713,20 @@ def api_crawl_yahoo():
 def api_crawl_yayongsa():
     """야용사 크롤링 API - 수동 로그인 안내"""
     try:
-        import subprocess
-        import threading
-
-        def run_yayongsa_crawler():
-            try:
-                # Chrome 창이 열리면서 수동 로그인 대기
-                result = subprocess.run(['python', 'yayongsa_crawler.py'],
-                                       capture_output=True, text=True, encoding='utf-8')
-                if result.returncode != 0:
-                    print(f"야용사 크롤러 오류: {result.stderr}")
-                else:
-                    print(f"야용사 크롤러 성공: {result.stdout[-500:]}")
-            except Exception as e:
-                print(f"야용사 크롤러 실행 오류: {str(e)}")
-
-        # 별도 스레드에서 크롤러 실행
-        crawler_thread = threading.Thread(target=run_yayongsa_crawler)
-        crawler_thread.start()
-
-        return jsonify({
-            'status': 'success',
-            'message': '야용사 크롤링이 시작되었습니다.\nChrome 창이 열리면 수동으로 로그인해주세요.\n로그인 후 자동으로 크롤링이 진행됩니다.'
-        })
+        # 워커가 Chrome 창을 열고 수동 로그인 대기
+        job, created = enqueue_job(session['user_id'], 'yayongsa')
+        return enqueue_response(job, created,
+            '야용사 크롤링이 예약되었습니다.\nChrome 창이 열리면 수동으로 로그인해주세요.\n로그인 후 자동으로 크롤링이 진행됩니다.')
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 @app.route('/api/dashboard/update', methods=['POST'])
 @login_required
 def api_dashboard_update():
-    """대시보드 업데이트 API"""
+    """대시보드 업데이트 API - 작업 큐에 등록"""
     try:
-        import subprocess
-        subprocess.run(['python', 'update_dashboard.py'])
-        return jsonify({'status': 'success', 'message': '대시보드가 업데이트되었습니다.'})
+        job, created = enqueue_job(session['user_id'], 'dashboard')
+        return enqueue_response(job, created, '대시보드 업데이트가 예약되었습니다.')
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -834,11 +740,307 @@ def crawl_status(history_id):
     if history.user_id != session['user_id'] and not session.get('is_admin'):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    return jsonify({
-        'status': history.status,
-        'item_count': history.item_count,
-        'error': history.error_message
+    return jsonify(job_dict(history))
+
+@app.route('/api/crawl_jobs/<int:job_id>/cancel', methods=['POST'])
+@login_required
+def api_cancel_job(job_id):
+    """크롤링 작업 취소 API (대기 중이면 바로, 실행 중이면 워커가 다음 확인 시점에 중단)"""
+    job = CrawlHistory.query.get_or_404(job_id)
+    if job.user_id != session['user_id'] and not session.get('is_admin'):
+        return jsonify({'error': 'Unauthorized'}), 403
+    if job.status not in ('pending', 'running'):
+        return jsonify({'error': f'이미 끝난 작업입니다 ({job.status})'}), 409
+
+    cancel_job(job)
+    return jsonify(job_dict(job))
+
+# 진행 이벤트 SSE: 이벤트 파일 확인 주기, keep-alive 간격, 연결 유지 시간 (초)
+# 스트림마다 gunicorn 스레드 하나를 잡으므로 짧게 끊고 브라우저가 Last-Event-ID로 재연결 (retry 간격 동안 스레드 반환)
+EVENTS_POLL_INTERVAL = 0.5
+EVENTS_KEEPALIVE = 15
+EVENTS_MAX_STREAM = 25
+
+def sse_message(event, data, event_id=None):
+    message = f"id: {event_id}\n" if event_id is not None else ''
+    return message + f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.route('/api/crawl/<int:job_id>/events')
+@login_required
+def crawl_job_events(job_id):
+    """크롤링 진행 이벤트 스트림 (Server-Sent Events) - 작업이 끝나면 종료"""
+    job = CrawlHistory.query.get_or_404(job_id)
+    if job.user_id != session['user_id'] and not session.get('is_admin'):
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_id') or 0)
+    except ValueError:
+        last_id = 0
+    path = crawl_events.events_path(job_id)
+    finished = job.status in crawl_events.TERMINAL_STATES
+    final_status = dict(job_dict(job), state=job.status)
+
+    def generate():
+        yield 'retry: 3000\n\n'
+        # 이벤트 id는 파일 안 위치 - 재연결하면 마지막으로 받은 위치부터
+        offset = last_id
+        started = last_sent = time.monotonic()
+        while True:
+            events, offset = crawl_events.read_events(path, offset)
+            for event_id, record in events:
+                yield sse_message(record['event'], record['data'], event_id)
+                last_sent = time.monotonic()
+                if record['event'] == 'status' and record['data'].get('state') in crawl_events.TERMINAL_STATES:
+                    return
+            if finished and not events:
+                # 이미 끝난 작업 (이벤트 기록 이전 작업 포함) - 최종 상태만 보내고 종료
+                yield sse_message('status', final_status)
+                return
+
+            now = time.monotonic()
+            if now - started > EVENTS_MAX_STREAM:
+                return
+            if now - last_sent > EVENTS_KEEPALIVE:
+                yield ': keep-alive\n\n'
+                last_sent = now
+            time.sleep(EVENTS_POLL_INTERVAL)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# 썸네일 브라우저 캐시 시간 (초) - 원본 URL 기준이라 immutable 대신 ETag로 재검증
+THUMBNAIL_MAX_AGE = 30 * 24 * 3600
+
+@app.route('/images/thumb')
+@login_required
+def image_thumbnail():
+    """상품 이미지 썸네일 (src: 원본 URL, w: 폭) - 저장소에 없으면 받아서 생성
+
+    저장소에 있거나 적재된 제품의 이미지 URL만 처리 (요청된 임의 URL은 받지 않음)
+    """
+    src = request.args.get('src', '')
+    width = request.args.get('w', thumbnails.DEFAULT_WIDTH, type=int)
+    if not src or width not in thumbnails.WIDTHS:
+        return '', 400
+    if not thumbnails.allowed_url(src):
+        return '', 403
+    if not thumbnails.stored(src) and not db.session.query(Product.query.filter_by(image=src).exists()).scalar():
+        return '', 404
+
+    fmt = 'webp' if thumbnails.WEBP_SUPPORTED and request.accept_mimetypes['image/webp'] else 'jpg'
+    try:
+        path, digest = thumbnails.thumbnail_for_url(src, width, fmt)
+    except Exception as e:
+        print(f"⚠️ 썸네일 생성 실패 {src}: {e}")
+        path = None
+    if path is None:
+        return redirect(src)
+
+    response = send_file(path, mimetype=thumbnails.FORMATS[fmt][1], conditional=True,
+                         etag=f'{digest}-{width}.{fmt}', max_age=THUMBNAIL_MAX_AGE)
+    response.vary.add('Accept')
+    return response
+
+def thumbnail_url(image):
+    """원본 이미지 URL → 썸네일 라우트 URL (외부 URL이 아니면 그대로)"""
+    if not image or not image.startswith(('http://', 'https://')):
+        return image
+    return url_for('image_thumbnail', src=image, w=thumbnails.DEFAULT_WIDTH)
+
+@app.route('/api/products')
+@login_required
+def api_products():
+    """제품 목록 API - 서버측 필터/정렬/커서 페이지네이션"""
+    snapshot_ids = latest_snapshot_ids()
+    rate = exchange_rates.cached_rate()
+    etag = products_etag('products', snapshot_ids, rate)
+    if request.if_none_match.contains(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+    reprice_product_store(snapshot_ids, rate)
+
+    try:
+        limit = min(max(int(request.args.get('limit', 24)), 1), PRODUCTS_MAX_LIMIT)
+    except ValueError:
+        limit = 24
+    sort = request.args.get('sort', 'default')
+    if sort not in PRODUCT_SORTS:
+        return jsonify({'error': f'unknown sort: {sort}'}), 400
+
+    try:
+        query = product_query(request.args, snapshot_ids)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    total = query.count()
+
+    sort_column, descending = PRODUCT_SORTS[sort]
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            last_value, last_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'invalid cursor'}), 400
+        if sort_column is None:
+            query = query.filter(Product.id > last_id)
+        elif descending:
+            query = query.filter(db.or_(sort_column < last_value,
+                                        db.and_(sort_column == last_value, Product.id < last_id)))
+        else:
+            query = query.filter(db.or_(sort_column > last_value,
+                                        db.and_(sort_column == last_value, Product.id > last_id)))
+
+    if sort_column is None:
+        query = query.order_by(Product.id)
+    elif descending:
+        query = query.order_by(sort_column.desc(), Product.id.desc())
+    else:
+        query = query.order_by(sort_column, Product.id)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(None if sort_column is None else getattr(last, sort_column.key), last.id)
+
+    response = jsonify({
+        'items': product_api_items(rows, rate),
+        'total': total,
+        'next_cursor': next_cursor
+    })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@app.route('/api/products/search')
+@login_required
+def api_products_search():
+    """제품 전문 검색 API - 제목/브랜드/게시판에서 BM25 관련도 순 (다른 필터는 /api/products와 동일)"""
+    search = request.args.get('q', '').strip()
+    if not search:
+        return jsonify({'error': 'q is required'}), 400
+
+    snapshot_ids = latest_snapshot_ids()
+    rate = exchange_rates.cached_rate()
+    etag = products_etag('search', snapshot_ids, rate)
+    if request.if_none_match.contains(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+    reprice_product_store(snapshot_ids, rate)
+
+    try:
+        limit = min(max(int(request.args.get('limit', 24)), 1), PRODUCTS_MAX_LIMIT)
+    except ValueError:
+        limit = 24
+
+    started = time.perf_counter()
+    match, _ = product_search.split_terms(search)
+    try:
+        query = product_query(request.args, snapshot_ids, ranked=True)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if match:
+        rows = query.order_by(db.literal_column('score'), Product.id).limit(limit).all()
+    else:
+        # 짧은 단어만 있으면 색인 조회 없이 LIKE - 순위 없음
+        rows = [(product, None) for product in query.order_by(Product.id).limit(limit).all()]
+
+    response = jsonify({
+        'items': [dict(item, score=None if score is None else round(-score, 6))
+                  for item, (_, score) in zip(product_api_items([product for product, _ in rows], rate), rows)],
+        'total': query.count(),
+        'took_ms': round((time.perf_counter() - started) * 1000, 2)
     })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@app.route('/api/products/facets')
+@login_required
+def api_products_facets():
+    """필터 facet API - 비트셋 AND로 일치하는 제품 id와 facet 값별 개수를 한 번에 반환"""
+    snapshot_ids = latest_snapshot_ids()
+    etag = products_etag('facets', snapshot_ids)
+    if request.if_none_match.contains(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+
+    index = product_facet_index(snapshot_ids)
+    filters = {facet: request.args.get(facet, 'all').lower() if facet in ('brand', 'market')
+               else request.args.get(facet, 'all')
+               for facet in PRODUCT_FACETS}
+    filters = {facet: value for facet, value in filters.items() if value != 'all'}
+
+    # 검색어는 전문 검색 색인으로 찾은 id를 추가 조건으로 사용
+    mask = None
+    if request.args.get('q', '').strip():
+        try:
+            matched = product_query(request.args, snapshot_ids).with_entities(Product.id)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        mask = np.isin(index.ids, [product_id for (product_id,) in matched])
+
+    ids, counts = index.resolve(filters, mask)
+    response = jsonify({
+        'ids': ids.tolist(),
+        'total': len(ids),
+        'facets': counts
+    })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@app.route('/api/products/stats')
+@login_required
+def api_products_stats():
+    """제품 목록 API와 같은 필터로 통계 집계 (통계 모달용)"""
+    snapshot_ids = latest_snapshot_ids()
+    etag = products_etag('stats', snapshot_ids)
+    if request.if_none_match.contains(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+
+    try:
+        query = product_query(request.args, snapshot_ids)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    priced = query.filter(Product.price > 0)
+
+    count, avg_price, max_price, min_price = priced.with_entities(
+        db.func.count(Product.id), db.func.avg(Product.price),
+        db.func.max(Product.price), db.func.min(Product.price)).one()
+
+    def grouped(column, base=query):
+        return base.with_entities(column, db.func.count(Product.id), db.func.avg(Product.price))\
+            .group_by(column).all()
+
+    price_bucket = db.case(
+        (Product.price <= 10000, '~10,000'),
+        (Product.price <= 20000, '10,001~20,000'),
+        (Product.price <= 30000, '20,001~30,000'),
+        (Product.price <= 50000, '30,001~50,000'),
+        (Product.price <= 100000, '50,001~100,000'),
+        else_='100,000+')
+
+    response = jsonify({
+        'total': query.count(),
+        'price': {
+            'avg': round(avg_price or 0),
+            'max': max_price or 0,
+            'min': min_price or 0,
+            'count': count
+        },
+        'markets': {market: {'count': n, 'avg_price': round(avg or 0)}
+                    for market, n, avg in grouped(Product.market, priced)},
+        'market_counts': dict(query.with_entities(Product.market, db.func.count(Product.id))
+                              .group_by(Product.market).all()),
+        'brands': {brand: n for brand, n, _ in grouped(Product.brand)},
+        'positions': {position: n for position, n, _ in grouped(Product.position)},
+        'conditions': {condition: {'count': n, 'avg_price': round(avg or 0)}
+                       for condition, n, avg in grouped(Product.condition)},
+        'price_ranges': dict(priced.with_entities(price_bucket, db.func.count(Product.id))
+                             .group_by(price_bucket).all())
+    })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 # 헬퍼 함수
 def create_user_directory(username):
@@ -850,8 +1052,7 @@ def create_user_directory(username):
     os.makedirs(f"{user_dir}/dashboards", exist_ok=True)
 
 def get_user_stats(username):
-    """사용자 통계 가져오기 - 메인 data 폴더에서 최신 데이터만"""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
+    """사용자 통계 가져오기 - 최신 스냅샷의 캐시된 집계 기준"""
     stats = {
         'total_items': 0,
         'yahoo_items': 0,
@@ -861,165 +1062,367 @@ def get_user_stats(username):
         'yayongsa_avg_price': 0
     }
 
-    # 메인 data 폴더에서 최신 파일만 찾기
-    data_dir = os.path.join(base_dir, 'data')
-    if not os.path.exists(data_dir):
-        return stats
+    # Yahoo: 전체 개수, 평균은 가격 있는 제품만
+    yahoo = snapshot_loader.latest_snapshot('yahoo')
+    if yahoo:
+        summary = yahoo.summary
+        stats['yahoo_items'] = summary['count']
+        if summary['priced_count']:
+            stats['yahoo_avg_price'] = summary['priced_price_sum'] // summary['priced_count']
+        stats['last_crawl'] = yahoo.crawled_at
+
+    # 야용사: 가격이 0인 제품 제외 (dashboard_products와 동일)
+    yayongsa = snapshot_loader.latest_snapshot('yayongsa')
+    if yayongsa:
+        summary = yayongsa.summary
+        stats['yayongsa_items'] = summary['priced_count']
+        if summary['priced_count']:
+            stats['yayongsa_avg_price'] = summary['priced_price_sum'] // summary['priced_count']
 
-    # 최신 파일 찾기 (yahoo_auction 파일만)
-    latest_yahoo = None
-    latest_yayongsa = None
+    stats['total_items'] = stats['yahoo_items'] + stats['yayongsa_items']
+    return stats
 
-    for file in os.listdir(data_dir):
-        if not file.endswith('.json'):
-            continue
-        if 'yahoo_auction' in file.lower():
-            if not latest_yahoo or file > latest_yahoo:
-                latest_yahoo = file
-        elif 'yayongsa' in file.lower():
-            if not latest_yayongsa or file > latest_yayongsa:
-                latest_yayongsa = file
-
-    # Yahoo 데이터 처리
-    if latest_yahoo:
-        filepath = os.path.join(data_dir, latest_yahoo)
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, dict) and 'products' in data:
-                    products = data['products']
-                    stats['yahoo_items'] = len(products)
-                    # 평균 가격 계산
-                    total_price = sum(p.get('current_price', 0) for p in products if p.get('current_price', 0) > 0)
-                    count = len([p for p in products if p.get('current_price', 0) > 0])
-                    if count > 0:
-                        stats['yahoo_avg_price'] = total_price // count
-                elif isinstance(data, list):
-                    stats['yahoo_items'] = len(data)
-                stats['last_crawl'] = latest_yahoo.split('_')[1] if '_' in latest_yahoo else None
-        except Exception as e:
-            print(f"Error loading Yahoo stats: {e}")
+# 제품 저장소 - 크롤러 JSON 스냅샷을 한 번만 적재 (필터/검색 쿼리용)
+STORE_SYNC_INTERVAL = 30  # 새 스냅샷 확인 주기 (초)
 
-    # Yayongsa 데이터 처리
-    if latest_yayongsa:
-        filepath = os.path.join(data_dir, latest_yayongsa)
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, dict) and 'products' in data:
-                    products = data['products']
-                    # 가격이 0인 제품 제외하고 카운트 (dashboard_products와 동일)
-                    valid_products = [p for p in products if p.get('price', 0) > 0]
-                    stats['yayongsa_items'] = len(valid_products)
-                    # 평균 가격 계산
-                    total_price = sum(p.get('price', 0) for p in valid_products)
-                    if valid_products:
-                        stats['yayongsa_avg_price'] = total_price // len(valid_products)
-                elif isinstance(data, list):
-                    valid_products = [p for p in data if p.get('price', 0) > 0]
-                    stats['yayongsa_items'] = len(valid_products)
-        except Exception as e:
-            print(f"Error loading Yayongsa stats: {e}")
+_store_lock = threading.Lock()
+_last_store_sync = 0.0
 
-    stats['total_items'] = stats['yahoo_items'] + stats['yayongsa_items']
-    return stats
+def ingest_snapshot(filepath):
+    """JSON 스냅샷 파일 1개를 저장소에 적재 (파싱은 스냅샷 로더 캐시 공유)"""
+    snapshot = snapshot_loader.load_snapshot(filepath)
 
-def run_crawling(app, username, market, history_id, days=3, kakao_id=None, kakao_password=None):
-    """백그라운드 크롤링 실행"""
-    with app.app_context():
-        history = CrawlHistory.query.get(history_id)
-        try:
-            # 절대 경로 사용
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            user_dir = os.path.join(base_dir, 'users', username)
-
-            # 사용자 디렉토리가 없으면 생성
-            if not os.path.exists(user_dir):
-                os.makedirs(user_dir)
-                os.makedirs(os.path.join(user_dir, 'data'))
-                os.makedirs(os.path.join(user_dir, 'images'))
-                os.makedirs(os.path.join(user_dir, 'dashboards'))
-
-            # 사용자 설정 파일 생성
-            if market == 'yayongsa' and kakao_id and kakao_password:
-                config_file = os.path.join(user_dir, 'config.py')
-                with open(config_file, 'w', encoding='utf-8') as f:
-                    f.write(f'''
-KAKAO_ID = "{kakao_id}"
-KAKAO_PASSWORD = "{kakao_password}"
-WAIT_TIME = 30
-CRAWL_DAYS = {days}
-
-BOARDS = {{
-    "중고글러브벼룩시장": {{
-        "url": "https://cafe.daum.net/baseballsale/79XF",
-        "enabled": True
-    }},
-    "새제품 글러브 벼룩시장": {{
-        "url": "https://cafe.daum.net/baseballsale/2Fsn",
-        "enabled": True
-    }}
-}}
-''')
-
-            # 현재 디렉토리 저장
-            original_dir = os.getcwd()
-
-            # 크롤러 실행
-            os.chdir(user_dir)
-
-            if market == 'yahoo':
-                # Yahoo 크롤러를 사용자 디렉토리에서 실행
-                crawler_path = os.path.join(base_dir, 'yahoo_crawler.py')
-                result = subprocess.run(['python', crawler_path],
-                                      cwd=user_dir,  # 사용자 디렉토리에서 실행
-                                      capture_output=True, text=True, encoding='utf-8')
-            else:  # yayongsa
-                # 수동 로그인을 위한 Jupyter 크롤러 사용
-                crawler_path = os.path.join(base_dir, 'yayongsa_jupyter_crawler.py')
-                result = subprocess.run(['python', crawler_path],
-                                      cwd=user_dir,  # 사용자 디렉토리에서 실행
-                                      capture_output=True, text=True, encoding='utf-8')
-
-            # 원래 디렉토리로 복귀
-            os.chdir(original_dir)
-
-            # 결과 업데이트
-            if history:
-                history.status = 'completed' if result.returncode == 0 else 'failed'
-                history.completed_at = datetime.now(KST)
-
-                # 수집된 아이템 수 계산
-                stats = get_user_stats(username)
-                history.item_count = stats[f'{market}_items']
-
-                if result.returncode != 0:
-                    history.error_message = result.stderr[:500] if result.stderr else 'Unknown error'
-
-                db.session.commit()
-
-            # 대시보드 생성
-            dashboard_path = os.path.join(base_dir, 'enhanced_dashboard.py')
-            if os.path.exists(dashboard_path):
-                subprocess.run(['python', dashboard_path], cwd=user_dir)
-
-            # 제품 대시보드 생성
-            product_dashboard_path = os.path.join(base_dir, 'product_dashboard.py')
-            if os.path.exists(product_dashboard_path):
-                subprocess.run(['python', product_dashboard_path], cwd=user_dir)
+    record = CrawlSnapshot(
+        market=snapshot.market,
+        filename=snapshot.filename,
+        crawled_at=snapshot.crawled_at,
+        item_count=len(snapshot.products)
+    )
+    db.session.add(record)
+    db.session.flush()
+
+    rows = [dict(product.as_row(), snapshot_id=record.id) for product in snapshot.products]
+    if rows:
+        db.session.execute(db.insert(Product), rows)
+        # 새 행만 검색 색인에 추가
+        product_search.index_snapshot(db.session, record.id)
+    db.session.commit()
 
-        except Exception as e:
+    # 스냅샷 옆에 집계 저장 (대시보드/update_dashboard.py 공용)
+    aggregates.snapshot_rollup(snapshot)
+    return record
+
+def sync_product_store(force=False):
+    """data 폴더의 새 스냅샷 적재 (force가 아니면 STORE_SYNC_INTERVAL마다 한 번만 검사)"""
+    global _last_store_sync
+
+    if not force and time.monotonic() - _last_store_sync < STORE_SYNC_INTERVAL:
+        return
+
+    with _store_lock:
+        if not force and time.monotonic() - _last_store_sync < STORE_SYNC_INTERVAL:
+            return
+        _last_store_sync = time.monotonic()
+
+        data_dir = snapshot_loader.DATA_DIR
+        if not os.path.exists(data_dir):
+            return
+
+        known = {filename for (filename,) in db.session.query(CrawlSnapshot.filename)}
+        for filename in sorted(os.listdir(data_dir)):
+            if filename in known or not snapshot_loader.snapshot_market(filename):
+                continue
             try:
-                os.chdir(original_dir)
-            except:
-                pass
+                record = ingest_snapshot(os.path.join(data_dir, filename))
+                print(f"📥 스냅샷 적재: {filename} ({record.item_count}개)")
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error ingesting snapshot {filename}: {e}")
+
+def on_snapshot_written():
+    """크롤러가 새 스냅샷을 저장한 뒤 호출 - 캐시 무효화 및 저장소 적재 (웹 서버 프로세스에는 표시 파일로 알림)"""
+    snapshot_loader.invalidate()
+    snapshot_loader.mark_written()
+    sync_product_store(force=True)
+    refresh_statistics_page_async(force=True)
+
+def reprice_product_store(snapshot_ids, rate):
+    """최신 Yahoo 스냅샷 제품의 원화 금액(price_krw, total_cost_*)을 rate로 다시 저장
+
+    API 응답은 현재 환율로 계산하므로 가격 정렬/필터도 같은 값을 쓰도록 - 환율이 바뀐 경우에만 갱신
+    """
+    snapshot_id = snapshot_ids.get('yahoo')
+    if rate is None or snapshot_id is None:
+        return
+    record = db.session.get(CrawlSnapshot, snapshot_id)
+    if record is None or record.exchange_rate == rate:
+        return
+
+    with _store_lock:
+        db.session.refresh(record)
+        if record.exchange_rate == rate:
+            return
+        rows = db.session.query(Product.id, Product.price).filter_by(snapshot_id=snapshot_id).all()
+        if rows:
+            costs = landed_cost.compute([price for _, price in rows], exchange_rate=rate)
+            db.session.execute(db.update(Product), [
+                {'id': product_id, 'price_krw': price_krw, 'total_cost_jpy': total_cost_jpy,
+                 'total_cost_krw': total_cost_krw}
+                for (product_id, _), price_krw, total_cost_jpy, total_cost_krw in zip(
+                    rows, costs['price_krw'].tolist(), costs['total_cost_jpy'].tolist(),
+                    costs['total_cost_krw'].tolist())])
+        record.exchange_rate = rate
+        db.session.commit()
+        print(f"💱 제품 원화 금액 갱신: {record.filename} (환율 {rate})")
+
+def get_latest_snapshot(market):
+    """마켓별 최신 스냅샷 레코드 (파일명 타임스탬프 기준)"""
+    sync_product_store()
+    return CrawlSnapshot.query.filter_by(market=market)\
+        .order_by(CrawlSnapshot.filename.desc()).first()
+
+# 제품 API - 필터/정렬/커서
+PRODUCTS_MAX_LIMIT = 200
+OTHER_BRANDS = ['기타', 'その他']
+
+# 가격 정렬/필터는 원화 총비용 기준 (price는 Yahoo 엔/야용사 원이라 마켓을 섞어 비교할 수 없음)
+# Yahoo 원화 금액은 reprice_product_store()로 API 응답과 같은 현재 환율 값을 유지
+PRODUCT_SORTS = {
+    'default': (None, False),
+    'price_asc': (Product.total_cost_krw, False),
+    'price_desc': (Product.total_cost_krw, True),
+    'title': (Product.title, False),
+}
+
+def latest_snapshot_ids():
+    """마켓별 최신 스냅샷 id"""
+    ids = {}
+    for market in snapshot_loader.MARKETS:
+        record = get_latest_snapshot(market)
+        if record:
+            ids[market] = record.id
+    return ids
+
+# 필터 facet (드롭다운 값과 같은 키: 브랜드/마켓은 소문자, 브랜드 'other'는 기타 + その他, 타입은 제목으로 판별)
+PRODUCT_FACETS = ('market', 'position', 'condition', 'brand', 'type')
+
+_facet_cache = (None, None)
+_facet_lock = threading.Lock()
+
+def product_facet_index(snapshot_ids):
+    """최신 스냅샷의 판매 중 제품 facet 색인 (스냅샷 id 조합이 바뀔 때만 다시 생성)"""
+    global _facet_cache
+    key = tuple(sorted(snapshot_ids.items()))
+    cached_key, index = _facet_cache
+    if cached_key == key:
+        return index
+
+    with _facet_lock:
+        cached_key, index = _facet_cache
+        if cached_key == key:
+            return index
+
+        rows = Product.query.filter(Product.snapshot_id.in_(list(snapshot_ids.values())),
+                                    Product.is_active.is_(True))\
+            .with_entities(Product.id, Product.market, Product.position, Product.condition,
+                           Product.brand, Product.title)\
+            .order_by(Product.id).all()
+        index = facet_index.FacetIndex([row.id for row in rows], {
+            'market': [row.market or '' for row in rows],
+            'position': [row.position or '' for row in rows],
+            'condition': [row.condition or '' for row in rows],
+            'brand': [(row.brand or '').lower() for row in rows],
+            'type': [classifier.glove_type(row.title) for row in rows],
+        })
+        index.add_value('brand', 'other', index.union('brand', [b.lower() for b in OTHER_BRANDS]))
+        _facet_cache = (key, index)
+        return index
 
-            history = CrawlHistory.query.get(history_id)
-            if history:
-                history.status = 'failed'
-                history.error_message = str(e)
-                history.completed_at = datetime.now(KST)
-                db.session.commit()
+def products_etag(kind, snapshot_ids, exchange_rate=None):
+    """스냅샷 id + 쿼리 파라미터 (+ 환율) 기반 ETag (새 크롤링/환율 갱신 전까지 동일)"""
+    args = sorted(request.args.items(multi=True))
+    key = json.dumps([kind, sorted(snapshot_ids.items()), args, exchange_rate], ensure_ascii=False)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def encode_cursor(value, last_id):
+    return base64.urlsafe_b64encode(json.dumps([value, last_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return value, int(last_id)
+    except Exception:
+        raise ValueError(f'invalid cursor: {cursor}')
+
+def price_bound(args, name):
+    """가격 필터 파라미터 (원화 정수, 없으면 None) - 숫자가 아니면 ValueError"""
+    value = args.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'invalid {name}: {value}')
+
+def product_query(args, snapshot_ids, ranked=False):
+    """요청 파라미터로 최신 스냅샷 제품 쿼리 구성 (판매 중인 제품만)
+
+    ranked: 검색어가 색인 조회 대상이면 (Product, BM25 점수) 행을 돌려주는 쿼리
+    min_price/max_price는 원화 총비용(total_cost_krw) 기준, 숫자가 아니면 ValueError
+    (호출 측에서 reprice_product_store()로 현재 환율 값을 저장한 뒤 사용)
+    """
+    query = Product.query.filter(Product.snapshot_id.in_(list(snapshot_ids.values())),
+                                 Product.is_active.is_(True))
+
+    # 검색어: 3글자 이상 단어는 전문 검색 색인, 짧은 단어는 LIKE (단어를 모두 포함)
+    match, short_terms = product_search.split_terms(args.get('q', ''))
+    if match and ranked:
+        matches = product_search.matches(match)
+        query = query.join(matches, matches.c.id == Product.id).add_columns(matches.c.score)
+    elif match:
+        query = query.filter(Product.id.in_(db.select(product_search.matches(match).c.id)))
+    for term in short_terms:
+        query = query.filter(db.or_(*[db.func.lower(column).contains(term, autoescape=True)
+                                      for column in (Product.title, Product.brand, Product.board)]))
+
+    market = args.get('market', 'all').lower()
+    if market != 'all':
+        query = query.filter(Product.market == market)
+
+    for name, column in (('position', Product.position), ('condition', Product.condition)):
+        value = args.get(name, 'all')
+        if value != 'all':
+            query = query.filter(column == value)
+
+    brand = args.get('brand', 'all').lower()
+    if brand == 'other':
+        query = query.filter(Product.brand.in_(OTHER_BRANDS))
+    elif brand != 'all':
+        query = query.filter(db.func.lower(Product.brand) == brand)
+
+    # classifier.glove_type()과 같은 기준 (소문자 제목에 연식 키워드 포함)
+    title = db.func.lower(db.func.coalesce(Product.title, ''))
+    softball = db.or_(*[title.contains(term, autoescape=True) for term in classifier.SOFTBALL_TERMS])
+    glove_type = args.get('type', 'all')
+    if glove_type == 'softball':
+        query = query.filter(softball)
+    elif glove_type == 'hardball':
+        query = query.filter(db.not_(softball))
+
+    min_price = price_bound(args, 'min_price')
+    if min_price is not None:
+        query = query.filter(Product.total_cost_krw >= min_price)
+    max_price = price_bound(args, 'max_price')
+    if max_price is not None:
+        query = query.filter(Product.total_cost_krw <= max_price)
+
+    return query
+
+def product_api_items(products, exchange_rate=None):
+    """제품 API 응답 항목 목록
+
+    exchange_rate: Yahoo 원화 금액(price_krw, total_cost_krw)을 저장된 값 대신 이 환율로 함께 계산
+                   (엑셀 내보내기의 Snapshot.repriced와 같은 landed_cost.compute)
+    """
+    yahoo = [product for product in products if product.market == 'yahoo']
+    costs = {}
+    if yahoo and exchange_rate is not None:
+        computed = landed_cost.compute([product.price for product in yahoo], exchange_rate=exchange_rate)
+        costs = dict(zip([product.id for product in yahoo],
+                         zip(computed['price_krw'].tolist(), computed['total_cost_krw'].tolist())))
+    return [product_api_dict(product, *costs.get(product.id, ())) for product in products]
+
+def product_api_dict(product, price_krw=None, total_cost_krw=None):
+    """제품 API 응답 항목 (가격은 숫자, 표시 형식은 화면에서 처리) - 원화 금액은 넘기지 않으면 저장된 값"""
+    title = product.title or ''
+    if price_krw is None:
+        price_krw, total_cost_krw = product.price_krw, product.total_cost_krw
+    return {
+        'id': product.id,
+        'title': title,
+        'price': product.price,
+        'currency': 'JPY' if product.market == 'yahoo' else 'KRW',
+        'price_krw': price_krw,
+        'total_cost_krw': total_cost_krw,
+        'url': product.url or '#',
+        'image': product.image,
+        'thumbnail': thumbnail_url(product.image),
+        'market': 'Yahoo' if product.market == 'yahoo' else 'Yayongsa',
+        'brand': product.brand,
+        'position': product.position,
+        'condition': product.condition,
+        'type': classifier.glove_type(title),
+        'bids': product.bids,
+        'time_left': product.time_left
+    }
+
+# 크롤링 작업 큐 - CrawlHistory 행이 작업, 실행은 별도 워커 프로세스(crawl_worker.py)
+JOB_MARKETS = ('yahoo', 'yayongsa', 'dashboard')
+
+# 작업 종류별 최대 시도 횟수 (야용사는 수동 로그인이라 재시도하지 않음)
+JOB_MAX_ATTEMPTS = {'yahoo': 3, 'yayongsa': 1, 'dashboard': 2}
+
+def job_dedup_key(market, params):
+    return f"{market}:{json.dumps(params, sort_keys=True, ensure_ascii=False)}"
+
+def enqueue_job(user_id, market, params=None):
+    """작업 등록 → (작업, 새로 만들었는지) - 같은 내용의 대기 작업이 있으면 그 작업 반환"""
+    params = params or {}
+    dedup_key = job_dedup_key(market, params)
+    pending = CrawlHistory.query.filter_by(dedup_key=dedup_key, status='pending')\
+        .order_by(CrawlHistory.id).first()
+    if pending:
+        return pending, False
+
+    now = datetime.now(KST)
+    job = CrawlHistory(
+        user_id=user_id,
+        market=market,
+        status='pending',
+        created_at=now,
+        params=json.dumps(params, ensure_ascii=False),
+        dedup_key=dedup_key,
+        max_attempts=JOB_MAX_ATTEMPTS.get(market, 1),
+        run_after=now
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job, True
+
+def cancel_job(job):
+    """대기 작업은 바로 취소, 실행 중인 작업은 워커에 취소 요청 → 취소 후 상태"""
+    if job.status == 'pending':
+        job.status = 'cancelled'
+        job.completed_at = datetime.now(KST)
+    elif job.status == 'running':
+        job.cancel_requested = True
+    db.session.commit()
+    if job.status == 'cancelled':
+        emit_job_status(job)
+    return job.status
+
+def emit_job_status(job, channel=None):
+    """작업 상태 변경을 진행 이벤트 채널에 기록 (재시도 대기는 'retrying')"""
+    channel = channel or crawl_events.EventChannel(crawl_events.events_path(job.id))
+    state = job.status
+    if state == 'pending' and job.attempts:
+        state = 'retrying'
+    return channel.emit('status', state=state, market=job.market, attempts=job.attempts,
+                        max_attempts=job.max_attempts, item_count=job.item_count, error=job.error_message,
+                        run_after=job.run_after.isoformat() if job.run_after else None)
+
+def job_dict(job):
+    return {
+        'id': job.id,
+        'market': job.market,
+        'status': job.status,
+        'item_count': job.item_count,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'run_after': job.run_after.isoformat() if job.run_after else None,
+        'cancel_requested': bool(job.cancel_requested),
+        'error': job.error_message
+    }
 
 @app.route('/dashboard/export')
 @login_required
@@ -1028,82 +1431,43 @@ def export_products():
     user = User.query.get(session['user_id'])
     products = []
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(base_dir, 'data')
-
-    # 모든 JSON 파일 처리
-    if os.path.exists(data_dir):
-        # 가장 최신 Yahoo 파일 찾기 (yahoo_auction 파일만 선택, yahoo_test 제외)
-        yahoo_files = sorted([f for f in os.listdir(data_dir) if 'yahoo_auction' in f.lower() and f.endswith('.json')], reverse=True)
-        yayongsa_files = sorted([f for f in os.listdir(data_dir) if 'yayongsa' in f.lower() and f.endswith('.json')], reverse=True)
-
-        # Yahoo 파일들 처리
-        for filename in yahoo_files[:1]:  # 최신 1개만
-            filepath = os.path.join(data_dir, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                if isinstance(data, dict) and 'products' in data:
-                    items = data['products']
-                else:
-                    items = data if isinstance(data, list) else []
-
-                for item in items:
-                    # 판매 완료 상품 및 취소된 경매 제외
-                    time_left = item.get('time_left', '')
-                    if any(term in time_left for term in ['終了', '落札', '取消', 'キャンセル', '売却済']):
-                        continue
-                    # 가격이 0인 경우도 제외
-                    if item.get('current_price', 0) == 0:
-                        continue
-
-                    products.append({
-                        'Title': item.get('title', ''),
-                        'Price (JPY)': item.get('current_price', 0),
-                        'Price (KRW)': item.get('price_krw', 0),
-                        'Brand': item.get('brand', '기타'),
-                        'Position': item.get('position', '올라운드'),
-                        'Condition': item.get('condition', '중고'),
-                        'Bids': item.get('bids', '0'),
-                        'Time Left': item.get('time_left', ''),
-                        'Market': 'Yahoo Auction',
-                        'URL': item.get('url', '#'),
-                        'Total Cost (JPY)': item.get('total_cost_jpy', 0),
-                        'Total Cost (KRW)': item.get('total_cost_krw', 0)
-                    })
-            except Exception as e:
-                print(f"Error loading Yahoo file {filename}: {e}")
+    # Yahoo: 판매 완료/취소/가격 0 제외
+    # Yahoo 원화 금액은 현재 환율로 다시 계산
+    yahoo = snapshot_loader.latest_snapshot('yahoo')
+    yahoo_items = yahoo.repriced(exchange_rates.cached_rate(), yahoo.active_products) if yahoo else []
+    for item in yahoo_items:
+        products.append({
+            'Title': item.title,
+            'Price (JPY)': item.price,
+            'Price (KRW)': item.price_krw,
+            'Brand': item.brand,
+            'Position': item.position,
+            'Condition': item.condition,
+            'Bids': item.bids,
+            'Time Left': item.time_left,
+            'Market': 'Yahoo Auction',
+            'URL': item.url or '#',
+            'Total Cost (JPY)': item.total_cost_jpy,
+            'Total Cost (KRW)': item.total_cost_krw
+        })
 
-        # Yayongsa 파일들 처리
-        for filename in yayongsa_files[:1]:  # 최신 1개만
-            filepath = os.path.join(data_dir, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                if isinstance(data, dict) and 'products' in data:
-                    items = data['products']
-                else:
-                    items = data if isinstance(data, list) else []
-
-                for item in items:
-                    products.append({
-                        'Title': item.get('title', ''),
-                        'Price (JPY)': 0,
-                        'Price (KRW)': item.get('price', 0),
-                        'Brand': item.get('brand', '기타'),
-                        'Position': item.get('position', '올라운드'),
-                        'Condition': item.get('condition', '중고'),
-                        'Bids': '0',
-                        'Time Left': 'N/A',
-                        'Market': '야용사 카페',
-                        'URL': item.get('url', '#'),
-                        'Total Cost (JPY)': 0,
-                        'Total Cost (KRW)': item.get('price', 0)
-                    })
-            except Exception as e:
-                print(f"Error loading Yayongsa file {filename}: {e}")
+    # 야용사: 전체
+    yayongsa = snapshot_loader.latest_snapshot('yayongsa')
+    for item in (yayongsa.products if yayongsa else []):
+        products.append({
+            'Title': item.title,
+            'Price (JPY)': 0,
+            'Price (KRW)': item.price,
+            'Brand': item.brand,
+            'Position': item.position,
+            'Condition': item.condition,
+            'Bids': '0',
+            'Time Left': 'N/A',
+            'Market': '야용사 카페',
+            'URL': item.url or '#',
+            'Total Cost (JPY)': 0,
+            'Total Cost (KRW)': item.price
+        })
 
     # Create Excel file
     output = BytesIO()
@@ -1156,5 +1520,9 @@ def export_products():
         download_name=filename
     )
 
+# 시작 시 아직 적재되지 않은 스냅샷 적재
+with app.app_context():
+    sync_product_store(force=True)
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+야용사 게시글 본문 가격 추출
+"판매가: 43만", "43만원", "430,000원", "가격: 43" 같은 표기를 미리 컴파일한 패턴 하나로
+본문을 한 번만 훑어서 찾고, 표기 종류별 신뢰도가 가장 높은 가격을 선택
+- "정가 65만원", "구매가 550,000원" 같은 정가/구매가 표기는 신뢰도를 낮춰 판매 가격보다 뒤로
+- "43만원에 팝니다"처럼 바로 뒤에 판매 문구가 붙은 가격은 신뢰도를 높임
+"""
+
+import re
+from collections import namedtuple
+
+# 가격 범위 검증 (2만원 ~ 200만원), 단위 없는 숫자는 99만 9999원까지만
+MIN_PRICE = 20000
+MAX_PRICE = 2000000
+MAX_BARE_PRICE = 999999
+
+PriceMatch = namedtuple('PriceMatch', ['price', 'confidence', 'span', 'kind'])
+
+NO_PRICE = PriceMatch(0, 0.0, None, None)
+
+_LABEL = r'(?:판매\s*가격|판매가|가격)\s*[:：=]?\s*'
+# 판매 가격이 아닌 정가/구매가 표기
+_LIST_LABEL = r'(?:정가|(?:구매|구입|소비자|신품|출고|매장)\s*가(?:격)?)\s*[:：=]?\s*'
+_WON_NUMBER = r'\d{1,3}(?:[,.]\d{3})+|\d{5,7}'
+
+# 표기 종류: (그룹 이름, 패턴, 단위, 신뢰도) - 같은 위치에서는 앞쪽 표기가 우선
+_KINDS = [
+    # "판매가격: 43만", "가격 : 28만원"
+    ('label_man', _LABEL + r'(\d{1,3})\s*만(?:\s*원)?', 10000, 0.95),
+    # "판매가: 430,000원", "가격=430000"
+    ('label_won', _LABEL + r'(' + _WON_NUMBER + r')(?:\s*원)?', 1, 0.9),
+    # "판매가: 43" (만 단위로 추정)
+    ('label_bare', _LABEL + r'(\d{2,3})(?=\s|$)', 10000, 0.7),
+    # "정가 58만원", "구매가 550,000원" - 다른 가격이 없을 때만 사용
+    ('list_man', _LIST_LABEL + r'(\d{1,3})\s*만(?:\s*원)?', 10000, 0.1),
+    ('list_won', _LIST_LABEL + r'(' + _WON_NUMBER + r')(?:\s*원)?', 1, 0.1),
+    # "43만원"
+    ('man_won', r'(?<![\d.,])(\d{1,3})\s*만\s*원', 10000, 0.8),
+    # "28만" (뒤에 공백/마침표/끝)
+    ('man', r'(?<![\d.,])(\d{1,3})\s*만(?=\s|$|\.)', 10000, 0.75),
+    # "430,000원", "1.200.000원"
+    ('won', r'(?<![\d.,])(' + _WON_NUMBER + r')\s*원', 1, 0.85),
+    # 단위 없는 5~6자리 숫자 (마지막 수단)
+    ('bare', r'(?<![\d,.])(\d{2,3},\d{3}|\d{5,6})(?![\d,])', 1, 0.3),
+]
+
+KINDS = {name: (unit, confidence) for name, _, unit, confidence in _KINDS}
+
+# 가격 바로 뒤 판매 문구 ("43만원에 팝니다", "35만원에 판매합니다") - 라벨 없는 표기의 신뢰도를 이 값으로 올림
+SALE_CONFIDENCE = 0.92
+SALE_AFTER_RE = re.compile(r'\s*에\s*(?:판매|팝니다|팔아요|팔아|드립니다|드려요|넘깁니다|넘겨요|내놓습니다)')
+_UNLABELLED = ('man_won', 'man', 'won', 'bare')
+
+# 모든 표기는 숫자나 라벨 첫 글자로 시작 - 앞쪽 lookahead로 나머지 위치는 바로 건너뜀
+PRICE_RE = re.compile(
+    r'(?=[\d판가정구소신출매])(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern, _, _ in _KINDS) + ')',
+    re.IGNORECASE)
+
+def _to_number(text):
+    return int(text.replace(',', '').replace('.', ''))
+
+def iter_candidates(text):
+    """본문에서 찾은 모든 가격 후보 (범위 밖 값 포함) → PriceMatch"""
+    for match in PRICE_RE.finditer(text):
+        kind = match.lastgroup
+        unit, confidence = KINDS[kind]
+        # 표기 그룹 바로 다음 그룹이 숫자
+        number = match.group(match.re.groupindex[kind] + 1)
+        if kind in _UNLABELLED and SALE_AFTER_RE.match(text, match.end()):
+            confidence = SALE_CONFIDENCE
+        yield PriceMatch(_to_number(number) * unit, confidence, match.span(), kind)
+
+def valid_price(candidate):
+    limit = MAX_BARE_PRICE if candidate.kind == 'bare' else MAX_PRICE
+    return MIN_PRICE <= candidate.price <= limit
+
+def parse_price(text):
+    """본문 → PriceMatch(가격, 신뢰도 0~1, 본문 내 위치, 표기 종류), 못 찾으면 NO_PRICE
+
+    범위 안의 후보 중 신뢰도가 가장 높은 것, 같으면 먼저 나온 것
+    """
+    best = NO_PRICE
+    for candidate in iter_candidates(text or ''):
+        if candidate.confidence > best.confidence and valid_price(candidate):
+            best = candidate
+    return best
+
+def parse_prices(texts):
+    """여러 본문 일괄 처리 (저장된 게시글 재처리용)"""
+    return [parse_price(text) for text in texts]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+제품 전문 검색 (SQLite FTS5)
+product 테이블의 제목/브랜드/게시판을 trigram 토큰으로 색인 - 일본어/한국어/영문 제목 모두 부분 문자열 검색
+스냅샷 적재 시 새 행만 색인에 추가 (제품 행은 추가만 되고 수정/삭제되지 않음)
+
+검색어는 공백으로 나눈 단어를 모두 포함하는 제품을 찾고 BM25로 순위 (제목 > 브랜드 > 게시판)
+trigram은 3글자 이상만 색인 조회가 가능하므로 1~2글자 단어('硬式', '투수')는 LIKE 조건으로 처리
+"""
+
+from sqlalchemy import column, literal_column, select, table, text
+from sqlalchemy.exc import OperationalError
+
+FTS_TABLE = 'product_fts'
+FTS_COLUMNS = ('title', 'brand', 'board')
+
+# BM25 열 가중치 (FTS_COLUMNS 순서)
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+RANK_SQL = f"bm25({FTS_TABLE}, {', '.join(str(w) for w in BM25_WEIGHTS)})"
+
+MIN_TERM_LENGTH = 3
+
+# SQLite가 FTS5 trigram을 지원하지 않으면 (3.34 미만) False - 검색은 LIKE로 동작
+enabled = False
+
+def ensure_index(session):
+    """색인 테이블 생성, 비어 있으면 기존 제품으로 다시 채움 → 사용 가능 여부"""
+    global enabled
+    try:
+        session.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{', '.join(FTS_COLUMNS)}, content='product', content_rowid='id', tokenize='trigram')"))
+        indexed = session.execute(text(f"SELECT count(*) FROM {FTS_TABLE}_docsize")).scalar()
+        if not indexed and session.execute(text("SELECT count(*) FROM product")).scalar():
+            session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')"))
+            print("🔎 제품 검색 색인 재생성")
+        session.commit()
+        enabled = True
+    except OperationalError as e:
+        session.rollback()
+        print(f"⚠️ FTS5 trigram 검색을 사용할 수 없습니다 (LIKE 검색 사용): {e}")
+        enabled = False
+    return enabled
+
+def index_snapshot(session, snapshot_id):
+    """스냅샷 1개의 제품 행을 색인에 추가 (적재 트랜잭션 안에서 호출)"""
+    if not enabled:
+        return
+    session.execute(text(
+        f"INSERT INTO {FTS_TABLE}(rowid, {', '.join(FTS_COLUMNS)}) "
+        f"SELECT id, {', '.join(FTS_COLUMNS)} FROM product WHERE snapshot_id = :snapshot_id"),
+        {'snapshot_id': snapshot_id})
+
+def split_terms(search):
+    """검색어 → (색인 조회용 MATCH 식 또는 None, LIKE로 찾을 짧은 단어 목록)"""
+    terms = [term for term in search.lower().split() if term]
+    long_terms = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_TERM_LENGTH]
+    if not enabled:
+        return None, terms
+    match = ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in long_terms)
+    return match or None, short_terms
+
+def matches(match):
+    """MATCH 식에 맞는 (id, score) 서브쿼리 - score는 BM25 (작을수록 관련도 높음)"""
+    fts = table(FTS_TABLE, column('rowid'))
+    return select(fts.c.rowid.label('id'), literal_column(RANK_SQL).label('score'))\
+        .where(text(f"{FTS_TABLE} MATCH :fts_match").bindparams(fts_match=match))\
+        .subquery()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+저장된 스냅샷 일괄 재분류
+브랜드/포지션 키워드 표(classifier.py)나 비용 표(landed_cost.py)가 바뀌었을 때
+data/ 의 Yahoo/야용사 스냅샷을 DataFrame 하나로 모아 열 단위 연산으로 다시 라벨링하고
+price_krw/total_cost_* 를 다시 계산해서 바뀐 스냅샷만 덮어씀
+(원화 환산은 각 크롤링이 기록한 환율 그대로 사용 - 항목 exchange_rate, 없으면 스냅샷 exchange_rate, 없으면 표 환율)
+
+사용법:
+    python relabel_snapshots.py              # data/ 전체 재분류 + 저장
+    python relabel_snapshots.py --dry-run    # 바뀌는 항목 수만 출력
+    python relabel_snapshots.py --market yahoo --data-dir /path/to/data
+    python relabel_snapshots.py --cost-version 1   # 특정 비용 표 버전으로 재계산
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import re
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+import classifier
+import snapshot_loader
+import landed_cost
+
+# 마켓별 다시 계산하는 라벨 열 (classifier 표 이름과 같음)
+LABEL_COLUMNS = {
+    'yahoo': ['brand', 'position', 'condition', 'age_group'],
+    'yayongsa': ['brand', 'position', 'condition', 'sold_out'],
+}
+
+TABLES = {
+    'yahoo': classifier.YAHOO_TABLES,
+    'yayongsa': classifier.YAYONGSA_TABLES,
+}
+
+def label_column(titles, table):
+    """제목 열 → 라벨 배열 (표 순서 우선, classifier.TitleClassifier와 같은 결과)
+
+    같은 값을 가진 연속 키워드를 정규식 하나로 묶어 str.contains 한 번씩,
+    np.select가 먼저 적힌 조건을 우선
+    """
+    default, keywords, ignore_case = table
+    conditions, values = [], []
+    for value, group in itertools.groupby(keywords, key=lambda keyword: keyword[1]):
+        pattern = '|'.join(re.escape(word) for word, _ in group)
+        conditions.append(titles.str.contains(pattern, case=not ignore_case, regex=True).to_numpy())
+        values.append(value)
+    return pd.Series(np.select(conditions, values, default=default), index=titles.index).astype(object)
+
+def recorded_rates(df, cost_table=None):
+    """행별 크롤링 당시 환율 (항목 → 스냅샷 → 비용 표 순)"""
+    cost_table = cost_table or landed_cost.get_table()
+    rate = pd.Series(np.nan, index=df.index)
+    for column in ('exchange_rate', '_exchange_rate'):
+        if column in df:
+            rate = rate.fillna(pd.to_numeric(df[column], errors='coerce'))
+    return rate.fillna(cost_table['exchange_rate']).to_numpy(dtype=float)
+
+def cost_columns(df, cost_table=None):
+    """Yahoo 원화 환산/배송비/수수료/관세/총비용 (landed_cost 비용 표, 크롤러 저장 값과 같은 계산)"""
+    price = pd.to_numeric(df['current_price'], errors='coerce').fillna(0)
+    costs = landed_cost.compute(price.to_numpy(), cost_table, recorded_rates(df, cost_table))
+    taxed = pd.Series(costs['taxed'], index=df.index)
+    customs_fee_jpy = pd.Series(costs['customs_fee_jpy'], index=df.index)
+
+    return pd.DataFrame({
+        'price_krw': costs['price_krw'],
+        'exchange_rate': costs['exchange_rate'],
+        'shipping_fee_jpy': costs['shipping_fee_jpy'],
+        'agent_fee_jpy': costs['agent_fee_jpy'],
+        # 관세 없는 상품은 크롤러처럼 정수 0
+        'customs_fee_jpy': customs_fee_jpy.astype(object).where(taxed, 0),
+        'total_cost_jpy': costs['total_cost_jpy'],
+        'total_cost_krw': costs['total_cost_krw'],
+    }, index=df.index)
+
+def snapshot_products(data):
+    """스냅샷 JSON → 상품 목록 (예전 형식: 목록 자체)"""
+    if isinstance(data, dict):
+        return data.get('products') or []
+    return data if isinstance(data, list) else []
+
+def load_snapshots(data_dir, market):
+    """마켓의 모든 스냅샷 → ([(경로, 원본 데이터, 상품 목록)], 전체 상품 DataFrame)"""
+    snapshots = []
+    frames = []
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.json'))):
+        if snapshot_loader.snapshot_market(os.path.basename(path)) != market:
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 로드 실패 {path}: {e}")
+            continue
+        products = [item for item in snapshot_products(data) if isinstance(item, dict)]
+        if not products:
+            continue
+        frame = pd.DataFrame(products)
+        frame['_snapshot'] = len(snapshots)
+        frame['_exchange_rate'] = data.get('exchange_rate') if isinstance(data, dict) else None
+        frames.append(frame)
+        snapshots.append((path, data, products))
+
+    if not frames:
+        return snapshots, pd.DataFrame()
+    return snapshots, pd.concat(frames, ignore_index=True)
+
+def relabel(df, market, cost_table=None):
+    """전체 상품 DataFrame → 새 값 DataFrame (라벨 + Yahoo 비용 열)"""
+    titles = df['title'].fillna('').astype(str) if 'title' in df else pd.Series('', index=df.index)
+    table = TABLES[market]
+    new = pd.DataFrame({column: label_column(titles, table[column]) for column in LABEL_COLUMNS[market]},
+                       index=df.index)
+    if market == 'yahoo' and 'current_price' in df:
+        new = new.join(cost_columns(df, cost_table))
+    return new
+
+def changed_mask(df, new):
+    """열별로 값이 달라진 행 (원래 없던 열도 변경으로 봄)"""
+    changed = pd.DataFrame(False, index=df.index, columns=new.columns)
+    for column in new.columns:
+        if column not in df:
+            changed[column] = True
+            continue
+        old = df[column]
+        changed[column] = ~((old == new[column]) | (old.isna() & new[column].isna()))
+    return changed
+
+def write_snapshot(path, data, products, rows, meta=None):
+    """바뀐 값을 원래 항목 dict에 반영해서 같은 형식으로 저장"""
+    for item, values in zip(products, rows):
+        item.update(values)
+    if meta and isinstance(data, dict):
+        data.update(meta)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def run(data_dir, market, dry_run=False, cost_table=None):
+    started = time.perf_counter()
+    snapshots, df = load_snapshots(data_dir, market)
+    loaded = time.perf_counter()
+    if df.empty:
+        print(f"📭 {market}: 스냅샷 없음")
+        return 0
+
+    cost_table = cost_table or landed_cost.get_table()
+    new = relabel(df, market, cost_table)
+    changed = changed_mask(df, new)
+    labeled = time.perf_counter()
+
+    print(f"\n📂 {market}: 스냅샷 {len(snapshots)}개, 상품 {len(df):,}개 "
+          f"(로드 {loaded - started:.2f}초, 재분류 {labeled - loaded:.2f}초)")
+    for column in new.columns:
+        count = int(changed[column].sum())
+        if count:
+            print(f"   {column:<17} {count:>7,}개 변경")
+
+    # 스냅샷별 행 위치 (load_snapshots에서 스냅샷 순서대로 이어 붙임)
+    row_changed = changed.any(axis=1).to_numpy()
+    positions = df.groupby('_snapshot').indices
+    written = 0
+    for index, (path, data, products) in enumerate(snapshots):
+        rows = positions[index]
+        count = int(row_changed[rows].sum())
+        if not count:
+            continue
+        if dry_run:
+            print(f"   📝 {os.path.basename(path)}: {count}개 항목 변경 예정")
+            continue
+        meta = {'cost_version': cost_table['version']} if market == 'yahoo' else None
+        write_snapshot(path, data, products, new.iloc[rows].to_dict('records'), meta)
+        written += 1
+
+    if not dry_run:
+        print(f"   💾 {written}개 스냅샷 저장 ({time.perf_counter() - labeled:.2f}초)")
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description='저장된 스냅샷 일괄 재분류')
+    parser.add_argument('--data-dir', default=snapshot_loader.DATA_DIR)
+    parser.add_argument('--market', choices=snapshot_loader.MARKETS, help='한 마켓만 (기본: 전체)')
+    parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 변경 수만 출력')
+    parser.add_argument('--cost-version', type=int, help='Yahoo 비용 표 버전 (기본: 현재 표)')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"❌ 데이터 폴더 없음: {args.data_dir}")
+        sys.exit(1)
+
+    try:
+        cost_table = landed_cost.get_table(args.cost_version)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    written = 0
+    for market in ([args.market] if args.market else snapshot_loader.MARKETS):
+        written += run(args.data_dir, market, args.dry_run, cost_table)
+
+    # 웹 대시보드 집계(data/aggregates/)는 스냅샷 수정 시각이 바뀌어 다음 로드 때 다시 계산됨
+    if written:
+        print(f"\n✅ 재분류 완료: {written}개 스냅샷 갱신")
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ import json
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 # yahoo_crawler 모듈 가져오기
-from yahoo_crawler import search_yahoo_auction
+from yahoo_crawler import search_yahoo_auction, search_yahoo_auction_http, MAX_PAGES
 
 def main():
     print("\n" + "="*70)
@@ -43,17 +43,20 @@ def main():
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
 
     try:
-        # Chrome 드라이버 시작
-        print("\n🌐 Chrome 브라우저 시작 중...")
-        driver = webdriver.Chrome(options=chrome_options)
-        print("✅ Chrome 브라우저가 시작되었습니다.")
-
         # 크롤링 실행
         keyword = '硬式グローブ'
         print(f"\n🔍 검색 키워드: {keyword}")
         print("⏳ 크롤링 진행 중... (약 1-2분 소요)")
 
-        results = search_yahoo_auction(driver, keyword)
+        # 정적 HTML로 먼저 시도, 실패 시에만 Chrome 실행
+        results = search_yahoo_auction_http(keyword, max_pages=MAX_PAGES)
+        if results is None:
+            # Chrome 드라이버 시작
+            print("\n🌐 Chrome 브라우저 시작 중...")
+            driver = webdriver.Chrome(options=chrome_options)
+            print("✅ Chrome 브라우저가 시작되었습니다.")
+
+            results = search_yahoo_auction(driver, keyword)
 
         print(f"\n✅ 크롤링 완료!")
         print(f"📦 수집된 상품: {len(results)}개")
@@ -33,7 +33,12 @@ def main():
             print("\n🌐 웹 서버를 실행합니다...")
             print("브라우저에서 http://localhost:5000 접속")
             print("로그인: admin / admin123")
-            subprocess.run([sys.executable, "main_app.py"])
+            # 크롤링 작업은 별도 워커 프로세스가 처리
+            worker = subprocess.Popen([sys.executable, "crawl_worker.py"])
+            try:
+                subprocess.run([sys.executable, "main_app.py"])
+            finally:
+                worker.terminate()
 
         elif choice == "2":
             print("\n🇯🇵 Yahoo Auction 크롤링을 시작합니다...")
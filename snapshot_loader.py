@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+크롤링 스냅샷 로더
+data/ 폴더의 Yahoo/야용사 JSON 스냅샷을 한 번만 파싱하여
+정규화된 제품 목록과 집계값을 프로세스 메모리에 캐시 (gunicorn 스레드 간 공유)
+제품은 적재 시 한 번 ProductRecord(정수 가격, Market, 입찰 수/남은 시간 파싱)로 변환 - 통화 표시는 화면에서만
+"""
+
+import os
+import re
+import sys
+import enum
+import json
+import time
+import threading
+import functools
+import dataclasses
+from collections import OrderedDict
+
+import landed_cost
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# 판매 완료/취소된 경매 표시
+ENDED_TERMS = ['終了', '落札', '取消', 'キャンセル', '売却済']
+
+# 새 스냅샷 확인 주기 (초) - 크롤러 완료 시에는 invalidate()로 즉시 반영
+RESCAN_INTERVAL = 30
+
+MARKETS = ('yahoo', 'yayongsa')
+
+# 크롤링 워커(다른 프로세스)가 새 스냅샷을 저장할 때마다 갱신하는 표시 파일
+WRITTEN_MARKER = os.path.join(DATA_DIR, '.snapshot_written')
+
+class Market(str, enum.Enum):
+    """마켓 (문자열 'yahoo'/'yayongsa'와 같게 비교되고 JSON/DB에도 문자열로 저장)"""
+    YAHOO = 'yahoo'
+    YAYONGSA = 'yayongsa'
+
+    def __str__(self):
+        return self.value
+
+@dataclasses.dataclass(slots=True)
+class ProductRecord:
+    """정규화된 제품 1개 (가격은 마켓 통화 기준 정수, 스냅샷 적재 시 한 번 생성)"""
+    market: Market
+    title: str
+    url: str
+    brand: str
+    position: str
+    condition: str
+    price: int
+    price_krw: int
+    total_cost_jpy: float
+    total_cost_krw: int
+    is_active: bool
+    image: str
+    bids: int = 0
+    time_left: str = ''
+    seconds_left: int | None = None  # Yahoo 남은 시간 (초, 알 수 없거나 종료면 None)
+    location: str = ''
+    board: str = ''
+    author: str = ''
+    date: str = ''
+    views: int = 0
+
+    def as_row(self):
+        """Product 테이블 행 (bids/views 열은 문자열)"""
+        row = {field: getattr(self, field) for field in PRODUCT_FIELDS}
+        row['market'] = self.market.value
+        row['bids'] = str(self.bids)
+        row['views'] = str(self.views)
+        del row['seconds_left']
+        return row
+
+PRODUCT_FIELDS = tuple(field.name for field in dataclasses.fields(ProductRecord))
+
+# Yahoo 남은 시간 표시 ('2日', '5時間', '30分', '45秒') → 초
+TIME_LEFT_UNITS = {'日': 86400, '時間': 3600, '分': 60, '秒': 1}
+TIME_LEFT_PATTERN = re.compile(r'(\d+)\s*(日|時間|分|秒)')
+
+def snapshot_market(filename):
+    """스냅샷 파일명으로 마켓 판별 (yahoo_test 등은 None)"""
+    name = filename.lower()
+    if not name.endswith('.json'):
+        return None
+    if 'yahoo_auction' in name:
+        return 'yahoo'
+    if 'yayongsa' in name:
+        return 'yayongsa'
+    return None
+
+def to_int(value):
+    """'150,000원' 같은 문자열 가격도 정수로 변환"""
+    if isinstance(value, str):
+        return int(''.join(filter(str.isdigit, value)) or 0)
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+@functools.lru_cache(maxsize=1024)
+def parse_time_left(time_left):
+    """Yahoo 남은 시간 문자열 → 초 (알 수 없거나 종료면 None, 같은 표시가 반복되므로 캐시)"""
+    if not time_left or any(term in time_left for term in ENDED_TERMS):
+        return None
+    matches = TIME_LEFT_PATTERN.findall(time_left)
+    if not matches:
+        return None
+    return sum(int(number) * TIME_LEFT_UNITS[unit] for number, unit in matches)
+
+def _label(value):
+    """브랜드/포지션/상태 문자열 - 제품 수천 개가 같은 문자열 객체를 공유하도록 intern"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def normalize_item(item, market):
+    """스냅샷 항목 1개를 ProductRecord로 변환 (price는 마켓 통화 기준 정수)"""
+    common = {
+        'title': item.get('title', ''),
+        'url': item.get('url', ''),
+        'brand': _label(item.get('brand', '기타')),
+        'position': _label(item.get('position', '올라운드')),
+        'condition': _label(item.get('condition', '중고')),
+    }
+
+    if market == 'yahoo':
+        price = to_int(item.get('current_price', 0))
+        time_left = item.get('time_left', '') or ''
+        return ProductRecord(
+            market=Market.YAHOO,
+            price=price,
+            price_krw=to_int(item.get('price_krw', 0)),
+            total_cost_jpy=float(item.get('total_cost_jpy', 0) or 0),
+            total_cost_krw=to_int(item.get('total_cost_krw', 0)),
+            is_active=price > 0 and not any(term in time_left for term in ENDED_TERMS),
+            image=item.get('image', item.get('image_url', '')) or '',
+            bids=to_int(item.get('bids', 0)),
+            time_left=time_left,
+            seconds_left=parse_time_left(time_left),
+            **common)
+
+    price = to_int(item.get('price', 0))
+    # 야용사는 두 번째 이미지 사용 (첫 번째는 썸네일)
+    images = item.get('images', [])
+    return ProductRecord(
+        market=Market.YAYONGSA,
+        price=price,
+        price_krw=price,
+        total_cost_jpy=0.0,
+        total_cost_krw=price,
+        is_active=price > 0,
+        image=images[1] if len(images) > 1 else (images[0] if images else ''),
+        location=item.get('location', '') or '',
+        board=_label(item.get('board', '')) or '',
+        author=item.get('author', '') or '',
+        date=item.get('date', '') or '',
+        views=to_int(item.get('views', 0)),
+        **common)
+
+def reprice(products, exchange_rate):
+    """Yahoo 제품 목록(price = 엔화) → 원화 금액을 exchange_rate로 다시 계산한 복사본"""
+    if not products:
+        return []
+    costs = landed_cost.compute([p.price for p in products], exchange_rate=exchange_rate)
+    price_krw = costs['price_krw'].tolist()
+    total_cost_jpy = costs['total_cost_jpy'].tolist()
+    total_cost_krw = costs['total_cost_krw'].tolist()
+    return [dataclasses.replace(p, price_krw=price_krw[i], total_cost_jpy=total_cost_jpy[i],
+                                total_cost_krw=total_cost_krw[i])
+            for i, p in enumerate(products)]
+
+def summarize(products):
+    """대시보드에서 쓰는 개수/가격 합계 (스냅샷당 한 번 계산)"""
+    summary = {
+        'count': len(products),
+        'active_count': 0,
+        'active_price_sum': 0,
+        'priced_count': 0,
+        'priced_price_sum': 0,
+    }
+    for p in products:
+        if p.is_active:
+            summary['active_count'] += 1
+            summary['active_price_sum'] += p.price
+        if p.price > 0:
+            summary['priced_count'] += 1
+            summary['priced_price_sum'] += p.price
+    return summary
+
+class Snapshot:
+    """파싱된 스냅샷 1개 (읽기 전용으로 공유)"""
+
+    def __init__(self, path, market, crawled_at, products, mtime_ns=None, size=None):
+        self.path = path
+        self.filename = os.path.basename(path)
+        # 읽은 시점의 파일 수정 시각/크기 - 요청마다 파일을 stat하지 않고 ETag 등에 사용
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.market = market
+        self.crawled_at = crawled_at
+        self.products = products
+        self.active_products = [p for p in products if p.is_active]
+        self.summary = summarize(products)
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    @property
+    def identity(self):
+        """(파일명, mtime_ns, 크기) - 같은 파일이 다시 저장되면 바뀜"""
+        return (self.filename, self.mtime_ns, self.size)
+
+    def repriced(self, exchange_rate, products=None):
+        """Yahoo 제품의 원화 금액(price_krw, total_cost_*)을 exchange_rate로 다시 계산한 복사본
+
+        products: 다시 계산할 목록 (기본: 전체, active_products 등), 야용사는 그대로 반환
+        목록별로 마지막 환율의 결과만 보관
+        """
+        products = self.products if products is None else products
+        if self.market != 'yahoo' or exchange_rate is None:
+            return products
+        key = ('repriced', id(products))
+        with self._memo_lock:
+            cached = self._memo.get(key)
+            if cached and cached[0] == exchange_rate:
+                return cached[1]
+        result = reprice(products, exchange_rate)
+        with self._memo_lock:
+            self._memo[key] = (exchange_rate, result)
+        return result
+
+    def memo(self, key, builder):
+        """스냅샷에서 파생된 값(화면용 목록 등)을 한 번만 계산해서 보관"""
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        with self._memo_lock:
+            if key not in self._memo:
+                self._memo[key] = builder(self)
+            return self._memo[key]
+
+def parse_snapshot(path, market=None):
+    """JSON 스냅샷 파일을 읽어 Snapshot 생성 (glove_data_*.json처럼 파일명에 마켓이 없으면 market 지정)"""
+    market = market or snapshot_market(os.path.basename(path))
+
+    with open(path, 'r', encoding='utf-8') as f:
+        st = os.fstat(f.fileno())
+        data = json.load(f)
+
+    if isinstance(data, dict) and 'products' in data:
+        items = data['products']
+    else:
+        items = data if isinstance(data, list) else []
+
+    crawled_at = data.get('crawled_at') if isinstance(data, dict) else None
+    return Snapshot(path, market, crawled_at, [normalize_item(item, market) for item in items],
+                    st.st_mtime_ns, st.st_size)
+
+def latest_paths(data_dir=DATA_DIR):
+    """폴더의 마켓별 최신 스냅샷 경로 (파일명의 시각 기준)"""
+    latest = {}
+    if not os.path.exists(data_dir):
+        return latest
+    for filename in os.listdir(data_dir):
+        market = snapshot_market(filename)
+        if market and filename > latest.get(market, ''):
+            latest[market] = filename
+    return {market: os.path.join(data_dir, filename) for market, filename in latest.items()}
+
+class SnapshotCache:
+    """(경로, mtime, 크기) 키의 LRU 캐시 + 마켓별 최신 스냅샷 포인터"""
+
+    def __init__(self, data_dir=DATA_DIR, maxsize=8, rescan_interval=RESCAN_INTERVAL):
+        self.data_dir = data_dir
+        self.maxsize = maxsize
+        self.rescan_interval = rescan_interval
+        self._entries = OrderedDict()
+        self._latest = {}
+        self._scanned_at = None
+        self._lock = threading.RLock()
+
+    def get(self, path, market=None):
+        """스냅샷 파일 로드 (내용이 바뀌지 않았으면 캐시 사용)"""
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, market)
+
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None:
+                self._entries.move_to_end(key)
+                return snapshot
+
+            # 락을 잡은 채로 파싱해서 여러 스레드가 같은 파일을 중복 파싱하지 않도록 함
+            snapshot = parse_snapshot(path, market)
+            self._entries[key] = snapshot
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return snapshot
+
+    def latest(self, market):
+        """마켓별 최신 스냅샷 (주기 내에는 파일 시스템 접근 없음)"""
+        snapshot = self._latest.get(market)
+        scanned_at = self._scanned_at
+        if scanned_at is not None and time.monotonic() - scanned_at < self.rescan_interval:
+            return snapshot
+
+        with self._lock:
+            if self._scanned_at is None or time.monotonic() - self._scanned_at >= self.rescan_interval:
+                self._rescan()
+            return self._latest.get(market)
+
+    def latest_paths(self):
+        """data 폴더의 마켓별 최신 스냅샷 경로"""
+        return latest_paths(self.data_dir)
+
+    def _rescan(self):
+        latest = {}
+        for market, path in self.latest_paths().items():
+            try:
+                latest[market] = self.get(path)
+            except Exception as e:
+                print(f"Error loading snapshot {path}: {e}")
+        self._latest = latest
+        self._scanned_at = time.monotonic()
+
+    def invalidate(self):
+        """새 스냅샷이 저장되었을 때 호출 - 다음 조회 시 최신 파일 다시 확인"""
+        with self._lock:
+            self._scanned_at = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._latest = {}
+            self._scanned_at = None
+
+# 프로세스 전역 캐시
+_cache = SnapshotCache()
+
+def load_snapshot(path, market=None):
+    """스냅샷 파일 로드 (캐시 사용)"""
+    return _cache.get(path, market)
+
+def latest_snapshot(market):
+    """마켓별 최신 스냅샷 (없으면 None)"""
+    return _cache.latest(market)
+
+def invalidate():
+    """크롤러가 새 스냅샷을 쓴 뒤 호출"""
+    _cache.invalidate()
+
+def mark_written():
+    """새 스냅샷 저장 표시 - 웹 서버 프로세스가 written_at()으로 확인"""
+    os.makedirs(os.path.dirname(WRITTEN_MARKER), exist_ok=True)
+    with open(WRITTEN_MARKER, 'a'):
+        pass
+    os.utime(WRITTEN_MARKER)
+
+def written_at():
+    """마지막 mark_written() 시각 (ns, 표시 파일이 없으면 None)"""
+    try:
+        return os.stat(WRITTEN_MARKER).st_mtime_ns
+    except OSError:
+        return None
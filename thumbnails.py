@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+상품 이미지 썸네일
+내용 주소 이미지 저장소(image_store)의 원본으로 고정 크기 WebP/JPEG 썸네일을 만들어
+data/images/thumbs/<폭>/ 아래에 보관 - 제품 그리드는 원본 대신 썸네일(수 KB)을 받음
+
+사용법:
+    python thumbnails.py              # 저장소의 모든 이미지 썸네일 생성
+    python thumbnails.py --width 480  # 다른 크기
+"""
+
+import os
+import sys
+import glob
+import argparse
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps, features
+
+import image_store
+
+# 기본 썸네일 폭 (그리드 타일 200px 높이 기준 2배 밀도), 허용 폭
+DEFAULT_WIDTH = 320
+WIDTHS = (160, 320, 480, 640)
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpg': ('JPEG', 'image/jpeg'),
+}
+
+# 저장소에 없는 이미지를 요청 시 받아올 수 있는 호스트 (Yahoo, 다음 카페 첨부)
+ALLOWED_HOST_SUFFIXES = ('.yimg.jp', '.daumcdn.net', '.kakaocdn.net')
+
+WEBP_SUPPORTED = features.check('webp')
+
+def thumbnail_path(store, digest, width, fmt):
+    return os.path.join(store.root, 'thumbs', str(width), digest[:2], f"{digest}.{fmt}")
+
+def make_thumbnail(source_path, target_path, width=DEFAULT_WIDTH, fmt='webp'):
+    """원본 → width x width 안에 맞춘 썸네일 (비율 유지, EXIF 회전 반영)"""
+    pil_format = FORMATS[fmt][0]
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((width, width), Image.LANCZOS)
+        if image.mode not in ('RGB', 'RGBA') or pil_format == 'JPEG':
+            image = image.convert('RGB')
+
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        tmp_path = f"{target_path}.{threading.get_ident()}.tmp"
+        if pil_format == 'WEBP':
+            image.save(tmp_path, pil_format, quality=WEBP_QUALITY, method=4)
+        else:
+            image.save(tmp_path, pil_format, quality=JPEG_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp_path, target_path)
+    return target_path
+
+def digest_of(path):
+    """저장소 파일 경로 → SHA-256 (파일명)"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def ensure_thumbnail(source_path, width=DEFAULT_WIDTH, fmt='webp', store=None):
+    """저장소 원본의 썸네일 경로 (없으면 생성)"""
+    store = store or image_store.get_store()
+    if fmt == 'webp' and not WEBP_SUPPORTED:
+        fmt = 'jpg'
+    target = thumbnail_path(store, digest_of(source_path), width, fmt)
+    if not os.path.exists(target):
+        make_thumbnail(source_path, target, width, fmt)
+    return target
+
+def generate(source_paths, width=DEFAULT_WIDTH, workers=4, store=None):
+    """여러 원본의 썸네일을 미리 생성 (WebP + JPEG) → 생성/확인한 원본 수"""
+    source_paths = [path for path in dict.fromkeys(source_paths) if path]
+
+    def build(path):
+        try:
+            for fmt in ('webp', 'jpg'):
+                ensure_thumbnail(path, width, fmt, store)
+            return True
+        except Exception as e:
+            print(f"⚠️ 썸네일 생성 실패 {os.path.basename(path)}: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        done = sum(executor.map(build, source_paths))
+    if source_paths:
+        print(f"🖼️ 썸네일 {done}/{len(source_paths)}개 준비 ({width}px)")
+    return done
+
+def stored(url, store=None):
+    """원본이 이미 저장소에 있는 URL인지"""
+    store = store or image_store.get_store()
+    return store.lookup(url) is not None
+
+def allowed_url(url, store=None):
+    """썸네일 라우트가 받아올 수 있는 이미지 URL인지 (저장소에 있거나 허용 호스트)"""
+    if stored(url, store):
+        return True
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    return parsed.scheme in ('http', 'https') and any(
+        host.endswith(suffix) or host == suffix.lstrip('.') for suffix in ALLOWED_HOST_SUFFIXES)
+
+# 요청 시 원본을 받아올 때 쓰는 세션 (프로세스 공유)
+_session = None
+_session_lock = threading.Lock()
+
+def _get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = image_store.create_session()
+        return _session
+
+def thumbnail_for_url(url, width=DEFAULT_WIDTH, fmt='webp', store=None):
+    """이미지 URL → (썸네일 경로, 원본 SHA-256), 원본은 저장소에 없으면 받아서 저장
+
+    받을 수 없으면 (None, None)
+    """
+    store = store or image_store.get_store()
+    source = store.lookup(url)
+    if source is None:
+        source, status = store.fetch(_get_session(), url)
+        if source is None:
+            return None, None
+        store.save_index()
+    return ensure_thumbnail(source, width, fmt, store), digest_of(source)
+
+def main():
+    parser = argparse.ArgumentParser(description='이미지 저장소 썸네일 생성')
+    parser.add_argument('--width', type=int, default=DEFAULT_WIDTH, choices=WIDTHS)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    store = image_store.get_store()
+    sources = [path for path in glob.glob(os.path.join(store.root, '??', '*'))
+               if not path.endswith('.tmp')]
+    if not sources:
+        print(f"📭 저장소에 이미지가 없습니다: {store.root}")
+        sys.exit(0)
+    generate(sources, args.width, args.workers, store)
+
+if __name__ == "__main__":
+    main()
@@ -5,23 +5,45 @@
 모든 크롤링 데이터를 수집하여 통합 대시보드 생성
 """
 
-import json
 import os
 import glob
 from datetime import datetime
-from collections import defaultdict
+
+import aggregates
+import snapshot_loader
+import exchange_rates
+
+def load_market(file_paths, market, exchange_rate=None):
+    """스냅샷별 저장된 집계를 합산하고 최신 스냅샷의 제품을 미리보기용으로 반환
+
+    exchange_rate: Yahoo 원화 금액을 이 환율로 다시 계산 (스냅샷 JSON은 그대로)
+    """
+    rollups = []
+    for file_path in sorted(file_paths):
+        try:
+            rollup = aggregates.load_rollup(file_path, market=market, exchange_rate=exchange_rate)
+            rollups.append(rollup)
+            print(f"  ✅ {os.path.basename(file_path)}: {rollup['count']}개 상품")
+        except Exception as e:
+            print(f"  ❌ {os.path.basename(file_path)} 로드 실패: {e}")
+
+    preview = []
+    if file_paths:
+        latest = max(file_paths, key=os.path.basename)
+        try:
+            preview = snapshot_loader.load_snapshot(latest, market=market).repriced(exchange_rate)
+        except Exception as e:
+            print(f"  ❌ {os.path.basename(latest)} 미리보기 로드 실패: {e}")
+
+    return aggregates.dashboard_stats(aggregates.merge_rollups(rollups, market)), preview
 
 def update_integrated_dashboard():
-    """모든 JSON 파일의 데이터를 통합하여 대시보드 생성"""
+    """모든 스냅샷의 집계를 통합하여 대시보드 생성"""
 
     print("="*60)
     print("📊 통합 대시보드 업데이트")
     print("="*60)
 
-    # 모든 Yahoo 데이터 수집
-    yahoo_data = []
-    yayongsa_data = []
-
     # 모든 위치에서 Yahoo 데이터 파일 찾기
     yahoo_patterns = [
         'yahoo_auction_*.json',
@@ -37,18 +59,12 @@ def update_integrated_dashboard():
     # 중복 제거
     yahoo_files = list(set(yahoo_files))
 
-    print(f"\n📁 발견된 Yahoo 파일: {len(yahoo_files)}개")
+    # 원화 금액은 캐시된 현재 환율로 다시 계산
+    rate = exchange_rates.current_rate()
+    print(f"\n💱 환율: 1엔 = {rate:.4f}원")
 
-    # 모든 Yahoo 파일 데이터 로드
-    for file_path in yahoo_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_data = json.load(f)
-                if isinstance(file_data, list):
-                    yahoo_data.extend(file_data)
-                    print(f"  ✅ {os.path.basename(file_path)}: {len(file_data)}개 상품")
-        except Exception as e:
-            print(f"  ❌ {os.path.basename(file_path)} 로드 실패: {e}")
+    print(f"\n📁 발견된 Yahoo 파일: {len(yahoo_files)}개")
+    yahoo_stats, yahoo_data = load_market(yahoo_files, 'yahoo', rate)
 
     # 야용사 데이터 파일 찾기
     yayongsa_patterns = [
@@ -67,26 +83,12 @@ def update_integrated_dashboard():
     yayongsa_files = list(set(yayongsa_files))
 
     print(f"\n📁 발견된 야용사 파일: {len(yayongsa_files)}개")
-
-    # 모든 야용사 파일 데이터 로드
-    for file_path in yayongsa_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_data = json.load(f)
-                if isinstance(file_data, list):
-                    yayongsa_data.extend(file_data)
-                    print(f"  ✅ {os.path.basename(file_path)}: {len(file_data)}개 상품")
-        except Exception as e:
-            print(f"  ❌ {os.path.basename(file_path)} 로드 실패: {e}")
+    yayongsa_stats, yayongsa_data = load_market(yayongsa_files, 'yayongsa')
 
     print(f"\n📊 총계:")
-    print(f"  Yahoo: {len(yahoo_data)}개 상품")
-    print(f"  야용사: {len(yayongsa_data)}개 상품")
-    print(f"  전체: {len(yahoo_data) + len(yayongsa_data)}개 상품")
-
-    # 통계 계산
-    yahoo_stats = calculate_stats(yahoo_data, 'yahoo')
-    yayongsa_stats = calculate_stats(yayongsa_data, 'yayongsa')
+    print(f"  Yahoo: {yahoo_stats['total']}개 상품")
+    print(f"  야용사: {yayongsa_stats['total']}개 상품")
+    print(f"  전체: {yahoo_stats['total'] + yayongsa_stats['total']}개 상품")
 
     # HTML 대시보드 생성
     html_content = generate_dashboard_html(yahoo_data, yayongsa_data, yahoo_stats, yayongsa_stats)
@@ -111,63 +113,6 @@ def update_integrated_dashboard():
 
     return dashboard_file
 
-def calculate_stats(data, source):
-    """데이터 통계 계산"""
-    stats = {
-        'total': len(data),
-        'positions': defaultdict(int),
-        'brands': defaultdict(int),
-        'conditions': defaultdict(int),
-        'price_ranges': defaultdict(int),
-        'avg_price': 0
-    }
-
-    if not data:
-        return stats
-
-    total_price = 0
-    valid_price_count = 0
-
-    for item in data:
-        # 포지션
-        position = item.get('position', '올라운드')
-        stats['positions'][position] += 1
-
-        # 브랜드
-        brand = item.get('brand', '기타')
-        if brand and brand != 'unknown':
-            stats['brands'][brand] += 1
-
-        # 상태
-        condition = item.get('condition', '미분류')
-        stats['conditions'][condition] += 1
-
-        # 가격
-        if source == 'yahoo':
-            price = item.get('total_cost_krw', 0)
-        else:
-            price = item.get('price', 0)
-
-        if price > 0:
-            total_price += price
-            valid_price_count += 1
-
-            # 가격대
-            if price <= 100000:
-                price_range = '~10만원'
-            elif price <= 300000:
-                price_range = '10~30만원'
-            elif price <= 500000:
-                price_range = '30~50만원'
-            else:
-                price_range = '50만원~'
-            stats['price_ranges'][price_range] += 1
-
-    if valid_price_count > 0:
-        stats['avg_price'] = total_price / valid_price_count
-
-    return stats
-
 def generate_dashboard_html(yahoo_data, yayongsa_data, yahoo_stats, yayongsa_stats):
     """대시보드 HTML 생성"""
 
@@ -420,41 +365,33 @@ def generate_dashboard_html(yahoo_data, yayongsa_data, yahoo_stats, yayongsa_sta
             <div class="products-grid">
 """
 
-    # Yahoo 상품 카드 (최신순으로 정렬 후 최대 8개)
-    # 타임스탬프가 있으면 정렬, 없으면 역순으로
-    sorted_yahoo = sorted(yahoo_data, key=lambda x: x.get('timestamp', ''), reverse=True) if yahoo_data else []
-
-    for item in sorted_yahoo[:8]:
-        # 엔화 가격 사용 (1엔 = 약 9.2원)
-        price_yen = item.get('current_price', 0)
-        # total_cost_krw에는 배송비 포함된 가격이 있을 수 있음
-        price_krw = item.get('total_cost_krw', 0)
-        if not price_krw and price_yen:
-            price_krw = price_yen * 9.2  # 환율 적용
-        position = item.get('position', '올라운드')
-        brand = item.get('brand', '기타')
-        condition = item.get('condition', '미분류')
+    # Yahoo 상품 카드 (최신 스냅샷에서 최대 8개)
+    for item in yahoo_data[:8]:
+        # 엔화 가격, 원화는 현재 환율로 다시 계산한 배송비/수수료 포함 금액
+        price_yen = item.price
+        price_krw = item.total_cost_krw
+        position = item.position
+        brand = item.brand
+        condition = item.condition
 
         html_content += f"""
-                <div class="product-card" onclick="window.open('{item.get('url', '#')}', '_blank')">
-                    <div class="product-title">{item.get('title', '')[:40]}...</div>
+                <div class="product-card" onclick="window.open('{item.url or '#'}', '_blank')">
+                    <div class="product-title">{item.title[:40]}...</div>
                     <div class="product-price">¥{price_yen:,}</div>
                     <div class="product-info" style="font-size: 0.85em; color: #888;">약 ₩{int(price_krw):,}</div>
                     <div class="product-info">Yahoo | {position} | {brand} | {condition}</div>
                 </div>
 """
 
-    # 야용사 상품 카드 (최신순으로 정렬 후 최대 4개)
-    sorted_yayongsa = sorted(yayongsa_data, key=lambda x: x.get('date', ''), reverse=True) if yayongsa_data else []
-
-    for item in sorted_yayongsa[:4]:
-        price = item.get('price', 0)
-        position = item.get('position', '올라운드')
-        condition = item.get('condition', '중고')
+    # 야용사 상품 카드 (최신 스냅샷에서 최대 4개)
+    for item in yayongsa_data[:4]:
+        price = item.price
+        position = item.position
+        condition = item.condition
 
         html_content += f"""
-                <div class="product-card" onclick="window.open('{item.get('url', '#')}', '_blank')">
-                    <div class="product-title">{item.get('title', '')[:40]}...</div>
+                <div class="product-card" onclick="window.open('{item.url or '#'}', '_blank')">
+                    <div class="product-title">{item.title[:40]}...</div>
                     <div class="product-price">₩{price:,}</div>
                     <div class="product-info" style="margin-top: 10px;">야용사 | {position} | {condition}</div>
                 </div>
@@ -1,6 +1,5 @@
 # Yahoo Auction Japan 크롤러
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
@@ -8,12 +7,42 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import time
 import json
+import argparse
 import os
 import re
 from datetime import datetime
 import requests
 import pytz
 
+import yahoo_parser
+import driver_pool
+import yahoo_incremental
+import concurrent_fetch
+import classifier
+import landed_cost
+import exchange_rates
+import image_store
+import crawl_events
+import thumbnails
+from yahoo_parser import CATEGORY_URL
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# HTTP 모드: 요청 타임아웃, 페이지 간 대기 (초)
+HTTP_TIMEOUT = 15
+HTTP_PAGE_DELAY = 1.0
+
+# HTTP 모드: 동시 요청 페이지 수, 요청 간격 지터 (초), 기본 최대 페이지 수
+HTTP_CONCURRENCY = 4
+HTTP_JITTER = 0.5
+MAX_PAGES = 30
+
+# 스냅샷 기본 저장 폴더 (작업 디렉터리와 무관)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# 크롤링 1회당 이미지를 받을 최대 상품 수 (이미 받은 이미지는 다시 받지 않음)
+IMAGE_LIMIT = int(os.environ.get('YAHOO_IMAGE_LIMIT', 500))
+
 def setup_driver():
     """드라이버 설정 - 크롬 창 자동 열기"""
     options = Options()
@@ -28,44 +57,200 @@ def setup_driver():
     options.add_argument('--no-sandbox')  # 샌드박스 비활성화 (Windows 호환성)
 
     # User-Agent 설정 (일본 사이트 접속용)
-    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    options.add_argument(f'user-agent={USER_AGENT}')
 
-    service = Service(ChromeDriverManager().install())
+    # 시스템 chromedriver가 있으면 ChromeDriverManager 네트워크 조회 생략
+    service = Service(driver_pool.chromedriver_path() or ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=options)
     driver.maximize_window()
     return driver
 
-def search_yahoo_auction(driver, keyword="", days=0, max_pages=3):
-    """야후 옥션 검색 - 여러 페이지 크롤링
+def category_url(days=0, base_url=CATEGORY_URL):
+    """기간 필터가 적용된 카테고리 목록 URL과 표시용 기간 텍스트"""
+    date_text = "전체 기간"
+    if days > 0:
+        if days == 1:
+            base_url += "&new=1"  # 신규 출품 (24시간 이내)
+            date_text = "오늘 (24시간 이내)"
+        elif days == 3:
+            base_url += "&etime=3"
+            date_text = "3일 이내"
+        elif days == 7:
+            base_url += "&etime=7"
+            date_text = "7일 이내"
+        elif days == 30:
+            date_text = "30일 이내"
+    return base_url, date_text
+
+def process_product(product_data, labels=None):
+    """목록에서 읽은 상품 카드 필터링 + 브랜드/포지션 분류 (제외 대상이면 None)
+
+    비용(원화 환산, 배송비, 관세)은 수집이 끝난 뒤 landed_cost.apply로 목록 전체를 한 번에 계산
+
+    labels: classifier 라벨 (collect_page에서 페이지 단위로 미리 분류한 값, 없으면 여기서 분류)
+    """
+    title = product_data['title']
+    if not title:
+        return None
+
+    if labels is None:
+        labels = classifier.classify_title(title)
+
+    # === 필터링 ===
+
+    # 1. 반드시 글러브 키워드가 있어야 함
+    if not labels['glove']:
+        return None
+
+    # 2. 확실한 액세서리 제외 (오일/왁스, 끈, 도구, 타격 장갑 등)
+    if labels['exclude']:
+        return None
+
+    # 3. 가격 필터 (3000엔 이상의 진짜 글러브만)
+    if product_data['current_price'] < 3000:
+        return None
+
+    # 3. 판매완료/종료 상품 제외
+    if labels['sold']:
+        return None
+
+    # 4. 남은시간 확인
+    time_left = product_data.get('time_left', '')
+    if time_left and any(term in time_left for term in ['終了', '落札']):
+        return None
+
+    # === 데이터 추출 ===
+
+    # 브랜드, 상태, 포지션, 연령대
+    product_data['brand'] = labels['brand']
+    product_data['condition'] = labels['condition']
+    product_data['position'] = labels['position']
+    product_data['age_group'] = labels['age_group']
+
+    return product_data
+
+def collect_page(cards, page_num, products, verbose=True):
+    """한 페이지의 카드를 필터링해서 products에 추가"""
+    labels = classifier.classify([card['title'] for card in cards])
+    for idx, (card, card_labels) in enumerate(zip(cards, labels), 1):
+        try:
+            product_data = process_product(card, card_labels)
+        except Exception:
+            continue
+        if product_data is None:
+            continue
+
+        products.append(product_data)
+
+        # 출력
+        if verbose:
+            print(f"  [{page_num}-{idx}] (총 {len(products)}개) {product_data['title'][:35]}...")
+            print(f"      💴 ¥{product_data['current_price']:,}")
+            print(f"      📦 {product_data['brand']} | {product_data['condition']} | {product_data['position']}")
+
+def create_session(pool_size=HTTP_CONCURRENCY):
+    """목록 페이지용 HTTP 세션 (브라우저와 같은 헤더, 동시 요청 수만큼 연결 재사용)"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'ja,en-US;q=0.8,en;q=0.6',
+    })
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def fetch_list_page(session, url, timeout=HTTP_TIMEOUT):
+    """목록 페이지 HTML 다운로드"""
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    response.encoding = response.encoding or 'utf-8'
+    return response.text
+
+def search_yahoo_auction_http(keyword="", days=0, max_pages=3, session=None,
+                              base_url=CATEGORY_URL, delay=HTTP_PAGE_DELAY, verbose=True,
+                              concurrency=HTTP_CONCURRENCY, jitter=HTTP_JITTER,
+                              is_last_page=None, seen_ids=None, cancel=None):
+    """야후 옥션 검색 - Chrome 없이 HTTP + BeautifulSoup으로 크롤링
+
+    페이지(b= 오프셋)는 concurrency개씩 동시에 가져오고, 같은 호스트 요청은
+    delay초 + 지터 간격으로 시작. 100개 미만 페이지가 나오면 그 뒤는 요청하지 않음
+    (is_last_page(cards)가 True인 페이지에서도 중단)
+
+    seen_ids: 집합을 넘기면 수집한 페이지의 모든 카드 경매 ID를 추가 (필터로 제외된 카드 포함)
+    cancel: threading.Event - 페이지마다 확인하고 설정되면 crawl_events.JobCancelled
+
+    첫 페이지를 받지 못했거나 상품 카드가 하나도 없으면 (차단, 마크업 변경 등)
+    None을 반환 → 호출 측에서 Selenium으로 재시도
+    """
+    products = []
+    own_session = session is None
+    if own_session:
+        session = create_session(concurrency)
+
+    try:
+        base_url, date_text = category_url(days, base_url)
+        limiter = concurrent_fetch.HostRateLimiter(delay, jitter)
+        # 페이지는 스레드 풀에서 받으므로 진행 이벤트 채널을 미리 가져옴
+        events = crawl_events.current()
+
+        if verbose:
+            print(f"🔍 검색 중 (HTTP): {keyword}")
+            print(f"📅 크롤링 기간: {date_text}")
+            print(f"📄 최대 {max_pages}페이지까지 크롤링 (동시 {concurrency}페이지)")
+
+        def load_page(page_num):
+            crawl_events.check_cancel(cancel)
+            url = yahoo_parser.page_url(base_url, page_num)
+            limiter.wait(url)
+            cards = yahoo_parser.parse_list_page(fetch_list_page(session, url), url)
+            if verbose:
+                print(f"   📖 {page_num}페이지: {len(cards)}개 상품 발견")
+            events.emit('page', page=page_num, cards=len(cards), mode='http')
+            return cards
+
+        pages = concurrent_fetch.fetch_pages(load_page, max_pages, concurrency,
+                                             yahoo_parser.PAGE_SIZE, is_last_page)
+        # fetch_pages는 페이지 오류를 그 페이지에서 중단으로 처리하므로 취소는 여기서 다시 확인
+        crawl_events.check_cancel(cancel)
+
+        if not pages or not pages[0][1]:
+            print("   ⚠️ HTML에서 상품을 찾지 못했습니다. (Selenium으로 재시도 필요)")
+            return None
+
+        # 완료 순서와 상관없이 페이지 순서대로 처리
+        for page_num, cards in pages:
+            if seen_ids is not None:
+                seen_ids.update(yahoo_parser.auction_id(card['url']) or card['url'] for card in cards)
+            collect_page(cards, page_num, products, verbose)
+        events.emit('parsed', pages=len(pages), items=len(products))
+
+        if verbose and len(pages[-1][1]) < yahoo_parser.PAGE_SIZE:
+            print(f"\n📌 {pages[-1][0]}페이지가 마지막 페이지입니다.")
+
+    finally:
+        if own_session:
+            session.close()
+
+    return products
+
+def search_yahoo_auction(driver, keyword="", days=0, max_pages=3, base_url=CATEGORY_URL, page_wait=3, cancel=None):
+    """야후 옥션 검색 - 여러 페이지 크롤링 (Selenium, HTTP 모드 실패 시 사용)
 
     Args:
         driver: 웹드라이버
         keyword: 검색 키워드 (비어있으면 카테고리 전체)
         days: 크롤링 기간 (0=전체, 1=오늘, 3=3일이내, 7=7일이내, 30=30일이내)
         max_pages: 크롤링할 최대 페이지 수
+        cancel: threading.Event - 페이지마다 확인하고 설정되면 crawl_events.JobCancelled
     """
     products = []
 
     try:
         # Yahoo Auction 야구 글러브 카테고리 직접 접근
-        # 2084032394 = 야구 글러브 카테고리
         # 키워드 검색 없이 카테고리 페이지에서 직접 가져오기
-        base_url = "https://auctions.yahoo.co.jp/category/list/2084032394/?n=100"
-
-        # 날짜 필터 추가
-        date_text = "전체 기간"
-        if days > 0:
-            if days == 1:
-                base_url += "&new=1"  # 신규 출품 (24시간 이내)
-                date_text = "오늘 (24시간 이내)"
-            elif days == 3:
-                base_url += "&etime=3"
-                date_text = "3일 이내"
-            elif days == 7:
-                base_url += "&etime=7"
-                date_text = "7일 이내"
-            elif days == 30:
-                date_text = "30일 이내"
+        base_url, date_text = category_url(days, base_url)
 
         print(f"🔍 검색 중: {keyword}")
         print(f"📅 크롤링 기간: {date_text}")
@@ -73,202 +258,33 @@ def search_yahoo_auction(driver, keyword="", days=0, max_pages=3):
 
         # 여러 페이지 크롤링
         for page_num in range(1, max_pages + 1):
-            # 페이지 URL 생성
-            if page_num == 1:
-                url = base_url
-            else:
-                # 페이지네이션: b 파라미터 사용 (100개씩)
-                offset = (page_num - 1) * 100 + 1
-                if '?' in base_url:
-                    url = f"{base_url}&b={offset}"
-                else:
-                    url = f"{base_url}?b={offset}"
+            crawl_events.check_cancel(cancel)
+
+            # 페이지 URL 생성 (b 파라미터: 100개 단위)
+            url = yahoo_parser.page_url(base_url, page_num)
 
             print(f"\n📖 {page_num}페이지 크롤링 중...")
             print(f"   URL: {url}")
 
             driver.get(url)
-            time.sleep(3)
+            time.sleep(page_wait)
 
-            # 상품 목록 가져오기
+            # 상품 목록 가져오기 - page_source 한 번으로 모든 카드 파싱
             try:
-                product_elements = driver.find_elements(By.CSS_SELECTOR, ".Product")
-                if not product_elements:
-                    product_elements = driver.find_elements(By.CSS_SELECTOR, "li.Product__item")
+                cards = yahoo_parser.parse_list_page(driver.page_source, driver.current_url)
 
-                print(f"   ✅ {len(product_elements)}개 상품 발견")
+                print(f"   ✅ {len(cards)}개 상품 발견")
+                crawl_events.emit('page', page=page_num, cards=len(cards), mode='selenium')
 
-                if not product_elements:
+                if not cards:
                     print("   ⚠️ 더 이상 상품이 없습니다.")
                     break
 
-                for idx, element in enumerate(product_elements, 1):
-                    try:
-                        product_data = {}
-
-                        # 상품명
-                        try:
-                            title_elem = element.find_element(By.CSS_SELECTOR, ".Product__title")
-                            product_data['title'] = title_elem.text.strip()
-                        except:
-                            product_data['title'] = ''
-
-                        if not product_data['title']:
-                            continue
-
-                        title = product_data['title']
-                        title_lower = title.lower()
-
-                        # 가격
-                        try:
-                            price_elem = element.find_element(By.CSS_SELECTOR, ".Product__priceValue")
-                            price_text = price_elem.text.strip()
-                            price_text = price_text.replace(',', '').replace('円', '').replace('¥', '').replace(' ', '')
-                            product_data['current_price'] = int(price_text) if price_text.isdigit() else 0
-                        except:
-                            product_data['current_price'] = 0
-
-                        # 이미지
-                        try:
-                            img_elem = element.find_element(By.CSS_SELECTOR, "img.Product__imageData")
-                            product_data['image_url'] = img_elem.get_attribute('src')
-                        except:
-                            product_data['image_url'] = ''
-
-                        # URL
-                        try:
-                            link_elem = element.find_element(By.CSS_SELECTOR, "a.Product__titleLink")
-                            product_data['url'] = link_elem.get_attribute('href')
-                        except:
-                            product_data['url'] = ''
-
-                        # 입찰 수
-                        try:
-                            bid_elem = element.find_element(By.CSS_SELECTOR, ".Product__bid")
-                            product_data['bids'] = bid_elem.text.strip()
-                        except:
-                            product_data['bids'] = '0'
-
-                        # 남은 시간
-                        try:
-                            time_elem = element.find_element(By.CSS_SELECTOR, ".Product__time")
-                            product_data['time_left'] = time_elem.text.strip()
-                        except:
-                            product_data['time_left'] = ''
-
-                        # === 필터링 ===
-
-                        # 1. 반드시 글러브 키워드가 있어야 함
-                        glove_keywords = ['グローブ', 'グラブ', 'ミット', 'glove', 'Glove']
-                        if not any(keyword in title for keyword in glove_keywords):
-                            continue
-
-                        # 2. 확실한 액세서리 제외
-                        exclude_keywords = [
-                            # 오일/왁스 단품
-                            'スクワランオイル', 'ミンクオイル', 'メンテナンスオイル',
-                            '艶出し', 'みつろう', 'ワックス',
-                            # 끈 단품
-                            'レースのみ', '紐のみ', 'グラブレース単品',
-                            # 도구
-                            'グラブピン', '紐通し', 'ニードル', '修理用',
-                            # 타격 장갑
-                            'バッティンググローブ', 'バッティング手袋', '守備用手袋',
-                            # 기타
-                            'サングラス', 'アームガード', '芯材のみ'
-                        ]
-
-                        # 확실한 액세서리는 제외
-                        if any(keyword in title for keyword in exclude_keywords):
-                            continue
-
-                        # 3. 가격 필터 (3000엔 이상의 진짜 글러브만)
-                        if product_data['current_price'] < 3000:
-                            continue
-
-                        # 3. 판매완료/종료 상품 제외
-                        sold_keywords = ['終了', '売り切れ', '完売', 'SOLD', '落札', '売却済']
-                        if any(word in title for word in sold_keywords):
-                            continue
-
-                        # 4. 남은시간 확인
-                        time_left = product_data.get('time_left', '')
-                        if time_left and any(term in time_left for term in ['終了', '落札']):
-                            continue
-
-                        # === 데이터 추출 ===
-
-                        # 브랜드 추출
-                        product_data['brand'] = extract_brand_from_title(title)
-
-                        # 상태
-                        if any(word in title for word in ['新品', '未使用', 'NEW']):
-                            product_data['condition'] = '신품'
-                        else:
-                            product_data['condition'] = '중고'
-
-                        # 포지션 (더 정확한 판별)
-                        if any(word in title for word in ['投手', 'ピッチャー', 'pitcher', 'Pitcher']):
-                            product_data['position'] = '투수'
-                        elif any(word in title for word in ['捕手', 'キャッチャー', 'ミット', 'catcher', 'Catcher']):
-                            product_data['position'] = '포수'
-                        elif any(word in title for word in ['内野', '二塁', '三塁', '一塁', 'ショート', 'セカンド', 'サード', 'ファースト', 'infield']):
-                            product_data['position'] = '내야수'
-                        elif any(word in title for word in ['外野', 'アウトフィールド', 'outfield', 'Outfield']):
-                            product_data['position'] = '외야수'
-                        elif any(word in title for word in ['オールラウンド', 'オールポジション', 'all-round']):
-                            product_data['position'] = '올라운드'
-                        else:
-                            # 기본값은 올라운드
-                            product_data['position'] = '올라운드'
-
-                        # 연령대
-                        if any(word in title for word in ['キッズ', '少年', 'ジュニア', '子供']):
-                            product_data['age_group'] = '어린이용'
-                        elif any(word in title for word in ['大人', '一般', '成人', 'プロ']):
-                            product_data['age_group'] = '성인용'
-                        else:
-                            product_data['age_group'] = '성인용'
-
-                        # 원화 환산
-                        exchange_rate = 9.2
-                        product_data['price_krw'] = int(product_data['current_price'] * exchange_rate)
-                        product_data['exchange_rate'] = exchange_rate
-
-                        # 배송비 계산
-                        weight_kg = 0.6  # 글러브 평균 무게
-                        shipping_fee_krw = int(weight_kg * 5000)
-                        shipping_fee_jpy = shipping_fee_krw / exchange_rate
-                        agent_fee_jpy = product_data['current_price'] * 0.1
-
-                        # 관세 계산
-                        customs_threshold_jpy = 21739
-                        customs_fee_jpy = 0
-                        if product_data['current_price'] > customs_threshold_jpy:
-                            customs_fee_jpy = product_data['current_price'] * 0.23
-
-                        # 총 비용
-                        total_cost_jpy = product_data['current_price'] + shipping_fee_jpy + agent_fee_jpy + customs_fee_jpy
-                        total_cost_krw = int(total_cost_jpy * exchange_rate)
-
-                        product_data['shipping_fee_jpy'] = shipping_fee_jpy
-                        product_data['agent_fee_jpy'] = agent_fee_jpy
-                        product_data['customs_fee_jpy'] = customs_fee_jpy
-                        product_data['total_cost_jpy'] = total_cost_jpy
-                        product_data['total_cost_krw'] = total_cost_krw
-
-                        products.append(product_data)
-
-                        # 출력
-                        print(f"  [{page_num}-{idx}] (총 {len(products)}개) {title[:35]}...")
-                        print(f"      💴 ¥{product_data['current_price']:,} (≈ ₩{product_data['price_krw']:,})")
-                        print(f"      📦 {product_data['brand']} | {product_data['condition']} | {product_data['position']}")
-
-                    except Exception as e:
-                        continue
+                collect_page(cards, page_num, products)
+                crawl_events.emit('parsed', pages=page_num, items=len(products))
 
                 # 상품이 100개 미만이면 마지막 페이지
-                if len(product_elements) < 100:
+                if len(cards) < yahoo_parser.PAGE_SIZE:
                     print("\n📌 마지막 페이지입니다.")
                     break
 
@@ -276,6 +292,8 @@ def search_yahoo_auction(driver, keyword="", days=0, max_pages=3):
                 print(f"❌ 페이지 {page_num} 오류: {e}")
                 break
 
+    except crawl_events.JobCancelled:
+        raise
     except Exception as e:
         print(f"❌ 검색 오류: {e}")
 
@@ -283,32 +301,18 @@ def search_yahoo_auction(driver, keyword="", days=0, max_pages=3):
 
 def extract_brand_from_title(title):
     """제목에서 브랜드 추출"""
-    brands = {
-        'ミズノ': 'Mizuno', 'mizuno': 'Mizuno', 'MIZUNO': 'Mizuno',
-        'ウィルソン': 'Wilson', 'wilson': 'Wilson', 'WILSON': 'Wilson',
-        'ローリングス': 'Rawlings', 'rawlings': 'Rawlings', 'RAWLINGS': 'Rawlings',
-        'ゼット': 'ZETT', 'zett': 'ZETT', 'ZETT': 'ZETT',
-        'SSK': 'SSK',
-        'アシックス': 'ASICS', 'asics': 'ASICS', 'ASICS': 'ASICS',
-        '久保田': 'Kubota Slugger', 'kubota': 'Kubota Slugger',
-        'ハタケヤマ': 'Hatakeyama',
-        'アトムズ': 'ATOMS', 'atoms': 'ATOMS',
-        'ザナックス': 'Xanax', 'xanax': 'Xanax',
-        'アイピーセレクト': 'IP Select', 'ip select': 'IP Select',
-        'デサント': 'Descente', 'descente': 'Descente',
-        'アンダーアーマー': 'Under Armour', 'under armour': 'Under Armour', 'UA': 'Under Armour'
-    }
+    return classifier.classify_title(title)['brand']
 
-    title_lower = title.lower() if title else ''
+def save_yahoo_data(products, meta=None, image_products=None, out_dir=None):
+    """데이터 저장
 
-    for key, brand in brands.items():
-        if key.lower() in title_lower:
-            return brand
+    meta: 스냅샷에 추가할 메타데이터 (정렬, 증분 변경분 등)
+    image_products: 이미지를 받을 상품 (기본: 전체 중 IMAGE_LIMIT개, 증분 크롤링은 새 상품만)
+    out_dir: 스냅샷 저장 폴더 (기본: DATA_DIR, 사용자별 크롤링은 users/<이름>/data)
 
-    return 'その他'
-
-def save_yahoo_data(products):
-    """데이터 저장"""
+    Returns:
+        (스냅샷 파일 경로, 이미지 저장소 폴더)
+    """
     # 한국 시간으로 설정
     kst = pytz.timezone('Asia/Seoul')
     now = datetime.now(kst)
@@ -317,11 +321,30 @@ def save_yahoo_data(products):
     print(f"\n📅 현재 시간: {now.strftime('%Y년 %m월 %d일 %H시 %M분 %S초')}")
 
     # data 디렉토리 생성
-    if not os.path.exists('data'):
-        os.makedirs('data')
+    out_dir = out_dir or DATA_DIR
+    os.makedirs(out_dir, exist_ok=True)
+
+    # 이미지 다운로드 - 내용 주소 저장소(data/images/)에 동시 다운로드, 이미 받은 이미지는 재사용
+    # 저장 경로(local_image)가 스냅샷에 남도록 JSON 저장 전에 처리
+    print(f"\n📷 이미지 다운로드 중...")
+    if image_products is None:
+        image_products = products
+    image_products = [p for p in image_products if p.get('image_url')][:IMAGE_LIMIT]
+    paths = image_store.download_images([p['image_url'] for p in image_products])
+    for product in image_products:
+        path = paths.get(product['image_url'])
+        if path:
+            product['local_image'] = os.path.relpath(path, os.path.dirname(os.path.abspath(__file__)))
+    # 제품 그리드용 썸네일 미리 생성 (웹 서버는 요청 시 생성하지 않고 바로 제공)
+    thumbnails.generate(path for path in paths.values() if path)
 
     # JSON 파일로 저장
-    filename = f"data/yahoo_auction_{timestamp}.json"
+    filename = os.path.join(out_dir, f"yahoo_auction_{timestamp}.json")
+
+    # 카탈로그 전체 비용 계산 (증분 크롤링에서 이어받은 상품도 현재 비용 표/환율로 다시 계산)
+    cost_table = landed_cost.get_table()
+    rate = exchange_rates.current_rate()
+    landed_cost.apply(products, cost_table, rate)
 
     # 메타데이터 추가
     data = {
@@ -329,100 +352,197 @@ def save_yahoo_data(products):
         'crawled_date': now.strftime('%Y-%m-%d'),
         'crawled_time': now.strftime('%H:%M:%S'),
         'total_count': len(products),
-        'products': products
+        'cost_version': cost_table['version'],
+        'exchange_rate': rate,
     }
+    data.update(meta or {})
+    data['products'] = products
 
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
     print(f"💾 데이터 저장: {filename}")
+    crawl_events.emit('saved', filename=os.path.basename(filename), items=len(products))
 
-    # 이미지 다운로드 폴더 생성
-    img_folder = f"data/yahoo_images_{timestamp}"
-    if not os.path.exists(img_folder):
-        os.makedirs(img_folder)
+    return filename, image_store.get_store().root
 
-    # 이미지 다운로드 (선택적)
-    print(f"\n📷 이미지 다운로드 중...")
-    for idx, product in enumerate(products[:20], 1):  # 처음 20개만
-        if product.get('image_url'):
-            try:
-                response = requests.get(product['image_url'], timeout=5)
-                if response.status_code == 200:
-                    img_filename = f"{img_folder}/product_{idx}.jpg"
-                    with open(img_filename, 'wb') as f:
-                        f.write(response.content)
-                    product['local_image'] = img_filename
-            except:
-                pass
+def fetch_products(max_pages=MAX_PAGES, concurrency=HTTP_CONCURRENCY, pool=None, cancel=None):
+    """HTTP로 먼저 수집하고, 실패하면 Chrome으로 재시도
+
+    pool: driver_pool.DriverPool - 있으면 풀의 headless Chrome을 빌려 쓰고 (웹 서버),
+          없으면 크롬 창을 새로 띄움 (명령줄 실행)
+    cancel: threading.Event - 워커의 취소 요청 (페이지마다 확인)
+    """
+    # 정적 HTML로 먼저 크롤링 (Chrome 불필요), 실패 시에만 Selenium 사용
+    products = search_yahoo_auction_http(keyword="", days=0, max_pages=max_pages, concurrency=concurrency,
+                                         cancel=cancel)
+    if products is not None:
+        return products
+
+    print("\n🌐 HTTP 모드 실패 → Chrome 브라우저로 재시도")
+    if pool is not None:
+        with pool.lease() as driver:
+            return search_yahoo_auction(driver, keyword="", days=0, max_pages=max_pages, cancel=cancel)
+
+    driver = setup_driver()
+    try:
+        return search_yahoo_auction(driver, keyword="", days=0, max_pages=max_pages, cancel=cancel)
+    finally:
+        print("\n10초 후 브라우저가 닫힙니다...")
+        time.sleep(10)
+        driver.quit()
 
-    return filename, img_folder
+def run(max_pages=MAX_PAGES, concurrency=HTTP_CONCURRENCY, pool=None, out_dir=None, cancel=None):
+    """카테고리 크롤링 + 저장 → 저장한 파일 경로 (수집된 상품이 없으면 None)
+
+    out_dir: 스냅샷 저장 폴더 (기본: DATA_DIR)
+    cancel: threading.Event - 설정되면 저장하지 않고 crawl_events.JobCancelled
+    """
+    # 카테고리 페이지 직접 크롤링 (키워드 검색 대신)
+    print("\n🔍 야후옥션 야구 글러브 카테고리 크롤링")
+    print("📌 카테고리: 野球 > グローブ (2084032394)")
+
+    all_products = fetch_products(max_pages, concurrency, pool, cancel)
+    crawl_events.check_cancel(cancel)
+    print(f"   📊 총 {len(all_products)}개 수집")
+
+    # 중복 제거
+    unique_products = []
+    seen_titles = set()
+    for product in all_products:
+        if product['title'] not in seen_titles:
+            unique_products.append(product)
+            seen_titles.add(product['title'])
+
+    print(f"\n📊 수집 결과:")
+    print(f"  총 {len(unique_products)}개 상품 (중복 제거)")
+
+    if not unique_products:
+        return None
+
+    # 상태별 분류
+    new_products = [p for p in unique_products if p['condition'] == '신품']
+    used_products = [p for p in unique_products if p['condition'] == '중고']
+
+    print(f"\n📦 상태별 분류:")
+    print(f"  신품: {len(new_products)}개")
+    print(f"  중고: {len(used_products)}개")
+
+    # 브랜드별 통계
+    brand_stats = {}
+    for product in unique_products:
+        brand = product['brand']
+        if brand not in brand_stats:
+            brand_stats[brand] = {'count': 0, 'total_price': 0}
+        brand_stats[brand]['count'] += 1
+        brand_stats[brand]['total_price'] += product['current_price']
+
+    print("\n🏷️ 브랜드별 분포:")
+    for brand, stats in sorted(brand_stats.items(), key=lambda x: x[1]['count'], reverse=True)[:5]:
+        avg_price = stats['total_price'] / stats['count'] if stats['count'] > 0 else 0
+        print(f"  {brand}: {stats['count']}개 (평균 ¥{avg_price:,.0f})")
+
+    # 데이터 저장
+    filename, image_dir = save_yahoo_data(unique_products, out_dir=out_dir)
+
+    print(f"\n✅ 크롤링 완료!")
+    print(f"  데이터: {filename}")
+    print(f"  이미지: {image_dir}/")
+    return filename
+
+def run_incremental(max_pages=MAX_PAGES, concurrency=HTTP_CONCURRENCY, pool=None, out_dir=None, cancel=None):
+    """증분 크롤링 - 신착순으로 새/변경된 경매만 받고 이전 스냅샷에 합쳐서 저장
+
+    이전 스냅샷이 없거나 HTTP 모드가 실패하면 전체 크롤링(run)으로 대체
+    마지막 전체 확인 후 yahoo_incremental.FULL_CHECK_INTERVAL이 지났으면 중단 페이지 없이 전체 페이지 확인
+    변경이 없으면 새 파일을 만들지 않고 이전 스냅샷 경로 반환
+    out_dir: 이전 스냅샷을 찾고 새 스냅샷을 저장할 폴더 (기본: DATA_DIR)
+    cancel: threading.Event - 페이지마다 확인하고 설정되면 저장하지 않고 crawl_events.JobCancelled
+    """
+    out_dir = out_dir or DATA_DIR
+    previous_path, previous = yahoo_incremental.load_previous(out_dir)
+    if previous is None:
+        print("\n📂 이전 스냅샷 없음 → 전체 크롤링")
+        return run(max_pages, concurrency, pool, out_dir, cancel)
+
+    previous_products = previous['products']
+    ordered = previous.get('sort') == yahoo_incremental.SORT_NEWEST
+    known = {yahoo_incremental.product_key(p) for p in previous_products}
+    now = datetime.now(yahoo_incremental.KST)
+    full_check = yahoo_incremental.full_check_due(previous, now)
+
+    print("\n🔁 야후옥션 증분 크롤링 (신착순)")
+    print(f"📂 이전 스냅샷: {os.path.basename(previous_path)} ({len(previous_products)}개)")
+
+    is_last_page = None
+    if full_check:
+        print("   마지막 전체 확인 후 시간이 지나 이번에는 전체 페이지 확인")
+    elif ordered:
+        # 필터를 통과하는 카드가 모두 아는 경매인 페이지에서 중단
+        is_wanted = lambda card: process_product(dict(card)) is not None
+        is_last_page = lambda cards: yahoo_incremental.page_fully_known(cards, known, is_wanted)
+    else:
+        print("   이전 스냅샷이 신착순이 아니므로 이번에는 전체 페이지 확인")
+
+    seen_ids = set()
+    fetched = search_yahoo_auction_http(keyword="", days=0, max_pages=max_pages, concurrency=concurrency,
+                                        base_url=CATEGORY_URL + yahoo_parser.NEWEST_SORT,
+                                        is_last_page=is_last_page, seen_ids=seen_ids, verbose=False,
+                                        cancel=cancel)
+    if fetched is None:
+        print("\n🌐 HTTP 모드 실패 → 전체 크롤링")
+        return run(max_pages, concurrency, pool, out_dir, cancel)
+
+    products, delta = yahoo_incremental.compute_delta(
+        previous_products, fetched, seen_ids, ordered,
+        yahoo_incremental.parse_time(previous.get('crawled_at')), now)
+
+    print(f"\n📊 변경 사항: 신규 {len(delta['added'])}개 / 변경 {len(delta['updated'])}개 / 종료 {len(delta['ended'])}개")
+    crawl_events.emit('delta', added=len(delta['added']), updated=len(delta['updated']), ended=len(delta['ended']),
+                      catalog=len(products))
+    print(f"   확인한 경매 {len(seen_ids)}개, 카탈로그 {len(products)}개")
+
+    # 전체 확인은 변경이 없어도 확인 시각을 남기도록 저장
+    if not any(delta.values()) and ordered and not full_check:
+        print("✅ 변경 없음 - 새 스냅샷을 만들지 않습니다.")
+        return previous_path
+
+    added = set(delta['added'])
+    meta = {
+        'sort': yahoo_incremental.SORT_NEWEST,
+        'delta': dict(delta, base=os.path.basename(previous_path)),
+        'full_checked_at': now.isoformat() if full_check else yahoo_incremental.last_full_check(previous),
+    }
+    filename, _ = save_yahoo_data(
+        products, meta, [p for p in products if yahoo_incremental.product_key(p) in added], out_dir)
+
+    print(f"\n✅ 증분 크롤링 완료!")
+    print(f"  데이터: {filename}")
+    return filename
 
 def main():
+    parser = argparse.ArgumentParser(description='Yahoo Auction 글러브 크롤러')
+    parser.add_argument('--pages', type=int, default=MAX_PAGES, help='최대 페이지 수 (마지막 페이지에서 자동 중단)')
+    parser.add_argument('--concurrency', type=int, default=HTTP_CONCURRENCY, help='HTTP 모드 동시 요청 페이지 수')
+    parser.add_argument('--incremental', action='store_true', help='이전 스냅샷 이후 새/변경된 경매만 수집')
+    parser.add_argument('--out-dir', default=DATA_DIR, help='스냅샷 저장 폴더')
+    args = parser.parse_args()
+
     print("="*70)
     print("🎌 Yahoo Auction Japan 글러브 크롤러")
     print("="*70)
 
-    driver = setup_driver()
-
     try:
-        # 카테고리 페이지 직접 크롤링 (키워드 검색 대신)
-        print("\n🔍 야후옥션 야구 글러브 카테고리 크롤링")
-        print("📌 카테고리: 野球 > グローブ (2084032394)")
-
-        # 카테고리에서 직접 크롤링 (키워드 없이)
-        all_products = search_yahoo_auction(driver, keyword="", days=0, max_pages=5)  # 5페이지 크롤링
-        print(f"   📊 총 {len(all_products)}개 수집")
-
-        # 중복 제거
-        unique_products = []
-        seen_titles = set()
-        for product in all_products:
-            if product['title'] not in seen_titles:
-                unique_products.append(product)
-                seen_titles.add(product['title'])
-
-        print(f"\n📊 수집 결과:")
-        print(f"  총 {len(unique_products)}개 상품 (중복 제거)")
-
-        if unique_products:
-            # 상태별 분류
-            new_products = [p for p in unique_products if p['condition'] == '신품']
-            used_products = [p for p in unique_products if p['condition'] == '중고']
-
-            print(f"\n📦 상태별 분류:")
-            print(f"  신품: {len(new_products)}개")
-            print(f"  중고: {len(used_products)}개")
-
-            # 브랜드별 통계
-            brand_stats = {}
-            for product in unique_products:
-                brand = product['brand']
-                if brand not in brand_stats:
-                    brand_stats[brand] = {'count': 0, 'total_price': 0}
-                brand_stats[brand]['count'] += 1
-                brand_stats[brand]['total_price'] += product['current_price']
-
-            print("\n🏷️ 브랜드별 분포:")
-            for brand, stats in sorted(brand_stats.items(), key=lambda x: x[1]['count'], reverse=True)[:5]:
-                avg_price = stats['total_price'] / stats['count'] if stats['count'] > 0 else 0
-                print(f"  {brand}: {stats['count']}개 (평균 ¥{avg_price:,.0f})")
-
-            # 데이터 저장
-            filename, img_folder = save_yahoo_data(unique_products)
-
-            print(f"\n✅ 크롤링 완료!")
-            print(f"  데이터: {filename}")
-            print(f"  이미지: {img_folder}/")
+        if args.incremental:
+            run_incremental(args.pages, args.concurrency, out_dir=args.out_dir)
+        else:
+            run(args.pages, args.concurrency, out_dir=args.out_dir)
 
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
 
     finally:
-        print("\n10초 후 브라우저가 닫힙니다...")
-        time.sleep(10)
-        driver.quit()
         print("✅ 종료")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Yahoo 증분 크롤링
+이전 스냅샷과 경매 ID(상품 URL)로 비교해서 새 경매/가격·입찰 변경/종료된 경매만 골라내고
+이전 카탈로그에 합쳐서 새 스냅샷 생성
+
+중단 페이지 뒤의 경매는 다시 받지 않으므로 남은 시간으로 종료 시각(ends_at)을 정해 두고
+지나면 종료로 처리 - 가격/입찰 변경도 놓치지 않도록 FULL_CHECK_INTERVAL마다 중단 없이 전체 페이지 확인
+"""
+
+import os
+import glob
+import json
+from datetime import datetime, timedelta, timezone
+
+import yahoo_parser
+import snapshot_loader
+
+# 신착순으로 수집한 스냅샷 표시 (다음 증분 크롤링에서 중단 지점 판단에 사용)
+SORT_NEWEST = 'new'
+
+# 값이 바뀌면 '변경'으로 보는 필드 (남은 시간은 매번 바뀌므로 제외)
+CHANGE_FIELDS = ('current_price', 'bids')
+
+# 중단 페이지 없이 전체 페이지를 다시 확인하는 주기 (초)
+FULL_CHECK_INTERVAL = 24 * 3600
+
+# 스냅샷 시각 (crawled_at이 '20250928_191547' 형식이면 한국 시간)
+KST = timezone(timedelta(hours=9))
+
+def product_key(product):
+    """경매 ID (URL에 ID가 없으면 URL 자체)"""
+    url = product.get('url', '')
+    return yahoo_parser.auction_id(url) or url
+
+def load_previous(data_dir):
+    """가장 최근 Yahoo 스냅샷 → (경로, 데이터), 없으면 (None, None)"""
+    for path in sorted(glob.glob(os.path.join(data_dir, 'yahoo_auction_*.json')), reverse=True):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 이전 스냅샷 로드 실패 {path}: {e}")
+            continue
+        if isinstance(data, dict) and isinstance(data.get('products'), list):
+            return path, data
+    return None, None
+
+def parse_time(value):
+    """스냅샷/상품의 시각 문자열 → timezone 있는 datetime (알 수 없으면 None)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value, '%Y%m%d_%H%M%S')
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=KST)
+
+def last_full_check(previous):
+    """이전 스냅샷의 마지막 전체 확인 시각 문자열 (전체 크롤링(run) 스냅샷은 crawled_at)"""
+    checked = previous.get('full_checked_at')
+    if checked is None and 'delta' not in previous:
+        checked = previous.get('crawled_at')
+    return checked
+
+def full_check_due(previous, now):
+    """이전 스냅샷 기준으로 이번에 전체 페이지를 확인해야 하는지"""
+    checked = parse_time(last_full_check(previous))
+    return checked is None or (now - checked).total_seconds() >= FULL_CHECK_INTERVAL
+
+def end_time(product, crawled_at):
+    """경매 종료 시각 (늦은 쪽으로 추정, 알 수 없으면 None)
+
+    ends_at이 없으면 수집 시각 + 남은 시간 - '2日'은 2~3일 남은 것이므로 표시 단위 하나를 더함
+    """
+    ends_at = parse_time(product.get('ends_at'))
+    if ends_at is not None or crawled_at is None:
+        return ends_at
+    time_left = product.get('time_left') or ''
+    seconds = snapshot_loader.parse_time_left(time_left)
+    if seconds is None:
+        return None
+    units = snapshot_loader.TIME_LEFT_PATTERN.findall(time_left)
+    slack = min(snapshot_loader.TIME_LEFT_UNITS[unit] for _, unit in units)
+    return crawled_at + timedelta(seconds=seconds + slack)
+
+def format_time_left(seconds):
+    """초 → Yahoo 표시 형식 ('2日', '5時間', '30分', '45秒')"""
+    for unit, size in snapshot_loader.TIME_LEFT_UNITS.items():
+        if seconds >= size or size == 1:
+            return f"{int(seconds // size)}{unit}"
+
+def page_fully_known(cards, known, is_wanted):
+    """페이지의 수집 대상 카드가 모두 이미 아는 경매인지 (신착순이면 이후 페이지는 더 오래된 경매)
+
+    is_wanted(card): 필터를 통과하는 카드인지 (악세사리 등 원래 제외되는 카드는 판단에서 제외)
+    """
+    wanted = [card for card in cards if is_wanted(card)]
+    return bool(wanted) and all(product_key(card) in known for card in wanted)
+
+def compute_delta(previous, fetched, seen_ids, ordered, crawled_at=None, now=None):
+    """이전 카탈로그와 이번 수집 결과 비교
+
+    Args:
+        previous: 이전 스냅샷 상품 목록
+        fetched: 이번에 수집한 상품 목록 (필터 통과, 페이지 순서)
+        seen_ids: 이번에 수집한 페이지의 모든 카드 키 (필터로 제외된 카드 포함)
+        ordered: 이전 스냅샷도 신착순이면 True - 이번에 확인한 마지막 아는 경매보다
+                 뒤(더 오래된) 상품은 다시 받지 않고 유지 (종료 시각이 지났으면 종료)
+        crawled_at: 이전 스냅샷 수집 시각 (parse_time 결과, 유지하는 상품의 종료 시각 계산)
+        now: 이번 수집 시각 (기본: 현재)
+
+    Returns:
+        (합친 상품 목록, {'added': [...], 'updated': [...], 'ended': [...]})
+    """
+    now = now or datetime.now(KST)
+    previous_by_key = {}
+    for product in previous:
+        previous_by_key.setdefault(product_key(product), product)
+
+    merged = []
+    merged_keys = set()
+    added, updated = [], []
+    for product in fetched:
+        key = product_key(product)
+        if key in merged_keys:
+            continue
+        merged_keys.add(key)
+        merged.append(product)
+
+        old = previous_by_key.get(key)
+        if old is None:
+            added.append(key)
+        elif any(old.get(field) != product.get(field) for field in CHANGE_FIELDS):
+            updated.append(key)
+
+    # 이전 목록에서 이번 수집 범위의 끝 (신착순이 아니면 전체를 다시 받은 것으로 봄)
+    boundary = len(previous) - 1
+    if ordered:
+        boundary = -1
+        for index, product in enumerate(previous):
+            if product_key(product) in seen_ids:
+                boundary = index
+
+    ended = []
+    for index, product in enumerate(previous):
+        key = product_key(product)
+        if key in merged_keys:
+            continue
+        merged_keys.add(key)
+        if index <= boundary:
+            # 수집 범위 안에 있었는데 목록에 없거나 필터에서 제외됨 (종료/낙찰/삭제)
+            ended.append(key)
+            continue
+
+        # 수집 범위 밖 - 종료 시각이 지났으면 종료, 아니면 남은 시간을 이번 수집 기준으로 갱신해서 유지
+        ends_at = end_time(product, crawled_at)
+        if ends_at is None:
+            merged.append(product)
+            continue
+        remaining = (ends_at - now).total_seconds()
+        if remaining <= 0:
+            ended.append(key)
+            continue
+        merged.append(dict(product, ends_at=ends_at.isoformat(), time_left=format_time_left(remaining)))
+
+    return merged, {'added': added, 'updated': updated, 'ended': ended}
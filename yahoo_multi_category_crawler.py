@@ -6,17 +6,23 @@ Yahoo Auction 골프/낚시 크롤러
 """
 
 import os
-import re
 import json
 import time
 from datetime import datetime, timezone, timedelta
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+import yahoo_parser
+import classifier
+import landed_cost
+import exchange_rates
 
-def search_yahoo_auction(driver, category_id, category_name=""):
+# 스냅샷 기본 저장 폴더 (작업 디렉터리와 무관)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def search_yahoo_auction(driver, category_id, category_name="", exchange_rate=None):
     """
     Yahoo Auction 카테고리 메인 페이지에서 상품 수집
 
@@ -24,6 +30,7 @@ def search_yahoo_auction(driver, category_id, category_name=""):
         driver: 웹드라이버
         category_id: 카테고리 ID
         category_name: 카테고리 이름 (표시용)
+        exchange_rate: 원화 환산 환율 (기본: 캐시된 현재 환율)
     """
     products = []
 
@@ -43,114 +50,56 @@ def search_yahoo_auction(driver, category_id, category_name=""):
         print(f"\n📋 상품 목록 수집 중...")
 
         # 상품 목록 (div.Products.Products--grid > div > ul > li)
-        product_elements = driver.find_elements(By.CSS_SELECTOR, "div.Products.Products--grid > div > ul > li")
+        # page_source 한 번으로 모든 카드 파싱 - 필드별 WebDriver 호출 없음
+        cards = yahoo_parser.parse_grid_page(driver.page_source, driver.current_url)
 
-        print(f"   ✅ {len(product_elements)}개 상품 발견")
+        print(f"   ✅ {len(cards)}개 상품 발견")
 
-        if not product_elements:
+        if not cards:
             print("   ⚠️ 상품을 찾을 수 없습니다.")
             return products
 
-        for idx, element in enumerate(product_elements, 1):
-            try:
-                product_data = {}
-
-                # 상품명 (div.Product__detail > h3 > a)
-                try:
-                    title_elem = element.find_element(By.CSS_SELECTOR, "div.Product__detail > h3 > a")
-                    product_data['title'] = title_elem.text.strip()
-                except:
-                    product_data['title'] = ''
+        # 페이지 전체 제목을 한 번에 분류 (판매완료/상태)
+        labels = classifier.classify([card['title'] for card in cards])
 
+        for idx, (product_data, card_labels) in enumerate(zip(cards, labels), 1):
+            try:
                 if not product_data['title']:
                     continue
 
-                # 이미지 (div.Product__image > a > img)
-                try:
-                    img_elem = element.find_element(By.CSS_SELECTOR, "div.Product__image > a > img")
-                    product_data['image_url'] = img_elem.get_attribute('src')
-                except:
-                    product_data['image_url'] = ''
-
-                # 상품 링크 (div.Product__detail > h3 > a)
-                try:
-                    link_elem = element.find_element(By.CSS_SELECTOR, "div.Product__detail > h3 > a")
-                    product_data['url'] = link_elem.get_attribute('href')
-                except:
-                    product_data['url'] = ''
-
-                # 현재가
-                try:
-                    price_elem = element.find_element(By.CSS_SELECTOR, "div.Product__priceInfo > span:nth-child(1) > span.Product__priceValue")
-                    price_text = price_elem.text.strip()
-                    price_text = price_text.replace(',', '').replace('円', '').replace('¥', '').replace(' ', '')
-                    product_data['current_price'] = int(price_text) if price_text.isdigit() else 0
-                except:
-                    product_data['current_price'] = 0
-
                 # 기본 정보
                 product_data['bids'] = '0'
                 product_data['time_left'] = ''
 
                 # 판매완료 제외
-                sold_keywords = ['終了', '売り切れ', '完売', 'SOLD', '落札', '売却済']
-                if any(word in product_data['title'] for word in sold_keywords):
-                            continue
-
-                        # 브랜드 (기본값)
-                        product_data['brand'] = '기타'
-
-                        # 상태
-                        if any(word in product_data['title'] for word in ['新品', '未使用', 'NEW']):
-                            product_data['condition'] = '신품'
-                        else:
-                            product_data['condition'] = '중고'
-
-                        # 기본 분류
-                        product_data['position'] = '올라운드'
-                        product_data['age_group'] = '성인용'
-
-                        # 원화 환산
-                        exchange_rate = 9.2
-                        product_data['price_krw'] = int(product_data['current_price'] * exchange_rate)
-                        product_data['exchange_rate'] = exchange_rate
-
-                        # 배송비 계산
-                        weight_kg = 0.6
-                        shipping_fee_krw = int(weight_kg * 5000)
-                        shipping_fee_jpy = shipping_fee_krw / exchange_rate
-                        agent_fee_jpy = product_data['current_price'] * 0.1
-
-                        # 관세 계산
-                        customs_threshold_jpy = 21739
-                        customs_fee_jpy = 0
-                        if product_data['current_price'] > customs_threshold_jpy:
-                            customs_fee_jpy = product_data['current_price'] * 0.23
-
-                        # 총 비용
-                        total_cost_jpy = product_data['current_price'] + shipping_fee_jpy + agent_fee_jpy + customs_fee_jpy
-                        total_cost_krw = int(total_cost_jpy * exchange_rate)
-
-                        product_data['shipping_fee_jpy'] = shipping_fee_jpy
-                        product_data['agent_fee_jpy'] = agent_fee_jpy
-                        product_data['customs_fee_jpy'] = customs_fee_jpy
-                        product_data['total_cost_jpy'] = total_cost_jpy
-                        product_data['total_cost_krw'] = total_cost_krw
-
-                        # 카테고리 정보 추가
-                        product_data['category'] = category_name
-                        product_data['category_id'] = category_id
-
-                        products.append(product_data)
-
-                    except Exception as e:
-                        print(f"      ⚠️ 상품 추출 오류: {e}")
-                        continue
+                if card_labels['sold']:
+                    continue
+
+                # 브랜드 (기본값)
+                product_data['brand'] = '기타'
+
+                # 상태
+                product_data['condition'] = card_labels['condition']
+
+                # 기본 분류
+                product_data['position'] = '올라운드'
+                product_data['age_group'] = '성인용'
+
+                # 카테고리 정보 추가
+                product_data['category'] = category_name
+                product_data['category_id'] = category_id
+
+                products.append(product_data)
 
             except Exception as e:
-                print(f"   ⚠️ 섹션 처리 오류: {e}")
+                print(f"      ⚠️ 상품 추출 오류: {e}")
                 continue
 
+        # 원화 환산/배송비/관세는 수집한 상품 전체를 한 번에 계산 (환율은 크롤링당 한 번 조회)
+        if exchange_rate is None:
+            exchange_rate = exchange_rates.current_rate()
+        landed_cost.apply(products, exchange_rate=exchange_rate)
+
         print(f"\n✅ 총 {len(products)}개 상품 수집 완료")
 
     except Exception as e:
@@ -183,8 +132,8 @@ FISHING_CATEGORIES = {
 }
 
 
-def main():
-    """메인 함수"""
+def main(out_dir=DATA_DIR):
+    """메인 함수 (out_dir: 스냅샷 저장 폴더)"""
 
     print("\n" + "="*60)
     print("Yahoo Auction 골프/낚시 크롤러")
@@ -256,7 +205,7 @@ def main():
         # JSON 저장
         if products:
             # data 폴더 생성
-            os.makedirs('data', exist_ok=True)
+            os.makedirs(out_dir, exist_ok=True)
 
             # 현재 시간 (한국시간)
             kst = timezone(timedelta(hours=9))
@@ -264,7 +213,7 @@ def main():
 
             # 파일명 생성
             timestamp = now.strftime("%Y%m%d_%H%M%S")
-            filename = f"data/yahoo_auction_{timestamp}.json"
+            filename = os.path.join(out_dir, f"yahoo_auction_{timestamp}.json")
 
             # JSON 데이터 구성
             result = {
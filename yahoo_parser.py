@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Yahoo Auction 목록 페이지 HTML 파서
+Selenium 없이 정적 HTML(requests 응답, driver.page_source, 저장된 fixture)을
+BeautifulSoup으로 한 번에 파싱하여 상품 카드 목록으로 변환
+"""
+
+import re
+from urllib.parse import urljoin
+
+import soupsieve as sv
+from bs4 import BeautifulSoup
+
+# 야구 글러브 카테고리 (2084032394), 한 페이지 100개
+CATEGORY_URL = "https://auctions.yahoo.co.jp/category/list/2084032394/?n=100"
+PAGE_SIZE = 100
+
+# 신착순 정렬 (증분 크롤링은 새 경매부터 보고 이미 아는 페이지에서 중단)
+NEWEST_SORT = "&s1=new&o1=d"
+
+AUCTION_ID_RE = re.compile(r'/auction/([A-Za-z0-9]+)')
+
+# 셀렉터는 한 번만 컴파일 (카드마다 다시 파싱하지 않도록)
+SEL_PRODUCT = sv.compile(".Product")
+SEL_PRODUCT_ITEM = sv.compile("li.Product__item")
+SEL_TITLE = sv.compile(".Product__title")
+SEL_PRICE = sv.compile(".Product__priceValue")
+SEL_IMAGE = sv.compile("img.Product__imageData")
+SEL_LINK = sv.compile("a.Product__titleLink")
+SEL_BID = sv.compile(".Product__bid")
+SEL_TIME = sv.compile(".Product__time")
+
+# 카테고리 목록 그리드 레이아웃 (yahoo_multi_category_crawler.py)
+SEL_GRID_ITEM = sv.compile("div.Products.Products--grid > div > ul > li")
+SEL_GRID_TITLE = sv.compile("div.Product__detail > h3 > a")
+SEL_GRID_IMAGE = sv.compile("div.Product__image > a > img")
+SEL_GRID_PRICE = sv.compile("div.Product__priceInfo > span:nth-child(1) > span.Product__priceValue")
+
+def page_url(base_url, page_num):
+    """페이지 번호로 목록 URL 생성 (b 파라미터: 100개 단위 오프셋)"""
+    if page_num == 1:
+        return base_url
+    offset = (page_num - 1) * PAGE_SIZE + 1
+    if '?' in base_url:
+        return f"{base_url}&b={offset}"
+    return f"{base_url}?b={offset}"
+
+def auction_id(url):
+    """상품 URL의 경매 ID (https://page.auctions.yahoo.co.jp/jp/auction/x123 → x123)"""
+    match = AUCTION_ID_RE.search(url or '')
+    return match.group(1) if match else ''
+
+def parse_price(text):
+    """'12,345円' → 12345 (숫자가 아니면 0)"""
+    price_text = text.strip().replace(',', '').replace('円', '').replace('¥', '').replace(' ', '')
+    return int(price_text) if price_text.isdigit() else 0
+
+def _text(element, selector):
+    found = selector.select_one(element)
+    # Selenium .text처럼 공백 정리
+    return ' '.join(found.get_text().split()) if found is not None else None
+
+def _url(element, selector, name, base_url):
+    """src/href 값 (Selenium get_attribute처럼 페이지 URL 기준 절대 경로로 변환)"""
+    found = selector.select_one(element)
+    if found is None:
+        return ''
+    value = (found.get(name) or '').strip()
+    return urljoin(base_url, value) if value and base_url else value
+
+def parse_card(element, base_url=''):
+    """상품 카드 1개 → Selenium 버전과 같은 키의 dict"""
+    bids = _text(element, SEL_BID)
+    return {
+        'title': _text(element, SEL_TITLE) or '',
+        'current_price': parse_price(_text(element, SEL_PRICE) or ''),
+        'image_url': _url(element, SEL_IMAGE, 'src', base_url),
+        'url': _url(element, SEL_LINK, 'href', base_url),
+        'bids': bids if bids is not None else '0',
+        'time_left': _text(element, SEL_TIME) or '',
+    }
+
+def parse_list_page(html, base_url=''):
+    """목록 페이지 HTML → 상품 카드 dict 목록 (필터링 전)
+
+    requests 응답이나 driver.page_source를 한 번에 파싱 - 카드/필드별 WebDriver 호출 없음
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    elements = SEL_PRODUCT.select(soup)
+    if not elements:
+        elements = SEL_PRODUCT_ITEM.select(soup)
+    return [parse_card(element, base_url) for element in elements]
+
+def parse_grid_card(element, base_url=''):
+    """그리드 레이아웃 카드 1개 → 제목/이미지/링크/현재가"""
+    return {
+        'title': _text(element, SEL_GRID_TITLE) or '',
+        'image_url': _url(element, SEL_GRID_IMAGE, 'src', base_url),
+        'url': _url(element, SEL_GRID_TITLE, 'href', base_url),
+        'current_price': parse_price(_text(element, SEL_GRID_PRICE) or ''),
+    }
+
+def parse_grid_page(html, base_url=''):
+    """그리드 레이아웃 목록 페이지 HTML → 상품 카드 dict 목록"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [parse_grid_card(element, base_url) for element in SEL_GRID_ITEM.select(soup)]
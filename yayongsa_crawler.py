@@ -8,6 +8,10 @@ import time
 import json
 import os
 from datetime import datetime
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -17,6 +21,17 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 import pytz
 
+import price_parser
+import concurrent_fetch
+import classifier
+import crawl_events
+
+# 게시글 상세 동시 수집 수, 요청 타임아웃, 같은 호스트 요청 간격/지터 (초)
+DETAIL_WORKERS = int(os.environ.get('YAYONGSA_DETAIL_WORKERS', 6))
+DETAIL_TIMEOUT = 15
+DETAIL_MIN_INTERVAL = 0.1
+DETAIL_JITTER = 0.1
+
 def search_yayongsa_gloves(user_dir="./"):
     """야용사 카페 크롤링 - 페이지네이션 포함"""
 
@@ -38,6 +53,7 @@ def search_yayongsa_gloves(user_dir="./"):
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=options)
     products = []
+    session = None
 
     # 게시판 정보
     boards = [
@@ -64,6 +80,9 @@ def search_yayongsa_gloves(user_dir="./"):
         print("\n✅ 대기 완료! 크롤링을 시작합니다...")
         time.sleep(2)
 
+        # 로그인 쿠키를 한 번만 세션으로 복사 - 게시글 상세는 HTTP로 동시에 수집
+        session = export_session(driver)
+
         # 각 게시판 크롤링
         for board_info in boards:
             print(f"\n3. {board_info['name']} 게시판으로 이동...")
@@ -134,10 +153,17 @@ def search_yayongsa_gloves(user_dir="./"):
                     continue
 
                 # 게시글 수집 (step9 로직 사용)
-                page_products = collect_articles(driver, articles, board_info['board'])
+                page_products, http_ok = collect_articles(driver, articles, board_info['board'], session)
                 products.extend(page_products)
+                if session is not None and not http_ok:
+                    # 로그인 쿠키가 세션으로 넘어가지 않은 경우 - 남은 페이지는 처음부터 브라우저로
+                    print("   ⚠️ HTTP로 본문을 하나도 가져오지 못했습니다. 이후 상세는 브라우저로만 수집합니다.")
+                    session.close()
+                    session = None
 
                 print(f"   ✅ {page_num}페이지에서 {len(page_products)}개 수집")
+                crawl_events.emit('page', board=board_info['name'], page=page_num, items=len(page_products),
+                                  total=len(products))
 
             # iframe에서 벗어나기
             try:
@@ -151,6 +177,9 @@ def search_yayongsa_gloves(user_dir="./"):
         print(f"\n❌ 크롤링 오류: {e}")
 
     finally:
+        if session is not None:
+            session.close()
+
         # 브라우저 종료
         try:
             driver.quit()
@@ -183,13 +212,21 @@ def search_yayongsa_gloves(user_dir="./"):
             json.dump(data, f, ensure_ascii=False, indent=2)
 
         print(f"\n✅ 데이터 저장 완료: {filepath}")
+        crawl_events.emit('saved', filename=filename, items=len(products))
         print(f"   총 {len(products)}개 상품")
         print(f"   크롤링 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}")
 
     return products
 
-def collect_articles(driver, articles, board_name):
-    """게시글 수집 함수 - step9 로직 사용"""
+def collect_articles(driver, articles, board_name, session=None, workers=None):
+    """게시글 수집 함수 - step9 로직 사용
+
+    목록 행을 먼저 모두 읽은 뒤 상세(가격/이미지)를 session으로 동시에 가져와 목록 순서대로 합침
+    (상세 로그도 목록 순서대로 출력) HTTP로 본문을 못 가져온 게시글만 브라우저(새 탭)로 하나씩 다시 시도
+
+    Returns:
+        (상품 목록, HTTP 상세 사용 가능 여부 - 상세를 하나도 HTTP로 못 가져왔으면 False)
+    """
     products = []
     max_products = 50  # 페이지당 최대 수집 제품 수
 
@@ -235,8 +272,11 @@ def collect_articles(driver, articles, board_name):
             if not product_data['title']:
                 continue
 
+            # 제목 한 번 스캔으로 공지/판매완료/브랜드/포지션/상태 분류
+            labels = classifier.classify_title(product_data['title'], site='yayongsa')
+
             # 공지사항 제외
-            if '공지' in product_data['title'] or '필독' in product_data['title']:
+            if labels['notice']:
                 continue
 
             # 나머지 데이터 추출
@@ -249,32 +289,22 @@ def collect_articles(driver, articles, board_name):
                 product_data['date'] = ''
                 product_data['views'] = '0'
 
-            # 추가 데이터 설정
-            title_lower = product_data['title'].lower()
-
-            # 판매완료 여부 확인
-            sold_out_keywords = ['판매완료', '거래완료', '완료', 'sold', 'sold out']
-            product_data['sold_out'] = any(keyword in title_lower for keyword in sold_out_keywords)
-
-            # 상세 페이지에서 가격과 이미지 추출
-            price, images = extract_details_from_article(driver, product_data['url'])
-            product_data['price'] = price
-            product_data['images'] = images
+            # 판매완료 여부
+            product_data['sold_out'] = labels['sold_out']
 
-            # 브랜드 추출
-            product_data['brand'] = extract_brand_from_title(product_data['title'])
+            # 가격과 이미지는 목록을 다 읽은 뒤 상세 페이지에서 추출
+            product_data['price'] = 0
+            product_data['images'] = []
 
-            # 포지션 추출
-            product_data['position'] = extract_position_from_title(product_data['title'])
+            # 브랜드, 포지션
+            product_data['brand'] = labels['brand']
+            product_data['position'] = labels['position']
 
             # 지역 설정
             product_data['location'] = '미상'
 
             # 상태 설정
-            if '새상품' in title_lower or '신품' in title_lower:
-                product_data['condition'] = '신품'
-            else:
-                product_data['condition'] = '중고'
+            product_data['condition'] = labels['condition']
 
             products.append(product_data)
             print(f"  ✅ [{idx}] {product_data['title'][:40]}...")
@@ -283,7 +313,132 @@ def collect_articles(driver, articles, board_name):
             print(f"  ❌ [{idx}] 파싱 오류: {e}")
             continue
 
-    return products
+    # 상세 페이지에서 가격과 이미지 추출
+    urls = [product['url'] for product in products]
+    results = [(None, [])] * len(urls)
+    if session is not None and urls:
+        started = time.time()
+        results = fetch_details_parallel(session, urls, workers)
+        print(f"  ⚡ 상세 {len(urls)}개 동시 수집: {time.time() - started:.1f}초")
+
+    for product, (detail, log_lines) in zip(products, results):
+        print(f"  🔎 {product['title'][:40]}")
+        for line in log_lines:
+            print(line)
+        if detail is None:
+            detail = extract_details_from_article(driver, product['url'])
+        product['price'], product['images'] = detail
+
+    http_ok = session is None or not urls or any(detail is not None for detail, _ in results)
+    return products, http_ok
+
+# 이미지 제외 패턴: 이모티콘, 아이콘, UI 이미지, 작은 썸네일
+IMAGE_EXCLUDE_PATTERNS = [
+    'emoticon', 'sticker', 'emoji', 'icon',
+    'btn', 'button', 'new.png', 'skin/',
+    'thumb/C90x90', 'thumb/C120x120', 'thumb/C150x150'
+]
+
+def extract_price(content_text, log=print):
+    """게시글 본문에서 판매 가격 추출 (2만원 ~ 200만원, 못 찾으면 0)
+
+    log: 진행 메시지 출력 함수 (동시 수집 중에는 모아 두었다가 목록 순서대로 출력)
+    """
+    match = price_parser.parse_price(content_text)
+    if match.confidence >= 0.5:
+        log(f"    ✅ 가격 추출: {match.price:,}원 ({match.kind}, 신뢰도 {match.confidence})")
+    elif match.price:
+        log(f"    ⚠️ 추정 가격: {match.price:,}원")
+    else:
+        log(f"    ❌ 가격 추출 실패 (본문 샘플: {content_text[:100]}...)")
+    return match.price
+
+def select_images(img_srcs, log=print):
+    """본문 이미지 주소 중 첫 번째 첨부 이미지(고해상도)만 썸네일로 선택"""
+    # cafefile 또는 kakaocdn 이미지만 필터링 (이모티콘 제외)
+    valid_images = []
+    for img_src in img_srcs:
+        if not img_src:
+            continue
+        if any(x in img_src.lower() for x in IMAGE_EXCLUDE_PATTERNS):
+            continue
+
+        # 실제 첨부 이미지만 포함 (cafeattach가 가장 확실)
+        if 'cafeattach' in img_src:
+            # 고해상도 이미지 URL 변환 (썸네일 방지)
+            # 예: /thumb/R660x0/?fname=... → /original/?fname=...
+            high_res_url = img_src.replace('/thumb/R660x0/', '/original/')
+            high_res_url = high_res_url.replace('/thumb/R640x0/', '/original/')
+            high_res_url = high_res_url.replace('/thumb/R400x0/', '/original/')
+            valid_images.append(high_res_url)
+
+    # 첫 번째 이미지만 썸네일로 사용
+    if valid_images:
+        log(f"    ✅ 썸네일 이미지 추출: {valid_images[0][:80]}...")
+        return [valid_images[0]]
+    log(f"    ❌ 유효한 이미지 없음")
+    return []
+
+def export_session(driver):
+    """로그인된 브라우저의 다음 쿠키를 requests 세션으로 복사 (한 번만)"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': driver.execute_script('return navigator.userAgent'),
+        'Referer': 'https://cafe.daum.net/baseballsale',
+    })
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie['name'], cookie['value'],
+                            domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    adapter = requests.adapters.HTTPAdapter(pool_connections=DETAIL_WORKERS, pool_maxsize=DETAIL_WORKERS)
+    session.mount('https://', adapter)
+    return session
+
+def parse_article_html(html, url):
+    """게시글 HTML → (본문 텍스트, 이미지 주소 목록), 본문이 없으면 (None, iframe 주소)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    content = soup.find(id='user_contents')
+    if content is None:
+        # 새 카페 화면은 본문을 iframe(down)으로 불러옴
+        iframe = soup.find('iframe', id='down') or soup.find('iframe', attrs={'name': 'down'})
+        return None, urljoin(url, iframe['src']) if iframe is not None and iframe.get('src') else None
+
+    text = content.get_text('\n', strip=True)
+    srcs = [urljoin(url, img.get('data-img-src') or img.get('src') or '') for img in soup.find_all('img')]
+    return text, srcs
+
+def fetch_article_details(session, article_url, limiter, log=print):
+    """게시글 상세를 HTTP로 가져와 (가격, 이미지) 반환 - 본문을 못 찾으면 None (Selenium으로 재시도)"""
+    url = article_url
+    for _ in range(2):
+        limiter.wait(url)
+        response = session.get(url, timeout=DETAIL_TIMEOUT)
+        response.raise_for_status()
+        text, found = parse_article_html(response.content, url)
+        if text is not None:
+            return extract_price(text, log), select_images(found, log)
+        if not found:
+            return None
+        url = found
+    return None
+
+def fetch_details_parallel(session, urls, workers=None):
+    """게시글 상세를 동시에 가져오기 → 목록과 같은 순서의 ((가격, 이미지) 또는 None, 로그 줄 목록)
+
+    스레드마다 출력하면 줄이 섞이므로 로그는 모아서 반환 (collect_articles에서 목록 순서대로 출력)
+    """
+    workers = workers or DETAIL_WORKERS
+    limiter = concurrent_fetch.HostRateLimiter(DETAIL_MIN_INTERVAL, DETAIL_JITTER)
+
+    def fetch(url):
+        lines = []
+        try:
+            return fetch_article_details(session, url, limiter, lines.append), lines
+        except Exception as e:
+            lines.append(f"    ⚠️ 상세 페이지 HTTP 실패: {url} ({e})")
+            return None, lines
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fetch, urls))
 
 def extract_details_from_article(driver, article_url):
     """상세 페이지에서 가격과 이미지 추출"""
@@ -318,119 +473,20 @@ def extract_details_from_article(driver, article_url):
             pass
 
         # 가격 추출 - 본문 전체에서 추출
-        price = 0
         try:
-            import re
-
             content_element = driver.find_element(By.ID, "user_contents")
-            content_text = content_element.text
-
-            # 더 포괄적인 가격 패턴
-            price_patterns = [
-                # "판매가격: 43만", "판매가: 43"
-                (r'판매가격\s*[:：=]\s*(\d{1,3})\s*만', 10000),
-                (r'판매가\s*[:：=]\s*(\d{1,3})\s*만', 10000),
-                (r'가격\s*[:：=]\s*(\d{1,3})\s*만', 10000),
-
-                # "43만원", "28만"
-                (r'(\d{1,3})\s*만\s*원', 10000),
-                (r'(\d{1,3})\s*만(?:\s|$|\n|\.)', 10000),
-
-                # "430000원", "430,000"
-                (r'(\d{2,3})[,.]?(\d{3})[,.]?(\d{3})\s*원', 1),
-                (r'(\d{2,3})[,.](\d{3})\s*원', 1),
-
-                # "43" (만 단위로 추정)
-                (r'판매가격\s*[:：=]\s*(\d{2,3})(?:\s|$|\n)', 10000),
-                (r'판매가\s*[:：=]\s*(\d{2,3})(?:\s|$|\n)', 10000),
-                (r'가격\s*[:：=]\s*(\d{2,3})(?:\s|$|\n)', 10000),
-            ]
-
-            for pattern, multiplier in price_patterns:
-                matches = re.findall(pattern, content_text, re.IGNORECASE)
-                if matches:
-                    try:
-                        # 여러 그룹 매칭된 경우 (예: 430,000 -> ('430', '000'))
-                        if isinstance(matches[0], tuple):
-                            price_str = ''.join(matches[0])
-                        else:
-                            price_str = matches[0]
-
-                        price_str = price_str.replace(',', '').replace('.', '').strip()
-                        price = int(price_str) * multiplier
-
-                        # 가격 범위 검증 (2만원 ~ 200만원)
-                        if 20000 <= price <= 2000000:
-                            print(f"    ✅ 가격 추출: {price:,}원 (패턴: {pattern})")
-                            break
-                        else:
-                            price = 0
-                    except:
-                        continue
-
-            # 숫자만 찾기 (마지막 수단)
-            if price == 0:
-                # 5~6자리 숫자 찾기
-                numbers = re.findall(r'\b(\d{5,6})\b', content_text.replace(',', ''))
-                for num_str in numbers:
-                    num = int(num_str)
-                    if 20000 <= num <= 999999:
-                        price = num
-                        print(f"    ⚠️ 추정 가격: {price:,}원")
-                        break
-
-            if price == 0:
-                print(f"    ❌ 가격 추출 실패 (본문 샘플: {content_text[:100]}...)")
-
+            price = extract_price(content_element.text)
         except Exception as e:
             print(f"    ❌ 가격 추출 오류: {e}")
 
         # 이미지 추출 - iframe 전체에서 검색
         try:
-            # iframe 전체에서 img 태그 검색
+            # src와 data-img-src 모두 확인
             all_images = driver.find_elements(By.TAG_NAME, "img")
-
             if all_images:
                 print(f"    📷 총 {len(all_images)}개 이미지 발견")
-
-                # cafefile 또는 kakaocdn 이미지만 필터링 (이모티콘 제외)
-                valid_images = []
-                for idx, img in enumerate(all_images, 1):
-                    try:
-                        # src와 data-img-src 모두 확인
-                        img_src = img.get_attribute('data-img-src') or img.get_attribute('src')
-
-                        if img_src:
-                            # 제외 패턴: 이모티콘, 아이콘, UI 이미지, 작은 썸네일
-                            exclude_patterns = [
-                                'emoticon', 'sticker', 'emoji', 'icon',
-                                'btn', 'button', 'new.png', 'skin/',
-                                'thumb/C90x90', 'thumb/C120x120', 'thumb/C150x150'
-                            ]
-                            if any(x in img_src.lower() for x in exclude_patterns):
-                                continue
-
-                            # 실제 첨부 이미지만 포함 (cafeattach가 가장 확실)
-                            if 'cafeattach' in img_src:
-                                # 고해상도 이미지 URL 변환 (썸네일 방지)
-                                # 예: /thumb/R660x0/?fname=... → /original/?fname=...
-                                high_res_url = img_src.replace('/thumb/R660x0/', '/original/')
-                                high_res_url = high_res_url.replace('/thumb/R640x0/', '/original/')
-                                high_res_url = high_res_url.replace('/thumb/R400x0/', '/original/')
-                                valid_images.append(high_res_url)
-                    except:
-                        continue
-
-                # 첫 번째 이미지만 썸네일로 사용
-                if valid_images:
-                    images = [valid_images[0]]  # 첫 번째만
-                    print(f"    ✅ 썸네일 이미지 추출: {images[0][:80]}...")
-                else:
-                    print(f"    ❌ 유효한 이미지 없음")
-
-                # 처음 3개 이미지 URL 출력
-                for idx, img_url in enumerate(images[:3], 1):
-                    print(f"      {idx}. {img_url[:80]}...")
+                images = select_images(img.get_attribute('data-img-src') or img.get_attribute('src')
+                                       for img in all_images)
             else:
                 print(f"    ❌ 이미지 요소를 찾을 수 없음")
 
@@ -475,36 +531,11 @@ def extract_details_from_article(driver, article_url):
 
 def extract_brand_from_title(title):
     """제목에서 브랜드 추출"""
-    brands = {
-        '미즈노': 'Mizuno', 'mizuno': 'Mizuno', 'MIZUNO': 'Mizuno',
-        '윌슨': 'Wilson', 'wilson': 'Wilson', 'WILSON': 'Wilson',
-        '롤링스': 'Rawlings', 'rawlings': 'Rawlings', 'RAWLINGS': 'Rawlings',
-        '제트': 'ZETT', 'zett': 'ZETT', 'ZETT': 'ZETT',
-        'SSK': 'SSK', 'ssk': 'SSK',
-        '아톰즈': 'ATOMS', 'atoms': 'ATOMS', 'ATOMS': 'ATOMS',
-        '구보타': 'Kubota', 'kubota': 'Kubota', 'KUBOTA': 'Kubota',
-    }
-
-    title_lower = title.lower()
-    for keyword, brand_name in brands.items():
-        if keyword.lower() in title_lower:
-            return brand_name
-
-    return '기타'
+    return classifier.classify_title(title, site='yayongsa')['brand']
 
 def extract_position_from_title(title):
     """제목에서 포지션 추출"""
-    positions = {
-        '내야': '내야수', '외야': '외야수', '투수': '투수',
-        '포수': '포수', '올라운드': '올라운드',
-        '유격수': '내야수', '2루수': '내야수', '3루수': '내야수', '1루수': '내야수',
-    }
-
-    for keyword, position_name in positions.items():
-        if keyword in title:
-            return position_name
-
-    return '올라운드'
+    return classifier.classify_title(title, site='yayongsa')['position']
 
 if __name__ == "__main__":
     import sys